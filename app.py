@@ -1,21 +1,52 @@
 import streamlit as st
 from utils.document_processor import DocumentProcessor
 from utils.llm_utils import OllamaLLM
-from utils.prompt_templates import get_cover_letter_prompt
+from config import VARIANT_SETTINGS
+from utils.prompt_templates import STYLES, TONES, build_cover_letter_prompt, build_variant_prompts
 from utils.portfolio_agent import PortfolioAgent
 from utils.research_agent import CompanyResearchAgent
-import tempfile
-import os
+from utils.pipeline import IngestionPipeline
+from utils.qa_utils import get_quality_checker
+from utils.telemetry import request_trace, setup_telemetry
+
+@st.cache_resource
+def start_telemetry():
+    """Configure logging and, when METRICS_PORT is set, serve Prometheus metrics."""
+    setup_telemetry()
+
+
+# Processors are built once per process and shared by every session and rerun;
+# Streamlit reruns main() on each widget interaction.
+@st.cache_resource
+def get_doc_processor() -> DocumentProcessor:
+    return DocumentProcessor()
+
+
+@st.cache_resource
+def get_llm() -> OllamaLLM:
+    return OllamaLLM()
+
+
+@st.cache_resource
+def get_research_agent() -> CompanyResearchAgent:
+    return CompanyResearchAgent()
+
+
+@st.cache_resource
+def get_portfolio_agent() -> PortfolioAgent:
+    return PortfolioAgent()
+
 
 def main():
     st.title("Intelligent Cover Letter Generator")
     st.write("Upload your documents and provide relevant information to generate a personalized cover letter.")
 
     # Initialize processors
-    doc_processor = DocumentProcessor()
-    llm = OllamaLLM()
-    research_agent = CompanyResearchAgent()
-    portfolio_agent = PortfolioAgent()
+    start_telemetry()
+    doc_processor = get_doc_processor()
+    llm = get_llm()
+    research_agent = get_research_agent()
+    portfolio_agent = get_portfolio_agent()
 
     # Main Resume Upload
     st.subheader("Required Documents")
@@ -58,132 +89,219 @@ def main():
             "Select writing style",
             ["Standard", "Creative", "Technical", "Executive"]
         )
+    compare_with = st.multiselect(
+        "Compare with other tone/style combinations (generated in parallel)",
+        [f"{t} / {s}" for t in TONES for s in STYLES if (t, s) != (tone, style)],
+        max_selections=VARIANT_SETTINGS['max_variants'] - 1
+    )
 
     if st.button("Generate Cover Letter") and resume_file and job_description and company_name:
-        with st.spinner("Processing your documents..."):
+        with st.spinner("Processing your documents..."), request_trace('cover_letter') as trace:
             try:
-                # Process resume
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    tmp_file.write(resume_file.getvalue())
-                    resume_path = tmp_file.name
-                resume_text = doc_processor.extract_text_from_pdf(resume_path)
-                os.unlink(resume_path)
-
-                # Process additional documents
-                additional_content = []
-                if additional_docs:
-                    for doc in additional_docs:
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                            tmp_file.write(doc.getvalue())
-                            doc_path = tmp_file.name
-                        content = doc_processor.extract_text_from_pdf(doc_path)
-                        additional_content.append(content)
-                        os.unlink(doc_path)
+                # Re-verify Ollama at most once per health_check_interval
+                llm.ensure_available()
+
+                # Extract documents, analyze portfolio and research the company concurrently
+                pipeline = IngestionPipeline(doc_processor, portfolio_agent, research_agent)
+                ingested = pipeline.run(
+                    resume_bytes=resume_file.getvalue(),
+                    additional_docs=[doc.getvalue() for doc in additional_docs or []],
+                    portfolio_links=portfolio_links.split('\n') if portfolio_links else [],
+                    company_name=company_name if include_research else ""
+                )
+                resume_text = ingested['resume_text']
+                additional_content = ingested['additional_content']
+                portfolio_info = ingested['portfolio_info']
+                portfolio_details = ingested['portfolio_details']
+                company_research = ingested['company_research']
+
+                for task, error in ingested['errors'].items():
+                    st.warning(f"Skipped {task}: {error}")
 
                 # Process portfolio links
-                portfolio_info = ""
-                portfolio_details = None
-                if portfolio_links:
-                    with st.spinner("Analyzing portfolio information..."):
-                        portfolio_info, portfolio_details = portfolio_agent.analyze_portfolio(portfolio_links.split('\n'))
-                        
-                        # Show portfolio analysis details
-                        with st.expander("Portfolio Analysis Details", expanded=True):
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                if portfolio_details['github_repos']:
-                                    st.metric("GitHub Repositories", len(portfolio_details['github_repos']))
-                            with col2:
-                                if portfolio_details['behance_projects']:
-                                    st.metric("Behance Projects", len(portfolio_details['behance_projects']))
-                            with col3:
-                                total_projects = len(portfolio_details['github_repos']) + len(portfolio_details['behance_projects'])
-                                st.metric("Total Projects Found", total_projects)
-                            
+                if portfolio_details:
+                    # Show portfolio analysis details
+                    with st.expander("Portfolio Analysis Details", expanded=True):
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
                             if portfolio_details['github_repos']:
-                                st.subheader("🌟 GitHub Repositories Found")
-                                for repo in portfolio_details['github_repos']:
-                                    with st.container():
-                                        st.markdown(f"### 📁 {repo['name']}")
-                                        col4, col5 = st.columns([3, 1])
-                                        with col4:
-                                            st.write(f"**Description:** {repo['description']}")
-                                            st.write(f"**Language:** {repo['language']}")
-                                        with col5:
-                                            st.write(f"**Stars:** {repo['stars']}")
-                                            st.write(f"[View Repository]({repo['url']})")
-                                        st.markdown("---")
-                            
+                                st.metric("GitHub Repositories", len(portfolio_details['github_repos']))
+                        with col2:
                             if portfolio_details['behance_projects']:
-                                st.subheader("Behance Projects Found")
-                                for project in portfolio_details['behance_projects']:
-                                    st.write(f"🎨 {project['title']}")
-                                    st.write(f"URL: {project['url']}")
-                                    st.write("---")
+                                st.metric("Behance Projects", len(portfolio_details['behance_projects']))
+                        with col3:
+                            total_projects = len(portfolio_details['github_repos']) + len(portfolio_details['behance_projects'])
+                            st.metric("Total Projects Found", total_projects)
+
+                        for url, timing in portfolio_details.get('timings', {}).items():
+                            latency = f"{timing['latency']:.2f}s" if timing['latency'] is not None else "n/a"
+                            st.caption(f"{url}: {timing['status']} ({latency})")
+
+                        if portfolio_details['github_repos']:
+                            st.subheader("🌟 GitHub Repositories Found")
+                            for repo in portfolio_details['github_repos']:
+                                with st.container():
+                                    st.markdown(f"### 📁 {repo['name']}")
+                                    col4, col5 = st.columns([3, 1])
+                                    with col4:
+                                        st.write(f"**Description:** {repo['description']}")
+                                        st.write(f"**Language:** {repo['language']}")
+                                    with col5:
+                                        st.write(f"**Stars:** {repo['stars']}")
+                                        st.write(f"[View Repository]({repo['url']})")
+                                    st.markdown("---")
+                        
+                        if portfolio_details['behance_projects']:
+                            st.subheader("Behance Projects Found")
+                            for project in portfolio_details['behance_projects']:
+                                st.write(f"🎨 {project['title']}")
+                                st.write(f"URL: {project['url']}")
+                                st.write("---")
 
                 # Process job description
                 processed_jd = doc_processor.process_job_description(job_description)
 
-                # Company research
-                company_research = ""
-                if include_research and company_name:
-                    with st.spinner("Researching company information..."):
-                        company_research = research_agent.get_structured_research(company_name)
-                        st.success(f"Researched company: {company_name}")
+                if company_research:
+                    st.success(f"Researched company: {company_name}")
                 
                 # Generate prompt
-                prompt = get_cover_letter_prompt(
+                prompt_inputs = dict(
                     resume_text=resume_text,
                     job_description=processed_jd,
                     additional_content=additional_content,
                     portfolio_info=portfolio_info,
                     company_research=company_research if include_research else "",
-                    tone=tone,
-                    style=style,
                     company_name=company_name
                 )
+                variants = [(tone, style)] + [tuple(choice.split(" / ")) for choice in compare_with]
+                if len(variants) > 1:
+                    prompt_parts = build_variant_prompts(variants, **prompt_inputs)
+                else:
+                    prompt_parts = build_cover_letter_prompt(tone=tone, style=style, **prompt_inputs)
+                budget = prompt_parts['budget']
+                trimmed = [name for name, usage in budget['sections'].items() if usage['trimmed']]
+                if trimmed:
+                    st.info(
+                        f"Inputs were shortened to fit the model context "
+                        f"(~{budget['prompt_tokens']} of {budget['num_ctx']} tokens): {', '.join(trimmed)}"
+                    )
                 
-                # Generate cover letter
-                cover_letter = llm.generate_cover_letter(prompt)
-                
-                # Display results
-                st.subheader("Generated Cover Letter")
-                
-                with st.expander("Sources Used", expanded=True):
-                    st.write("Resume Content ✓")
-                    if additional_content:
-                        st.write("Additional Documents ✓")
-                    if portfolio_info:
-                        st.write("Portfolio Information ✓")
-                        if portfolio_details and portfolio_details['github_repos']:
-                            st.write("GitHub Projects Found ✓")
-                    if company_research:
-                        st.write("Company Research ✓")
-                
-                st.text_area("", cover_letter, height=400)
-                
-                # Export as PDF
-                pdf_buffer = llm.export_to_pdf(cover_letter)
+                if len(variants) > 1:
+                    cover_letter, other_variants = generate_variants(llm, prompt_parts, (tone, style))
+                else:
+                    cover_letter = stream_letter(llm, prompt_parts['prompt'])
+                    other_variants = {}
                 
-                # Download buttons
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.download_button(
-                        label="Download as Text",
-                        data=cover_letter,
-                        file_name="cover_letter.txt",
-                        mime="text/plain"
-                    )
-                with col2:
-                    st.download_button(
-                        label="Download as PDF",
-                        data=pdf_buffer,
-                        file_name="cover_letter.pdf",
-                        mime="application/pdf"
-                    )
+                # Keep the result across reruns (e.g. download clicks) until the next generation
+                sources = ["Resume Content ✓"]
+                if additional_content:
+                    sources.append("Additional Documents ✓")
+                if portfolio_info:
+                    sources.append("Portfolio Information ✓")
+                    if portfolio_details and portfolio_details['github_repos']:
+                        sources.append("GitHub Projects Found ✓")
+                if company_research:
+                    sources.append("Company Research ✓")
+                st.session_state['result'] = {
+                    'cover_letter': cover_letter, 'sources': sources, 'variants': other_variants,
+                    'timings': trace.stage_durations()
+                }
                 
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
 
+    if 'result' in st.session_state:
+        show_result(llm, st.session_state['result'])
+
+
+def stream_letter(llm: OllamaLLM, prompt: str) -> str:
+    """Generate one letter, rendering the draft as tokens arrive."""
+    stream_area = st.empty()
+    with stream_area.container():
+        st.subheader("Generated Cover Letter")
+        draft_placeholder = st.empty()
+    draft = ""
+    for chunk in llm.stream_cover_letter(prompt):
+        draft += chunk
+        draft_placeholder.markdown(draft)
+    stream_area.empty()
+    cover_letter = llm._format_cover_letter(draft.strip())
+
+    stats = llm.last_stats
+    if stats.get('time_to_first_token') is not None:
+        st.caption(
+            f"First token after {stats['time_to_first_token']:.1f}s · "
+            f"{stats['tokens_per_second']:.1f} tokens/sec · "
+            f"{stats['total_duration']:.1f}s total"
+        )
+    return cover_letter
+
+
+def generate_variants(llm: OllamaLLM, prompt_parts: dict, selected: tuple):
+    """Generate every tone/style variant in parallel, reporting each as it finishes.
+
+    Returns the letter for the selected variant and the others keyed by label.
+    """
+    st.subheader("Generating Variants")
+    letters = {}
+    for result in llm.generate_variants(prompt_parts['variants'], prompt_parts['shared_prefix']):
+        label = f"{result['tone']} / {result['style']}"
+        if result['error']:
+            st.warning(f"{label} failed: {result['error']}")
+            continue
+        letters[(result['tone'], result['style'])] = result['cover_letter']
+        st.caption(f"{label} finished after {result['stats']['total_duration']:.1f}s")
+
+    if selected not in letters:
+        raise Exception(f"Could not generate the {' / '.join(selected)} letter")
+    cover_letter = letters.pop(selected)
+    return cover_letter, {f"{t} / {s}": letter for (t, s), letter in letters.items()}
+
+
+def show_result(llm: OllamaLLM, result: dict):
+    """Display the latest letter; the PDF is rendered only once the user asks for it."""
+    cover_letter = result['cover_letter']
+
+    st.subheader("Generated Cover Letter")
+    with st.expander("Sources Used", expanded=True):
+        for source in result['sources']:
+            st.write(source)
+    
+    if result.get('timings'):
+        with st.expander("Stage Timings"):
+            for stage, seconds in result['timings'].items():
+                st.caption(f"{stage}: {seconds:.2f}s")
+
+    quality = get_quality_checker().analyze_cover_letter(cover_letter)
+    with st.expander("Quality Check", expanded=not quality['passed']):
+        st.caption(f"Readability: {quality['readability_score']:.0f} · {quality['word_count']} words")
+        for suggestion in quality['suggestions']:
+            st.write(f"- {suggestion}")
+
+    st.text_area("", cover_letter, height=400)
+    for label, letter in result.get('variants', {}).items():
+        with st.expander(f"Variant: {label}"):
+            st.text_area(label, letter, height=300)
+    
+    # Download buttons
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Download as Text",
+            data=cover_letter,
+            file_name="cover_letter.txt",
+            mime="text/plain"
+        )
+    with col2:
+        # Renders are memoized by letter text, so reruns after the first request are free
+        if st.session_state.get('pdf_requested_for') == cover_letter or st.button("Prepare PDF"):
+            st.session_state['pdf_requested_for'] = cover_letter
+            st.download_button(
+                label="Download as PDF",
+                data=llm.export_to_pdf(cover_letter),
+                file_name="cover_letter.pdf",
+                mime="application/pdf"
+            )
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import argparse
+import json
+from utils.batch_runner import BatchRunner
+from utils.portfolio_agent import PortfolioAgent
+from utils.research_agent import CompanyResearchAgent
+from utils.telemetry import setup_telemetry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate cover letters for every row of a JSONL manifest.")
+    parser.add_argument('manifest', help="JSONL file with job_description, company_name, tone and style per row")
+    parser.add_argument('--resume', required=True, help="Resume PDF shared by every row")
+    parser.add_argument('--output-dir', default='batch_output', help="Where letters and the checkpoint file are written")
+    parser.add_argument('--workers', type=int, default=None, help="Concurrent generations against Ollama")
+    parser.add_argument('--portfolio', action='append', default=[], help="Portfolio link (repeatable)")
+    parser.add_argument('--research', action='store_true', help="Enable company research for rows with include_research")
+    parser.add_argument('--pdf', action='store_true', help="Also render every letter to PDF in a ZIP archive")
+    parser.add_argument('--qa-report', action='store_true', help="Re-score every checkpointed letter into a QA report")
+    parser.add_argument('--log-level', default='INFO', help="Logging level for progress output")
+    args = parser.parse_args()
+    setup_telemetry(args.log_level)
+
+    runner = BatchRunner(
+        research_agent=CompanyResearchAgent() if args.research else None,
+        portfolio_agent=PortfolioAgent() if args.portfolio else None,
+        max_workers=args.workers
+    )
+    summary = runner.run(args.manifest, args.resume, args.output_dir, portfolio_links=args.portfolio)
+
+    print(f"\nGenerated {summary['generated']} letters ({summary['skipped']} resumed, {summary['failed']} failed)")
+    print(f"Throughput: {summary['letters_per_minute']:.2f} letters/min")
+    print(f"Latency: p50 {summary['p50_latency']:.1f}s, p95 {summary['p95_latency']:.1f}s")
+    print(f"Quality: {summary['qa_flagged']} of {summary['generated']} new letters flagged")
+    if summary['failures']:
+        print(json.dumps(summary['failures'], indent=2))
+    if args.qa_report:
+        runner.score_letters(args.output_dir)
+    if args.pdf:
+        runner.export_pdfs(args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure the cold-start import cost of the app and fail when it exceeds a budget.
+
+Runs ``python -X importtime -c "import app"`` in fresh interpreters, parses the
+import-time report and prints the median total plus the most expensive top-level
+imports. Exits non-zero when the median exceeds ``--budget-ms`` or when any of
+the dependencies that should load lazily (on "Generate") are imported at startup.
+
+Usage:
+    python benchmarks/bench_cold_start.py --runs 5 --budget-ms 2000
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed once a letter is generated or exported
+LAZY_MODULES = ('langchain', 'reportlab', 'nltk', 'bs4', 'pdfminer', 'numpy')
+DEFAULT_BUDGET_MS = 2000
+
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str):
+    """Return [(module, self_us, cumulative_us, depth)] from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def direct_imports(rows, module: str):
+    """Rows imported directly by ``module``; importtime lists children before their parent."""
+    end = next(i for i, row in enumerate(rows) if row[0] == module and row[3] == 0)
+    children = []
+    for row in reversed(rows[:end]):
+        if row[3] == 0:
+            break
+        if row[3] == 1:
+            children.append(row)
+    return children
+
+
+def measure(module: str):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    measure(args.module)  # Warm-up: compile bytecode and fill the OS file cache
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [sum(row[1] for row in rows) / 1000 for rows in runs]
+    median_ms = statistics.median(totals)
+    rows = runs[totals.index(sorted(totals)[len(totals) // 2])]
+
+    print(f"import {args.module}: median {median_ms:.0f}ms over {args.runs} runs "
+          f"(min {min(totals):.0f}ms, max {max(totals):.0f}ms, budget {args.budget_ms:.0f}ms)")
+    print(f"\n{'direct import of ' + args.module:<40}{'cumulative ms':>15}")
+    children = sorted(direct_imports(rows, args.module), key=lambda row: row[2], reverse=True)
+    for module, _, cumulative_us, _ in children[:args.top]:
+        print(f"{module:<40}{cumulative_us / 1000:>15.1f}")
+
+    failures = []
+    eager = sorted({row[0].split('.')[0] for row in rows} & set(LAZY_MODULES))
+    if eager:
+        failures.append(f"lazy dependencies imported at startup: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        failures.append(f"cold start {median_ms:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
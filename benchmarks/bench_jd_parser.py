@@ -0,0 +1,112 @@
+"""Benchmark DocumentProcessor.process_job_description on 1 KB, 10 KB and 100 KB postings.
+
+Compares the single-pass section parser with the previous implementation, which ran
+nine lazy DOTALL patterns over the whitespace-collapsed text.
+
+Usage:
+    python benchmarks/bench_jd_parser.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.document_processor import DocumentProcessor  # noqa: E402
+
+POSTING_BLOCK = """Senior Backend Engineer
+
+About the team:
+We run the payments platform that moves money for millions of customers every day.
+
+Responsibilities:
+- Design and build services in Python and Go
+- Own reliability of the ledger and its on-call rotation
+- Mentor engineers and review designs
+
+Requirements:
+- 5+ years building distributed systems
+- Strong SQL and data modelling experience
+- Experience with Kubernetes and AWS
+
+Skills:
+Python, Go, PostgreSQL, Kafka, Terraform
+
+Benefits:
+- Health, dental and vision
+- Learning budget
+
+"""
+
+LEGACY_PATTERNS = {
+    'requirements': [
+        r'requirements?:?\s*(.*?)(?=\n\n|\Z)',
+        r'qualifications?:?\s*(.*?)(?=\n\n|\Z)',
+        r'what you\'ll need:?\s*(.*?)(?=\n\n|\Z)'
+    ],
+    'responsibilities': [
+        r'responsibilities?:?\s*(.*?)(?=\n\n|\Z)',
+        r'duties:?\s*(.*?)(?=\n\n|\Z)',
+        r'what you\'ll do:?\s*(.*?)(?=\n\n|\Z)'
+    ],
+    'skills': [
+        r'skills?:?\s*(.*?)(?=\n\n|\Z)',
+        r'technical requirements?:?\s*(.*?)(?=\n\n|\Z)',
+        r'proficienc(?:y|ies):?\s*(.*?)(?=\n\n|\Z)'
+    ],
+}
+
+
+def legacy_extract(processor: DocumentProcessor, job_description: str) -> dict:
+    cleaned_text = processor._clean_text(job_description)
+    extracted = {}
+    for field, patterns in LEGACY_PATTERNS.items():
+        matches = []
+        for pattern in patterns:
+            matches.extend(re.findall(pattern, cleaned_text, re.IGNORECASE | re.DOTALL))
+        extracted[field] = list(set(matches))
+    return extracted
+
+
+def legacy_process(processor: DocumentProcessor, job_description: str) -> dict:
+    processed = legacy_extract(processor, job_description)
+    processed['full_text'] = processor._clean_text(job_description)
+    processed['sections'] = processor._split_into_sections(processed['full_text'])
+    return processed
+
+
+def best_ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+SIZES = (1024, 10 * 1024, 100 * 1024)
+
+
+def make_posting(size: int) -> str:
+    return (POSTING_BLOCK * (size // len(POSTING_BLOCK) + 1))[:size]
+
+
+def main():
+    processor = DocumentProcessor()
+    print("Section extraction only (requirements/responsibilities/skills):")
+    print(f"{'size':>8}{'legacy ms':>14}{'single-pass ms':>16}{'speedup':>10}")
+    for size in SIZES:
+        posting = make_posting(size)
+        number = max(1, 200_000 // size)
+        legacy = best_ms(lambda: legacy_extract(processor, posting), number)
+        current = best_ms(lambda: processor._parse_job_sections(posting), number)
+        print(f"{size // 1024:>6}KB{legacy:>14.2f}{current:>16.2f}{legacy / current:>9.1f}x")
+
+    print("\nFull process_job_description (cleaning, chunking and extraction):")
+    print(f"{'size':>8}{'legacy ms':>14}{'single-pass ms':>16}{'speedup':>10}")
+    for size in SIZES:
+        posting = make_posting(size)
+        number = max(1, 200_000 // size)
+        legacy = best_ms(lambda: legacy_process(processor, posting), number)
+        current = best_ms(lambda: processor.process_job_description(posting), number)
+        print(f"{size // 1024:>6}KB{legacy:>14.2f}{current:>16.2f}{legacy / current:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare Ollama prefill cost for the "classic" and "prefix" prompt layouts.
+
+Runs a series of generations whose candidate/job details change on every request
+and reports Ollama's prompt_eval_count and prompt_eval_duration for each layout.
+With the prefix layout the static instructions stay in the server's KV cache, so
+only the per-request suffix should be evaluated after the first call.
+
+With --stub the benchmark runs against the in-process Ollama stand-in
+(utils/ollama_stub.py), whose simulated prefix cache reports the same counts, so
+it can run in CI without a model.
+
+Usage:
+    python benchmarks/bench_prompt_prefix.py --runs 5
+    python benchmarks/bench_prompt_prefix.py --runs 5 --stub
+"""
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import APP_SETTINGS, LLM_CACHE_SETTINGS  # noqa: E402
+from utils.llm_utils import OllamaLLM  # noqa: E402
+from utils.ollama_stub import OllamaStub  # noqa: E402
+from utils.prompt_templates import build_cover_letter_prompt  # noqa: E402
+
+RESUME = (
+    "Education B.S. Computer Science, State University, GPA 3.8 "
+    "Experience Software Engineer at Example Corp building data pipelines in Python and Go. "
+    "Projects Languages: Python, Go, SQL Frameworks: Django, FastAPI Developer Tools: Docker, Git"
+)
+
+
+def run_layout(llm: OllamaLLM, layout: str, runs: int) -> dict:
+    counts, durations = [], []
+    for i in range(runs):
+        prompt = build_cover_letter_prompt(
+            resume_text=RESUME,
+            job_description={'full_text': f"Job {i} ({layout}): backend engineer #{i}, Python, distributed systems."},
+            company_research=f"Company Overview: Company {i} builds developer tools.",
+            tone="Professional",
+            style="Technical",
+            company_name=f"Company {i}",
+            layout=layout
+        )['prompt']
+        for _ in llm.stream_cover_letter(prompt):
+            pass
+        stats = llm.last_stats
+        counts.append(stats['prompt_eval_count'] or 0)
+        durations.append((stats['prompt_eval_duration'] or 0.0) * 1000)
+    # The first request of each layout has to fill the cache, so report it separately
+    return {
+        'first_eval_count': counts[0],
+        'first_eval_ms': durations[0],
+        'warm_eval_count': statistics.mean(counts[1:]) if runs > 1 else counts[0],
+        'warm_eval_ms': statistics.mean(durations[1:]) if runs > 1 else durations[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--num-predict', type=int, default=16, help="Tokens to generate per request")
+    parser.add_argument('--stub', action='store_true', help="Use the in-process Ollama stand-in")
+    args = parser.parse_args()
+
+    LLM_CACHE_SETTINGS['enabled'] = False
+
+    stub = None
+    if args.stub:
+        # One slot, so each request is matched against the previous prompt like a single-slot server
+        stub = OllamaStub(tokens_per_second=1000.0, num_parallel=1).start()
+        APP_SETTINGS['ollama_host'] = stub.url
+    try:
+        llm = OllamaLLM()
+        llm.max_tokens = args.num_predict
+        results = {layout: run_layout(llm, layout, args.runs) for layout in ("classic", "prefix")}
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    print(f"{'layout':<10}{'first tokens':>14}{'first ms':>12}{'warm tokens':>14}{'warm ms':>12}")
+    for layout, r in results.items():
+        print(f"{layout:<10}{r['first_eval_count']:>14}{r['first_eval_ms']:>12.1f}"
+              f"{r['warm_eval_count']:>14.0f}{r['warm_eval_ms']:>12.1f}")
+    if results['classic']['warm_eval_ms']:
+        saved = 1 - results['prefix']['warm_eval_ms'] / results['classic']['warm_eval_ms']
+        print(f"\nWarm prompt-eval time reduced by {saved:.0%} with the prefix layout")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the streaming scraper against full BeautifulSoup trees on saved pages.
+
+Compares time and peak traced memory for the Behance project-title and Google
+search-snippet extractions on the fixtures in benchmarks/fixtures. The legacy
+path decodes the whole body and builds a complete ``html.parser`` tree, as the
+agents did before; the current path feeds raw bytes in 64 KB chunks and stops
+once enough items are found.
+
+Usage:
+    python benchmarks/bench_scraping.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from utils.scraping import CHUNK_SIZE, extract_texts  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def legacy_behance(data: bytes):
+    soup = BeautifulSoup(data.decode('utf-8'), 'html.parser')
+    return [element.get_text() for element in soup.find_all('div', class_='Project-title')[:3]]
+
+
+def current_behance(data: bytes):
+    return extract_texts(_chunks(data), 'div', 'Project-title', limit=3)
+
+
+def legacy_google(data: bytes):
+    soup = BeautifulSoup(data.decode('utf-8'), 'html.parser')
+    for result in soup.find_all('div', class_='BNeawe'):
+        text = result.get_text()
+        if len(text) > 100:
+            return [text]
+    return []
+
+
+def current_google(data: bytes):
+    return extract_texts(_chunks(data), 'div', 'BNeawe', limit=1, accept=lambda text: len(text) > 100)
+
+
+def _chunks(data: bytes):
+    """Mimic response.iter_content() over the fixture."""
+    return (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+
+
+def peak_memory(fn, data):
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    cases = [
+        ('behance_profile.html', legacy_behance, current_behance),
+        ('google_search.html', legacy_google, current_google),
+    ]
+    print(f"{'fixture':<22}{'size':>9}{'legacy ms':>12}{'current ms':>12}{'speedup':>9}"
+          f"{'legacy peak':>14}{'current peak':>14}")
+    for name, legacy, current in cases:
+        with open(os.path.join(FIXTURES, name), 'rb') as f:
+            data = f.read()
+        assert legacy(data) == current(data), f"{name}: extraction results differ"
+
+        runs = 5
+        legacy_ms = min(timeit.repeat(lambda: legacy(data), number=1, repeat=runs)) * 1000
+        current_ms = min(timeit.repeat(lambda: current(data), number=1, repeat=runs)) * 1000
+        print(f"{name:<22}{len(data) // 1024:>7}KB{legacy_ms:>12.1f}{current_ms:>12.1f}"
+              f"{legacy_ms / current_ms:>8.1f}x{peak_memory(legacy, data) / 2**20:>12.1f}MB"
+              f"{peak_memory(current, data) / 2**20:>12.2f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""Micro-benchmarks for the non-LLM hot paths, checked against a stored baseline.
+
+Times PDF extraction, text cleaning, job description parsing, prompt building,
+letter formatting, quality checks, PDF export and the agents' HTML parsing on the committed
+fixture corpora in benchmarks/fixtures (small, typical and pathological inputs).
+Every case records the best time per call and the peak traced memory of one call,
+and runs offline: OllamaLLM talks to the in-process stand-in and caches are off.
+
+Every timing repeat is paired with a run of a fixed pure-Python calibration loop and
+cases are compared by the median ratio to that loop, so a baseline recorded on one
+machine stays meaningful on another and drifting CPU speed on shared runners is
+factored out. The run exits non-zero when a case is
+slower than its baseline by more than ``--time-tolerance`` or allocates more than
+``--memory-tolerance`` above it.
+
+Usage:
+    python benchmarks/bench_suite.py                      # compare with benchmarks/baseline.json
+    python benchmarks/bench_suite.py --filter prompt      # only cases whose name contains "prompt"
+    python benchmarks/bench_suite.py --update-baseline    # record a new baseline after a deliberate change
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import APP_SETTINGS, EXTRACTION_CACHE_SETTINGS, LLM_CACHE_SETTINGS  # noqa: E402
+from utils.document_processor import DocumentProcessor  # noqa: E402
+from utils.llm_utils import OllamaLLM  # noqa: E402
+from utils.ollama_stub import OllamaStub  # noqa: E402
+from utils.pdf_renderer import get_pdf_cache  # noqa: E402
+from utils.prompt_templates import get_cover_letter_prompt  # noqa: E402
+from utils.qa_utils import get_quality_checker  # noqa: E402
+from utils.scraping import CHUNK_SIZE, extract_texts  # noqa: E402
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(BENCHMARK_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+SIZES = ('small', 'typical', 'pathological')
+DEFAULT_TIME_TOLERANCE = 0.30
+DEFAULT_MEMORY_TOLERANCE = 0.10
+# Differences below these are timer and allocator noise, whatever the ratio
+TIME_NOISE_MS = 0.05
+MEMORY_NOISE_KB = 16
+TARGET_REPEAT_SECONDS = 0.05
+
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def calibrate() -> float:
+    """Best time in ms of a fixed interpreter-bound workload, used to normalize results."""
+    def workload():
+        total = 0
+        for i in range(50_000):
+            total += i * i % 7
+        return "".join(str(i) for i in range(5_000)).count("7") + total
+    return min(timeit.repeat(workload, number=1, repeat=3)) * 1000
+
+
+def build_cases(doc_processor: DocumentProcessor, llm: OllamaLLM):
+    """Return [(name, fn)]; every fn takes no arguments and does one unit of work."""
+    cases = []
+    resume_texts = {}
+    for size in SIZES:
+        pdf = fixture(f'resume_{size}.pdf')
+        resume_texts[size] = doc_processor.extract_text_from_pdf(pdf)
+        cases.append((f'extract_text_from_pdf[{size}]', lambda pdf=pdf: doc_processor.extract_text_from_pdf(pdf)))
+
+    raw_resume = fixture('resume_pathological.pdf')
+    raw_text = doc_processor._extract_raw_text(raw_resume)
+    raw_jd = fixture('jd_pathological.txt').decode('utf-8')
+    cases.append(('_clean_text[resume_raw]', lambda: doc_processor._clean_text(raw_text)))
+    cases.append(('_clean_text[jd_pathological]', lambda: doc_processor._clean_text(raw_jd)))
+
+    jobs = {}
+    for size in SIZES:
+        posting = fixture(f'jd_{size}.txt').decode('utf-8')
+        jobs[size] = doc_processor.process_job_description(posting)
+        cases.append((f'process_job_description[{size}]',
+                      lambda posting=posting: doc_processor.process_job_description(posting)))
+
+    for size in SIZES:
+        def build_prompt(size=size):
+            return get_cover_letter_prompt(
+                resume_text=resume_texts[size],
+                job_description=jobs[size],
+                company_research="Company Overview: Northwind Analytics helps retailers forecast demand.",
+                company_name="Northwind Analytics"
+            )
+        cases.append((f'get_cover_letter_prompt[{size}]', build_prompt))
+
+    checker = get_quality_checker()
+    for size in SIZES:
+        letter = fixture(f'letter_{size}.txt').decode('utf-8')
+        formatted = llm._format_cover_letter(letter)
+        cases.append((f'_format_cover_letter[{size}]', lambda letter=letter: llm._format_cover_letter(letter)))
+        cases.append((f'analyze_cover_letter[{size}]', lambda letter=letter: checker.analyze_cover_letter(letter)))
+
+        def export(formatted=formatted):
+            get_pdf_cache().clear()  # Measure the render, not a cache hit
+            return llm.export_to_pdf(formatted)
+        cases.append((f'export_to_pdf[{size}]', export))
+
+    html_cases = [
+        ('small', 'html_small.html', 'Project-title', 3, None),
+        ('behance', 'behance_profile.html', 'Project-title', 3, None),
+        ('google', 'google_search.html', 'BNeawe', 1, lambda text: len(text) > 100),
+        ('pathological', 'html_pathological.html', 'Project-title', 3, None),
+    ]
+    for label, name, class_name, limit, accept in html_cases:
+        data = fixture(name)
+
+        def parse(data=data, class_name=class_name, limit=limit, accept=accept):
+            chunks = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+            return extract_texts(chunks, 'div', class_name, limit=limit, accept=accept)
+        cases.append((f'extract_texts[{label}]', parse))
+    return cases
+
+
+def measure(fn, repeat: int) -> dict:
+    """Best time per call, median time relative to the calibration loop and peak traced memory of one call."""
+    fn()  # Warm up lazy imports and per-process caches
+    single = timeit.timeit(fn, number=1)
+    number = max(1, int(TARGET_REPEAT_SECONDS / max(single, 1e-6)))
+    times, relative = [], []
+    for _ in range(repeat):
+        calibration_ms = calibrate()
+        time_ms = timeit.timeit(fn, number=number) / number * 1000
+        times.append(time_ms)
+        relative.append(time_ms / calibration_ms)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'time_ms': round(min(times), 4),
+        'relative': round(statistics.median(relative), 6),
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float):
+    """Return (rows, regressions); times are scaled to the baseline machine by the calibration runs."""
+    rows, regressions = [], []
+    for name, current in results['cases'].items():
+        previous = baseline['cases'].get(name)
+        if previous is None:
+            rows.append((name, current, None, None, None))
+            continue
+        time_ratio = current['relative'] / previous['relative'] if previous['relative'] else 1.0
+        time_ms = previous['time_ms'] * time_ratio
+        memory_ratio = current['peak_kb'] / previous['peak_kb'] if previous['peak_kb'] else 1.0
+        rows.append((name, dict(current, time_ms=time_ms), previous, time_ratio, memory_ratio))
+        if time_ratio > 1 + time_tolerance and time_ms - previous['time_ms'] > TIME_NOISE_MS:
+            regressions.append(f"{name}: {time_ms:.3f}ms vs baseline {previous['time_ms']:.3f}ms "
+                               f"(+{(time_ratio - 1) * 100:.0f}%, tolerance {time_tolerance * 100:.0f}%)")
+        if memory_ratio > 1 + memory_tolerance and current['peak_kb'] - previous['peak_kb'] > MEMORY_NOISE_KB:
+            regressions.append(f"{name}: peak {current['peak_kb']:.0f}KB vs baseline {previous['peak_kb']:.0f}KB "
+                               f"(+{(memory_ratio - 1) * 100:.0f}%, tolerance {memory_tolerance * 100:.0f}%)")
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--filter', default='', help="Only run cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--time-tolerance', type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    LLM_CACHE_SETTINGS['enabled'] = False
+    EXTRACTION_CACHE_SETTINGS['enabled'] = False
+
+    with OllamaStub() as stub:
+        APP_SETTINGS['ollama_host'] = stub.url
+        llm = OllamaLLM()
+        doc_processor = DocumentProcessor(use_process_pool=False)
+        cases = [(name, fn) for name, fn in build_cases(doc_processor, llm) if args.filter in name]
+
+        results = {
+            'python': platform.python_version(),
+            'cases': {name: measure(fn, args.repeat) for name, fn in cases}
+        }
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        baseline = {'python': results['python'], 'cases': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline['cases'] = json.load(f)['cases']
+        baseline['cases'].update(results['cases'])
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+
+    print(f"times scaled to the baseline machine (Python {baseline['python']}); "
+          f"tolerance {args.time_tolerance * 100:.0f}% time, {args.memory_tolerance * 100:.0f}% memory\n")
+    print(f"{'case':<40}{'ms':>10}{'base ms':>10}{'time':>8}{'peak KB':>10}{'base KB':>10}{'mem':>8}")
+    for name, current, previous, time_ratio, memory_ratio in rows:
+        if previous is None:
+            print(f"{name:<40}{current['time_ms']:>10.3f}{'-':>10}{'new':>8}{current['peak_kb']:>10.0f}{'-':>10}{'new':>8}")
+            continue
+        print(f"{name:<40}{current['time_ms']:>10.3f}{previous['time_ms']:>10.3f}{time_ratio:>7.2f}x"
+              f"{current['peak_kb']:>10.0f}{previous['peak_kb']:>10.0f}{memory_ratio:>7.2f}x")
+    for regression in regressions:
+        print(f"FAIL: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
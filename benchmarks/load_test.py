@@ -0,0 +1,160 @@
+"""Drive the full generation pipeline at N concurrent users and report throughput and latency.
+
+Each request extracts a resume PDF with DocumentProcessor, parses a job description,
+builds the prompt and generates a letter with OllamaLLM. By default requests go to an
+in-process Ollama stand-in (utils/ollama_stub.py), so the pipeline can be load tested
+without a model; pass --live to target the server at OLLAMA_HOST instead.
+
+Usage:
+    python benchmarks/load_test.py --users 8 --requests 5 --tokens-per-second 40 --num-parallel 4
+    python benchmarks/load_test.py --users 2 --requests 2 --live
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import APP_SETTINGS, EXTRACTION_CACHE_SETTINGS, LLM_CACHE_SETTINGS  # noqa: E402
+from utils.batch_runner import percentile  # noqa: E402
+from utils.document_processor import DocumentProcessor  # noqa: E402
+from utils.llm_utils import OllamaLLM  # noqa: E402
+from utils.ollama_stub import OllamaStub  # noqa: E402
+from utils.pdf_renderer import render_pdf  # noqa: E402
+from utils.prompt_templates import build_cover_letter_prompt  # noqa: E402
+from utils.telemetry import get_registry  # noqa: E402
+
+RESUME_TEXT = (
+    "Jane Doe\n\nEducation\nB.S. Computer Science, State University, 2016\n\n"
+    "Experience\nSenior Software Engineer, Example Corp, 2019-present. Built streaming data pipelines "
+    "in Python and Go, led the migration to Kubernetes and mentored four engineers.\n\n"
+    "Software Engineer, Startup Inc, 2016-2019. Shipped the billing service and its PostgreSQL schema.\n\n"
+    "Projects\nLanguages: Python, Go, SQL Frameworks: Django, FastAPI Developer Tools: Docker, Terraform"
+)
+JOB_DESCRIPTION = """Senior Backend Engineer
+
+Responsibilities:
+- Design and build services in Python and Go
+- Own reliability of the payments ledger
+
+Requirements:
+- 5+ years building distributed systems
+- Strong SQL and data modelling experience
+
+Skills:
+Python, Go, PostgreSQL, Kafka, Kubernetes
+"""
+
+
+def run_request(doc_processor: DocumentProcessor, llm: OllamaLLM, resume_pdf: bytes, user: int) -> dict:
+    """One end-to-end generation; returns per-stage timings in seconds."""
+    timings = {}
+    start = time.perf_counter()
+    resume_text = doc_processor.extract_text_from_pdf(resume_pdf)
+    timings['extract'] = time.perf_counter() - start
+
+    stage = time.perf_counter()
+    job = doc_processor.process_job_description(JOB_DESCRIPTION)
+    prompt = build_cover_letter_prompt(
+        resume_text=resume_text,
+        job_description=job,
+        company_name=f"Company {user}",
+        tone="Professional",
+        style="Technical"
+    )['prompt']
+    timings['prompt'] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    llm.generate_cover_letter(prompt)
+    timings['generate'] = time.perf_counter() - stage
+    timings['total'] = time.perf_counter() - start
+    timings['time_to_first_token'] = llm.last_stats.get('time_to_first_token')
+    return timings
+
+
+def run_load(users: int, requests_per_user: int, resume_pdf: bytes) -> dict:
+    doc_processor = DocumentProcessor()
+    llm = OllamaLLM()
+    results = []
+    errors = []
+    lock = threading.Lock()
+
+    def user_loop(user: int):
+        for _ in range(requests_per_user):
+            try:
+                timings = run_request(doc_processor, llm, resume_pdf, user)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                results.append(timings)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(user_loop, range(users)))
+    return {'elapsed': time.perf_counter() - start, 'results': results, 'errors': errors}
+
+
+def report(run: dict, users: int):
+    results, elapsed = run['results'], run['elapsed']
+    total = len(results) + len(run['errors'])
+    print(f"\n{users} users, {total} requests in {elapsed:.1f}s "
+          f"({len(results) / elapsed:.2f} req/s, {len(results) / elapsed * 60:.1f} letters/min, "
+          f"{len(run['errors'])} errors)")
+    print(f"\n{'stage':<22}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for stage in ('extract', 'prompt', 'time_to_first_token', 'generate', 'total'):
+        values = [r[stage] for r in results if r[stage] is not None]
+        if not values:
+            continue
+        print(f"{stage:<22}{statistics.mean(values):>8.3f}s{percentile(values, 50):>8.3f}s"
+              f"{percentile(values, 95):>8.3f}s{percentile(values, 99):>8.3f}s")
+    for error in sorted(set(run['errors']))[:5]:
+        print(f"error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=4, help="Concurrent users")
+    parser.add_argument('--requests', type=int, default=5, help="Requests per user")
+    parser.add_argument('--num-predict', type=int, default=128, help="Tokens to generate per request")
+    parser.add_argument('--live', action='store_true', help="Use the Ollama server at OLLAMA_HOST")
+    parser.add_argument('--extraction-cache', action='store_true', help="Keep the PDF extraction cache on")
+    parser.add_argument('--tokens-per-second', type=float, default=40.0, help="Stand-in generation speed")
+    parser.add_argument('--prompt-tokens-per-second', type=float, default=400.0, help="Stand-in prefill speed")
+    parser.add_argument('--load-latency', type=float, default=0.0, help="Stand-in per-request latency")
+    parser.add_argument('--num-parallel', type=int, default=4, help="Stand-in parallel slots")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Stand-in failure probability")
+    parser.add_argument('--metrics', action='store_true', help="Print the Prometheus metrics after the run")
+    args = parser.parse_args()
+
+    LLM_CACHE_SETTINGS['enabled'] = False
+    EXTRACTION_CACHE_SETTINGS['enabled'] = args.extraction_cache
+    APP_SETTINGS['max_tokens'] = args.num_predict
+    resume_pdf = render_pdf(RESUME_TEXT)
+
+    stub = None
+    if not args.live:
+        stub = OllamaStub(
+            tokens_per_second=args.tokens_per_second,
+            prompt_tokens_per_second=args.prompt_tokens_per_second,
+            load_latency=args.load_latency,
+            num_parallel=args.num_parallel,
+            failure_rate=args.failure_rate
+        ).start()
+        APP_SETTINGS['ollama_host'] = stub.url
+    try:
+        report(run_load(args.users, args.requests, resume_pdf), args.users)
+        if args.metrics:
+            print("\n" + get_registry().render())
+    finally:
+        if stub is not None:
+            stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -13,8 +13,12 @@ APP_SETTINGS = {
     'debug': os.getenv('DEBUG', 'False') == 'True',
     'ollama_host': os.getenv('OLLAMA_HOST', 'http://localhost:11434'),
     'model_name': os.getenv('MODEL_NAME', 'llama2:13b'),
-    'max_tokens': int(os.getenv('MAX_TOKENS', '2048')),
+    'max_tokens': int(os.getenv('MAX_TOKENS', '1024')),  # num_predict; also kept free in num_ctx for the letter
     'temperature': float(os.getenv('TEMPERATURE', '0.7')),
+    'seed': int(os.getenv('SEED')) if os.getenv('SEED') else None,  # Pin for reproducible output
+    'keep_alive': os.getenv('OLLAMA_KEEP_ALIVE', '30m'),  # Keep the model and its KV cache loaded
+    'num_ctx': int(os.getenv('NUM_CTX', '4096')),
+    'health_check_interval': float(os.getenv('HEALTH_CHECK_INTERVAL', '60')),  # Seconds between Ollama checks
 }
 
 # Document processing settings
@@ -23,6 +27,10 @@ DOC_SETTINGS = {
     'allowed_file_types': ['pdf', 'docx', 'txt'],
     'chunk_size': 1000,
     'chunk_overlap': 200,
+    'pdf_workers': int(os.getenv('PDF_WORKERS', str(os.cpu_count() or 2))),
+    'use_process_pool': os.getenv('PDF_PROCESS_POOL', 'True') == 'True',
+    'parallel_page_threshold': 8,  # Split documents with at least this many pages
+    'min_pages_per_task': 4,
 }
 
 # Quality assurance settings
@@ -31,6 +39,8 @@ QA_SETTINGS = {
     'max_readability_score': 70,
     'min_letter_length': 250,
     'max_letter_length': 400,
+    'batch_workers': int(os.getenv('QA_WORKERS', str(os.cpu_count() or 2))),
+    'parallel_batch_threshold': int(os.getenv('QA_PARALLEL_THRESHOLD', '200')),  # Smaller batches run inline
 }
 
 # Streamlit page configuration
@@ -45,8 +55,133 @@ STREAMLIT_SETTINGS = {
 RESEARCH_SETTINGS = {
     'news_api_key': os.getenv('NEWS_API_KEY', ''),
     'cache_expiration': 24 * 60 * 60,  # 24 hours in seconds
+    'max_stale_age': 7 * 24 * 60 * 60,  # Serve stale research (refreshing in background) up to 7 days old
+    'refresh_workers': 4,
+    'source_workers': 8,
+    'research_deadline': 8,  # Seconds for all sources together; late sources are dropped
+    'partial_cache_expiration': 60 * 60,  # Cache partial results for 1 hour
+    'empty_cache_expiration': 15 * 60,  # Remember companies with no results for 15 minutes
     'cache_dir': CACHE_DIR,  # Now using the CACHE_DIR constant
+    'store_path': os.path.join(CACHE_DIR, 'research.sqlite3'),
+    'max_cached_companies': 50000,
+    'size_check_interval': 100,  # Writes between size-cap checks; the cap may be exceeded by this many
     'max_news_results': 3,
     'enable_web_scraping': True,
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-}
\ No newline at end of file
+}
+
+# Shared HTTP transport settings
+HTTP_SETTINGS = {
+    'connect_timeout': float(os.getenv('HTTP_CONNECT_TIMEOUT', '5')),
+    'read_timeout': float(os.getenv('HTTP_READ_TIMEOUT', '30')),
+    'llm_read_timeout': float(os.getenv('LLM_READ_TIMEOUT', '300')),  # Slow CPU generations
+    'pool_connections': 10,  # Number of hosts kept in the pool
+    'pool_maxsize': 10,  # Connections per host
+    'max_retries': 3,
+    'backoff_factor': 0.5,
+    'retry_statuses': [429, 500, 502, 503, 504],
+}
+
+# Ingestion pipeline settings (deadlines in seconds from the start of a run)
+PIPELINE_SETTINGS = {
+    'io_workers': int(os.getenv('IO_WORKERS', '8')),
+    'resume_deadline': 60,
+    'document_deadline': 60,
+    'portfolio_deadline': 30,
+    'research_deadline': 30,
+}
+
+# PDF export settings
+PDF_SETTINGS = {
+    'max_memory_bytes': 16 * 1024 * 1024,  # Rendered PDFs kept for repeat downloads
+    'render_workers': int(os.getenv('PDF_RENDER_WORKERS', str(os.cpu_count() or 2))),
+}
+
+# Portfolio analysis settings
+PORTFOLIO_SETTINGS = {
+    'url_workers': int(os.getenv('PORTFOLIO_WORKERS', '4')),
+    'url_timeout': 20,  # Seconds per portfolio URL; below the pipeline's portfolio_deadline
+}
+
+# PDF extraction cache settings
+EXTRACTION_CACHE_SETTINGS = {
+    'enabled': os.getenv('EXTRACTION_CACHE', 'True') == 'True',
+    'max_memory_bytes': 32 * 1024 * 1024,  # 32MB of extracted text
+    'disk_enabled': os.getenv('EXTRACTION_DISK_CACHE', 'True') == 'True',
+    'disk_dir': os.path.join(CACHE_DIR, 'extraction'),
+    'max_disk_bytes': 256 * 1024 * 1024,  # 256MB
+}
+
+# Headless batch generation settings
+BATCH_SETTINGS = {
+    'max_workers': int(os.getenv('BATCH_WORKERS', '2')),  # Match OLLAMA_NUM_PARALLEL on the server
+    'results_file': 'results.jsonl',
+    'pdf_archive': 'cover_letters.zip',
+    'qa_report': 'qa_report.json',
+}
+
+# LLM response cache settings
+LLM_CACHE_SETTINGS = {
+    'enabled': os.getenv('LLM_CACHE', 'True') == 'True',
+    # Responses are always cached when a seed is pinned or temperature is 0;
+    # set this to also cache sampled (non-deterministic) generations.
+    'cache_sampled': os.getenv('LLM_CACHE_SAMPLED', 'False') == 'True',
+    'ttl': 7 * 24 * 60 * 60,  # 7 days in seconds
+    'max_memory_bytes': 16 * 1024 * 1024,
+    'disk_enabled': True,
+    'disk_dir': os.path.join(CACHE_DIR, 'llm'),
+    'max_disk_bytes': 64 * 1024 * 1024,
+}
+
+# Parallel tone/style variants
+VARIANT_SETTINGS = {
+    'num_parallel': int(os.getenv('OLLAMA_NUM_PARALLEL', '4')),  # Match the server's parallel slots
+    'max_variants': 4,
+    'warm_shared_prefix': True,  # Evaluate the common prompt text once before fanning out
+}
+
+# Prompt construction settings
+PROMPT_SETTINGS = {
+    # "prefix" keeps the static instructions first so Ollama can reuse them from its KV cache;
+    # "classic" is the original candidate-information-first order.
+    'layout': os.getenv('PROMPT_LAYOUT', 'prefix'),
+    # Kept free for the letter; generation never asks for more (num_predict is capped at it)
+    'reserve_output_tokens': APP_SETTINGS['max_tokens'],
+    'chars_per_token': 3.5,  # Conservative estimate for llama tokenizers
+    # Lower numbers are kept first when the prompt has to be trimmed
+    'section_priorities': {
+        'experience': 1,
+        'job_details': 2,
+        'skills': 3,
+        'education': 4,
+        'company_research': 5,
+        'portfolio': 6,
+        'supporting_details': 7,
+    },
+    'section_min_tokens': 64,
+}
+
+# Relevance-ranked retrieval from the resume and additional documents
+RETRIEVAL_SETTINGS = {
+    'top_k': int(os.getenv('RETRIEVAL_TOP_K', '4')),
+}
+
+# GitHub API settings for portfolio analysis
+GITHUB_SETTINGS = {
+    'api_url': os.getenv('GITHUB_API_URL', 'https://api.github.com'),
+    'token': os.getenv('GITHUB_TOKEN', ''),  # Optional; raises the rate limit from 60 to 5000 req/h
+    'per_page': 100,
+    'max_pages': 10,
+    'cache_dir': os.path.join(CACHE_DIR, 'github'),
+    'max_memory_bytes': 8 * 1024 * 1024,
+    'max_disk_bytes': 64 * 1024 * 1024,
+    'rate_limit_reserve': 2,  # Stop spending requests when this few remain
+    'max_rate_limit_wait': 5,  # Seconds we are willing to sleep for a reset
+}
+
+# Logging and metrics
+TELEMETRY_SETTINGS = {
+    'log_level': os.getenv('LOG_LEVEL', 'WARNING'),  # Progress messages are INFO, prompt details DEBUG
+    'metrics_port': int(os.getenv('METRICS_PORT', '0')),  # Prometheus /metrics endpoint; 0 disables it
+    'metrics_host': os.getenv('METRICS_HOST', '127.0.0.1'),
+}
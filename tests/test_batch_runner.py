@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from utils.batch_runner import BatchRunner, letter_filename, load_manifest, percentile
+from utils.document_processor import DocumentProcessor
+
+RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      'benchmarks', 'fixtures', 'resume_small.pdf')
+
+
+class FakeLLM:
+    """Returns a canned letter per company; raises KeyboardInterrupt once ``stop_after`` letters are done."""
+
+    def __init__(self, stop_after=None):
+        self.stop_after = stop_after
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_cover_letter(self, prompt):
+        with self._lock:
+            if self.stop_after is not None and len(self.prompts) >= self.stop_after:
+                raise KeyboardInterrupt  # Stands in for the process being killed
+            self.prompts.append(prompt)
+        return "Dear Hiring Manager,\n\nI shipped the billing service.\n\nSincerely,\nJane"
+
+
+class BatchRunnerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.tmp_dir, 'out')
+        self.doc_processor = DocumentProcessor(use_process_pool=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write_manifest(self, rows):
+        path = os.path.join(self.tmp_dir, 'jobs.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(json.dumps(row) for row in rows) + "\n\n")
+        return path
+
+    def runner(self, llm, max_workers=1):
+        return BatchRunner(doc_processor=self.doc_processor, llm=llm, max_workers=max_workers)
+
+
+class TestManifest(BatchRunnerTestCase):
+    def test_defaults_and_stable_ids(self):
+        path = self.write_manifest([
+            {'company_name': 'Acme', 'job_description': 'Build APIs'},
+            {'company_name': 'Globex', 'job_description': 'Run ops', 'tone': 'Friendly', 'id': 'globex'},
+        ])
+
+        first, second = load_manifest(path)
+
+        self.assertEqual((first['tone'], first['style']), ('Professional', 'Standard'))
+        self.assertEqual(len(first['id']), 16)
+        self.assertEqual(load_manifest(path)[0]['id'], first['id'])
+        self.assertEqual((second['id'], second['tone']), ('globex', 'Friendly'))
+
+    def test_missing_fields_are_rejected(self):
+        path = self.write_manifest([{'company_name': 'Acme', 'job_description': 'x'}, {'company_name': 'Acme'}])
+
+        with self.assertRaisesRegex(Exception, "line 2"):
+            load_manifest(path)
+
+    def test_percentile(self):
+        latencies = [5.0, 1.0, 3.0, 2.0, 4.0]
+
+        self.assertEqual(percentile(latencies, 50), 3.0)
+        self.assertEqual(percentile(latencies, 95), 5.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+
+class TestCheckpoints(BatchRunnerTestCase):
+    def test_unsafe_ids_do_not_escape_the_output_dir(self):
+        for row_id in ('../x', 'a/b', '..', '', 'C:\\evil'):
+            name = letter_filename(row_id)
+            self.assertRegex(name, r'\A[0-9a-f]{16}\Z', row_id)
+        self.assertEqual(letter_filename('acme-2024_v1.2'), 'acme-2024_v1.2')
+
+        path = self.write_manifest([{'company_name': 'Acme', 'job_description': 'Build APIs', 'id': '../x'}])
+        runner = self.runner(FakeLLM())
+        runner.run(path, RESUME, self.output_dir)
+
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ['jobs.jsonl', 'out'])
+        self.assertIn(f"{letter_filename('../x')}.txt", os.listdir(self.output_dir))
+        with zipfile.ZipFile(runner.export_pdfs(self.output_dir)) as archive:
+            self.assertEqual(archive.namelist(), [f"{letter_filename('../x')}.pdf"])
+
+    def test_reports_on_a_fresh_output_dir(self):
+        os.makedirs(self.output_dir)
+        runner = self.runner(FakeLLM())
+
+        with open(runner.score_letters(self.output_dir), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {})
+        with zipfile.ZipFile(runner.export_pdfs(self.output_dir)) as archive:
+            self.assertEqual(archive.namelist(), [])
+
+    def test_interrupted_run_resumes_where_it_stopped(self):
+        rows = [{'company_name': f'Company {i}', 'job_description': 'Build APIs', 'id': f'row{i}'} for i in range(5)]
+        path = self.write_manifest(rows)
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.runner(FakeLLM(stop_after=2)).run(path, RESUME, self.output_dir)
+        results_path = os.path.join(self.output_dir, 'results.jsonl')
+        with open(results_path, 'a', encoding='utf-8') as f:
+            f.write('{"id": "row4", "cover_')  # A write cut off by the kill
+        with open(results_path, encoding='utf-8') as f:
+            finished = {json.loads(line)['id'] for line in f if line.endswith("\n")}
+        self.assertEqual(len(finished), 2)
+
+        llm = FakeLLM()
+        summary = self.runner(llm, max_workers=2).run(path, RESUME, self.output_dir)
+
+        self.assertEqual((summary['skipped'], summary['generated'], summary['failed']), (2, 3, 0))
+        self.assertEqual(len(llm.prompts), 3)
+        self.assertFalse(any(f"Company {row_id[3:]}" in prompt for prompt in llm.prompts for row_id in finished))
+        self.assertEqual(sorted(self.runner(FakeLLM())._load_letters(self.output_dir)),
+                         [row['id'] for row in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+import unittest
+from utils.cache import TieredCache, make_key
+
+
+class TestTieredCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.disk_dir = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_make_key_is_stable_and_part_sensitive(self):
+        self.assertEqual(make_key(b'pdf', '1'), make_key(b'pdf', '1'))
+        self.assertNotEqual(make_key(b'pdf', '1'), make_key(b'pdf', '2'))
+        self.assertNotEqual(make_key('ab', 'c'), make_key('a', 'bc'))
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = TieredCache(max_memory_bytes=10)
+        cache.set('a', 'aaaa')
+        cache.set('b', 'bbbb')
+        cache.get('a')
+        cache.set('c', 'cccc')
+
+        self.assertEqual(cache.get('a'), 'aaaa')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 'cccc')
+
+    def test_disk_tier_survives_new_instance(self):
+        TieredCache(max_memory_bytes=1024, disk_dir=self.disk_dir, max_disk_bytes=1024 * 1024).set('k', 'text')
+        cache = TieredCache(max_memory_bytes=1024, disk_dir=self.disk_dir, max_disk_bytes=1024 * 1024)
+        self.assertEqual(cache.get('k'), 'text')
+
+    def test_disk_tier_is_size_bounded(self):
+        cache = TieredCache(max_memory_bytes=0, disk_dir=self.disk_dir, max_disk_bytes=300)
+        for i in range(10):
+            cache.set(f'k{i}', 'x' * 100)
+
+        total = sum(os.path.getsize(os.path.join(self.disk_dir, name)) for name in os.listdir(self.disk_dir))
+        self.assertLessEqual(total, 300)
+        self.assertEqual(cache.get('k9'), 'x' * 100)
+
+    def test_expired_entries_are_misses(self):
+        cache = TieredCache(max_memory_bytes=1024, disk_dir=self.disk_dir, max_disk_bytes=1024 * 1024, ttl=0.05)
+        cache.set('k', 'text')
+        self.assertEqual(cache.get('k'), 'text')
+
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('k'))
+        self.assertEqual(os.listdir(self.disk_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,30 @@
 import unittest
+from config import APP_SETTINGS
 from utils.document_processor import DocumentProcessor
 from utils.llm_utils import OllamaLLM
+from utils.ollama_stub import OllamaStub
 from utils.qa_utils import QualityChecker
 import os
 import tempfile
 
+# Set OLLAMA_LIVE=True to run against the real server at OLLAMA_HOST instead of the stand-in
+LIVE_OLLAMA = os.getenv('OLLAMA_LIVE', 'False') == 'True'
+
 class TestCoverLetterGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = None
+        if not LIVE_OLLAMA:
+            cls.stub = OllamaStub().start()
+            cls.ollama_host = APP_SETTINGS['ollama_host']
+            APP_SETTINGS['ollama_host'] = cls.stub.url
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.stub is not None:
+            cls.stub.stop()
+            APP_SETTINGS['ollama_host'] = cls.ollama_host
+
     def setUp(self):
         self.doc_processor = DocumentProcessor()
         self.llm = OllamaLLM()
@@ -0,0 +1,99 @@
+import unittest
+from utils.document_processor import DocumentProcessor, _find_headers
+
+
+class TestFindHeaders(unittest.TestCase):
+    def test_line_and_inline_headers(self):
+        text = "## Key Responsibilities:\n- Build APIs\nRequirements\n- Python\nSkills: Python, SQL\nBenefits: Remote"
+
+        headers = _find_headers(text)
+
+        self.assertEqual([category for _, _, category in headers],
+                         ['responsibilities', 'requirements', 'skills', None])
+        start, end, _ = headers[2]
+        self.assertEqual(text[start:end], "Skills:")
+
+    def test_header_words_inside_sentences_are_not_headers(self):
+        text = "You will own the requirements process and the skills matrix.\nWe value responsibilities shared."
+
+        self.assertEqual(_find_headers(text), [])
+
+    def test_labels_after_a_sentence_end_the_previous_section(self):
+        headers = _find_headers("Requirements: Python. About the team: we are small.")
+
+        self.assertEqual([category for _, _, category in headers], ['requirements', None])
+
+
+class TestJobSections(unittest.TestCase):
+    def setUp(self):
+        self.doc_processor = DocumentProcessor(use_process_pool=False)
+
+    def test_bulleted_sections(self):
+        posting = """Senior Data Engineer
+
+About us: We build tools.
+
+Key Responsibilities:
+- Build data pipelines
+* Own the warehouse
+1. Mentor engineers
+
+Requirements
+• 5 years of Python
+• Experience with Airflow
+
+Skills: Python, SQL, Spark
+
+Benefits: Remote work
+"""
+        parsed = self.doc_processor.process_job_description(posting)
+
+        self.assertEqual(parsed['responsibilities'], ['Build data pipelines', 'Own the warehouse', 'Mentor engineers'])
+        self.assertEqual(parsed['requirements'], ['5 years of Python', 'Experience with Airflow'])
+        self.assertEqual(parsed['skills'], ['Python, SQL, Spark'])
+
+    def test_inline_lists_and_sentences(self):
+        posting = "Requirements: - Python - SQL - Docker\nResponsibilities: Build APIs. Review code; mentor juniors."
+
+        parsed = self.doc_processor._parse_job_sections(posting)
+
+        self.assertEqual(parsed['requirements'], ['Python', 'SQL', 'Docker'])
+        self.assertEqual(parsed['responsibilities'], ['Build APIs', 'Review code', 'mentor juniors'])
+        self.assertEqual(parsed['skills'], [])
+
+    def test_trailing_separators_are_stripped(self):
+        parsed = self.doc_processor._parse_job_sections("Skills: Go; Rust\nRequirements:\n- Docker,\n- Kubernetes.")
+
+        self.assertEqual(parsed['skills'], ['Go', 'Rust'])
+        self.assertEqual(parsed['requirements'], ['Docker', 'Kubernetes'])
+
+    def test_collapsed_newlines(self):
+        # Postings pasted from some sites arrive on one line; headers must still split the sections
+        posting = ("Software Engineer Position Requirements: 5+ years experience. Python expertise. "
+                   "Responsibilities: Lead development team. Implement best practices. "
+                   "Skills: Python, Go. Benefits: Health insurance.")
+
+        parsed = self.doc_processor._parse_job_sections(posting)
+
+        self.assertEqual(parsed['requirements'], ['5 years experience', 'Python expertise'])
+        self.assertEqual(parsed['responsibilities'], ['Lead development team', 'Implement best practices'])
+        self.assertEqual(parsed['skills'], ['Python, Go'])
+
+    def test_posting_without_headers(self):
+        posting = "We are looking for an engineer who loves building things. You will work with Python."
+
+        parsed = self.doc_processor.process_job_description(posting)
+
+        self.assertEqual((parsed['requirements'], parsed['responsibilities'], parsed['skills']), ([], [], []))
+        self.assertTrue(parsed['full_text'])
+
+    def test_repeated_sections_are_merged_without_duplicates(self):
+        posting = "Requirements:\n- Python\n- SQL\n\nPreferred Qualifications:\n- SQL\n- Kubernetes"
+
+        parsed = self.doc_processor._parse_job_sections(posting)
+
+        self.assertEqual(parsed['requirements'], ['Python', 'SQL', 'Kubernetes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from utils.cache import TieredCache
+from utils.deadlines import deadline
+from utils.github_client import GitHubClient
+
+REPOS = [{'name': f'repo{i}', 'fork': False} for i in range(150)]
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Serves /users/<name>/repos with Link pagination, ETags and rate-limit headers."""
+    requests_seen = []
+    remaining = 60
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        per_page = int(query.get('per_page', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        body = json.dumps(REPOS[(page - 1) * per_page:page * per_page]).encode()
+        etag = f'"page-{page}"'
+        type(self).requests_seen.append((page, self.headers.get('If-None-Match')))
+
+        not_modified = self.headers.get('If-None-Match') == etag
+        if not not_modified:
+            type(self).remaining -= 1
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        self.send_header('X-RateLimit-Limit', '60')
+        self.send_header('X-RateLimit-Remaining', str(type(self).remaining))
+        self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        if page * per_page < len(REPOS):
+            next_url = f"http://{self.headers['Host']}{parsed.path}?per_page={per_page}&page={page + 1}"
+            self.send_header('Link', f'<{next_url}>; rel="next"')
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestGitHubClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeGitHubHandler.requests_seen = []
+        FakeGitHubHandler.remaining = 60
+        self.client = GitHubClient(api_url=self.api_url, token='', cache=TieredCache(max_memory_bytes=1024 * 1024))
+
+    def test_follows_link_header_across_pages(self):
+        repos = self.client.list_user_repos('octo')
+        self.assertEqual([r['name'] for r in repos], [r['name'] for r in REPOS])
+        self.assertEqual([page for page, _ in FakeGitHubHandler.requests_seen], [1, 2])
+        self.assertEqual(self.client.rate_limit['remaining'], 58)
+
+    def test_repeat_fetch_revalidates_with_etag(self):
+        first = self.client.list_user_repos('octo')
+        second = self.client.list_user_repos('octo')
+
+        self.assertEqual(first, second)
+        self.assertEqual(FakeGitHubHandler.requests_seen[2:], [(1, '"page-1"'), (2, '"page-2"')])
+        self.assertEqual(FakeGitHubHandler.remaining, 58)
+
+    def test_serves_cache_without_request_when_rate_limit_exhausted(self):
+        self.client.list_user_repos('octo')
+        FakeGitHubHandler.requests_seen = []
+        self.client.rate_limit['remaining'] = 0
+
+        repos = self.client.list_user_repos('octo')
+        self.assertEqual(len(repos), len(REPOS))
+        self.assertEqual(FakeGitHubHandler.requests_seen, [])
+
+    def test_fails_fast_when_reset_is_far_away(self):
+        self.client.rate_limit = {'limit': 60, 'remaining': 0, 'reset': time.time() + 3600}
+        with self.assertRaises(Exception):
+            self.client.list_user_repos('octo')
+        self.assertEqual(FakeGitHubHandler.requests_seen, [])
+
+    def test_does_not_wait_for_reset_past_the_deadline(self):
+        self.client.rate_limit = {'limit': 60, 'remaining': 0, 'reset': time.time() + 2}
+
+        start = time.perf_counter()
+        with deadline(0.5), self.assertRaises(Exception):
+            self.client.list_user_repos('octo')
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(FakeGitHubHandler.requests_seen, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+import requests
+from config import HTTP_SETTINGS
+from utils.deadlines import deadline
+from utils.http_client import create_session, default_timeout, get_session
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers every request with 503 and counts requests per method.
+
+    A ``retry_after`` query parameter is sent back as the Retry-After header.
+    """
+    protocol_version = 'HTTP/1.1'
+    hits = {}
+    lock = threading.Lock()
+
+    def _unavailable(self):
+        with self.lock:
+            self.hits[self.command] = self.hits.get(self.command, 0) + 1
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.send_response(503)
+        if 'retry_after=' in self.path:
+            self.send_header('Retry-After', self.path.split('retry_after=', 1)[1])
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_POST = _unavailable
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTimeouts(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(requests.Session, 'request', return_value='response')
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = create_session()
+
+    def sent_timeout(self):
+        return self.request.call_args.kwargs['timeout']
+
+    def test_default_connect_and_read_timeout(self):
+        self.session.get("http://example.invalid/")
+
+        self.assertEqual(self.sent_timeout(), (HTTP_SETTINGS['connect_timeout'], HTTP_SETTINGS['read_timeout']))
+        self.assertEqual(default_timeout(120), (HTTP_SETTINGS['connect_timeout'], 120))
+
+    def test_explicit_timeout_wins(self):
+        self.session.get("http://example.invalid/", timeout=(1, 2))
+
+        self.assertEqual(self.sent_timeout(), (1, 2))
+
+    def test_deadline_caps_timeouts(self):
+        with deadline(0.5):
+            self.session.get("http://example.invalid/")
+            connect, read = self.sent_timeout()
+            self.session.get("http://example.invalid/", timeout=None)
+            unbounded = self.sent_timeout()
+        self.assertLessEqual(max(connect, read), 0.5)
+        self.assertLessEqual(unbounded, 0.5)
+
+        with deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(requests.exceptions.Timeout):
+                self.session.get("http://example.invalid/")
+
+
+class TestRetries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FlakyHandler.hits.clear()
+        with mock.patch.dict(HTTP_SETTINGS, {'backoff_factor': 0}):
+            self.session = create_session()
+
+    def test_only_idempotent_methods_are_retried(self):
+        self.assertEqual(self.session.get(self.url).status_code, 503)
+        self.assertEqual(self.session.post(self.url, json={'a': 1}).status_code, 503)
+
+        self.assertEqual(FlakyHandler.hits, {'GET': HTTP_SETTINGS['max_retries'] + 1, 'POST': 1})
+
+    def test_retry_after_past_the_deadline_gives_up(self):
+        start = time.perf_counter()
+        with deadline(1):
+            response = self.session.get(self.url + "?retry_after=3")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(response.status_code, 503)
+        self.assertLess(elapsed, 1)
+        self.assertEqual(FlakyHandler.hits, {'GET': 1})
+
+    def test_retry_after_within_the_deadline_is_honoured(self):
+        with deadline(5):
+            response = self.session.get(self.url + "?retry_after=0")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(FlakyHandler.hits, {'GET': HTTP_SETTINGS['max_retries'] + 1})
+
+
+class TestSharedSession(unittest.TestCase):
+    def test_one_session_per_process(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            sessions = list(pool.map(lambda _: get_session(), range(32)))
+
+        self.assertTrue(all(session is get_session() for session in sessions))
+        self.assertIsNot(create_session(), get_session())
+
+
+if __name__ == '__main__':
+    unittest.main()
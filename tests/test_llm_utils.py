@@ -0,0 +1,156 @@
+import unittest
+from unittest import mock
+from config import APP_SETTINGS, LLM_CACHE_SETTINGS, PROMPT_SETTINGS
+from utils.cache import TieredCache
+from utils.llm_utils import OllamaLLM
+from utils.ollama_stub import OllamaStub
+from utils.prompt_templates import build_cover_letter_prompt
+
+
+class TestOllamaLLM(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = OllamaStub(tokens_per_second=2000, seed=0).start()
+        cls.saved = dict(APP_SETTINGS), dict(LLM_CACHE_SETTINGS)
+        APP_SETTINGS['ollama_host'] = cls.stub.url
+        LLM_CACHE_SETTINGS['enabled'] = False
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+        APP_SETTINGS.update(cls.saved[0])
+        LLM_CACHE_SETTINGS.update(cls.saved[1])
+
+    def setUp(self):
+        self.llm = OllamaLLM()
+        self.llm.max_tokens = 20
+        self.stub.requests.clear()
+
+    def test_stream_reports_server_stats(self):
+        text = "".join(self.llm.stream_cover_letter("Write a cover letter for Acme."))
+        stats = self.llm.last_stats
+
+        self.assertTrue(text)
+        self.assertEqual(stats['eval_count'], 20)
+        self.assertIsNotNone(stats['time_to_first_token'])
+        self.assertGreater(stats['prompt_eval_count'], 0)
+        self.assertEqual(self.stub.requests[0][1]['options']['num_predict'], 20)
+
+    def test_shared_prefix_is_not_evaluated_again(self):
+        prefix = "Static instructions that stay identical between requests. " * 20
+        "".join(self.llm.stream_cover_letter(prefix + "Candidate one."))
+        first = self.llm.last_stats['prompt_eval_count']
+        "".join(self.llm.stream_cover_letter(prefix + "Candidate two."))
+        self.assertLess(self.llm.last_stats['prompt_eval_count'], first / 10)
+
+    def test_server_failure_raises(self):
+        self.stub.fail_next()
+        with self.assertRaises(Exception):
+            self.llm.generate_cover_letter("Write a cover letter.")
+
+    def test_variants_return_one_result_each(self):
+        variants = [{'tone': tone, 'style': 'Standard', 'prompt': f"Shared text.\n{tone}"}
+                    for tone in ("Professional", "Confident", "Enthusiastic")]
+        results = list(self.llm.generate_variants(variants, shared_prefix="Shared text.\n"))
+
+        self.assertEqual(sorted(r['tone'] for r in results), ["Confident", "Enthusiastic", "Professional"])
+        self.assertTrue(all(r['error'] is None and r['stats']['eval_count'] == 20 for r in results))
+        self.assertEqual(self.stub.requests[0][1]['options']['num_predict'], 1)  # Prefix warm-up
+
+    def test_prompt_and_output_fit_num_ctx(self):
+        self.assertEqual(PROMPT_SETTINGS['reserve_output_tokens'], APP_SETTINGS['max_tokens'])
+        self.llm.max_tokens = PROMPT_SETTINGS['reserve_output_tokens'] + 500
+        built = build_cover_letter_prompt(
+            resume_text="Built data pipelines in Python.\n" * 2000,
+            job_description={'requirements': ["Python"] * 500, 'responsibilities': [], 'skills': [], 'full_text': ""}
+        )
+
+        "".join(self.llm.stream_cover_letter(built['prompt']))
+
+        num_predict = self.stub.requests[-1][1]['options']['num_predict']
+        self.assertEqual(num_predict, PROMPT_SETTINGS['reserve_output_tokens'])
+        self.assertLessEqual(built['budget']['prompt_tokens'] + num_predict, self.llm.num_ctx)
+
+    def test_chat_and_model_info(self):
+        self.assertTrue(self.llm.generate_with_history("Hello"))
+        self.assertIn('modelfile', self.llm.get_model_info())
+
+
+class TestResponseCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = OllamaStub(tokens_per_second=5000, seed=0).start()
+        cls.saved = dict(APP_SETTINGS), dict(LLM_CACHE_SETTINGS)
+        APP_SETTINGS['ollama_host'] = cls.stub.url
+        LLM_CACHE_SETTINGS.update(enabled=False, cache_sampled=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+        APP_SETTINGS.update(cls.saved[0])
+        LLM_CACHE_SETTINGS.update(cls.saved[1])
+
+    def setUp(self):
+        self.llm = OllamaLLM()
+        self.llm.response_cache = TieredCache(max_memory_bytes=1024 * 1024)  # Private, memory only
+        self.llm.max_tokens = 5
+        self.llm.seed = None
+        self.llm.temperature = 0.7
+        self.stub.requests.clear()
+
+    def generate_twice(self, prompt="Write a cover letter for Acme."):
+        """Return the number of generate requests the stub saw for two identical calls."""
+        first = self.llm.generate_cover_letter(prompt)
+        second = self.llm.generate_cover_letter(prompt)
+        self.assertEqual(first, second)
+        return sum(1 for endpoint, _ in self.stub.requests if endpoint == 'generate')
+
+    def test_pinned_seed_is_cached(self):
+        self.llm.seed = 42
+
+        self.assertEqual(self.generate_twice(), 1)
+        self.assertTrue(self.llm.last_stats['cache_hit'])
+
+    def test_zero_temperature_is_cached(self):
+        self.llm.temperature = 0
+
+        self.assertEqual(self.generate_twice(), 1)
+
+    def test_sampled_generations_are_cached_only_when_opted_in(self):
+        self.assertEqual(self.generate_twice(), 2)
+        self.assertIsNone(self.llm._cache_key('generate', "prompt", self.llm._generation_options()))
+
+        self.stub.requests.clear()
+        with mock.patch.dict(LLM_CACHE_SETTINGS, {'cache_sampled': True}):
+            self.assertEqual(self.generate_twice(), 1)
+
+    def test_key_covers_model_endpoint_prompt_and_options(self):
+        self.llm.seed = 42
+        options = self.llm._generation_options()
+        key = self.llm._cache_key('generate', "prompt", options)
+
+        self.assertEqual(self.llm._cache_key('generate', "prompt", dict(options)), key)
+        self.assertNotEqual(self.llm._cache_key('chat', "prompt", options), key)
+        self.assertNotEqual(self.llm._cache_key('generate', "prompt!", options), key)
+        for field, value in (('temperature', 0.2), ('num_ctx', 8192), ('num_predict', 6), ('seed', 43)):
+            self.assertNotEqual(self.llm._cache_key('generate', "prompt", dict(options, **{field: value})), key, field)
+        self.llm.model_name = "other-model"
+        self.assertNotEqual(self.llm._cache_key('generate', "prompt", options), key)
+
+    def test_changed_options_miss_the_cache(self):
+        self.llm.seed = 42
+        self.llm.generate_cover_letter("Write a cover letter for Acme.")
+        self.llm.num_ctx = 2048
+
+        self.assertEqual(self.generate_twice(), 2)
+
+    def test_disabled_cache_never_keys(self):
+        self.llm.response_cache = None
+        self.llm.seed = 42
+
+        self.assertIsNone(self.llm._cache_key('generate', "prompt", self.llm._generation_options()))
+        self.assertEqual(self.generate_twice(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
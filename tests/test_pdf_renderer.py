@@ -0,0 +1,27 @@
+import io
+import unittest
+import zipfile
+from utils.pdf_renderer import render_pdf, render_pdf_cached, render_pdf_zip
+
+LETTER = "October 18, 2026\n\nDear Hiring Manager,\n\nI led R&D work on <fast> systems.\n\nSincerely,\nJane Doe"
+
+
+class TestPdfRenderer(unittest.TestCase):
+    def test_renders_pdf_with_markup_characters(self):
+        pdf = render_pdf(LETTER)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+    def test_cached_render_is_reused_for_identical_text(self):
+        first = render_pdf_cached(LETTER)
+        self.assertIs(render_pdf_cached(LETTER), first)
+        self.assertIsNot(render_pdf_cached(LETTER + " "), first)
+
+    def test_zip_contains_one_pdf_per_letter_in_order(self):
+        archive = render_pdf_zip([('a', LETTER), ('b.pdf', "Date\n\nBody\n\nSignature")], max_workers=2)
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            self.assertEqual(zf.namelist(), ['a.pdf', 'b.pdf'])
+            self.assertTrue(all(zf.read(name).startswith(b'%PDF') for name in zf.namelist()))
+
+
+if __name__ == '__main__':
+    unittest.main()
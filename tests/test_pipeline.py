@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from config import PIPELINE_SETTINGS
+from utils.deadlines import remaining
+from utils.http_client import get_session
+from utils.pipeline import IngestionPipeline
+
+
+class StubDocProcessor:
+    """Extracts b'fail' by raising, b'slow' after a second and anything else at once."""
+
+    def extract_text_from_pdf(self, data):
+        if data == b'fail':
+            raise Exception("not a PDF")
+        if data == b'slow':
+            time.sleep(1)
+        return data.decode()
+
+
+class StubPortfolioAgent:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def analyze_portfolio(self, links):
+        time.sleep(self.delay)
+        return "Portfolio: " + ", ".join(links), {'links': links}
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(2)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class StubResearchAgent:
+    """Calls a slow server through the shared session, recording how long the call held the worker."""
+
+    def __init__(self, url):
+        self.url = url
+        self.deadline_seen = None
+        self.finished = threading.Event()
+        self.elapsed = None
+
+    def get_structured_research(self, company_name):
+        self.deadline_seen = remaining()
+        start = time.perf_counter()
+        try:
+            return get_session().get(self.url).text
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.finished.set()
+
+
+class TestIngestionPipeline(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(PIPELINE_SETTINGS, {
+            'resume_deadline': 2, 'document_deadline': 0.3, 'portfolio_deadline': 0.3, 'research_deadline': 0.3
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_all_stages_succeed(self):
+        pipeline = IngestionPipeline(doc_processor=StubDocProcessor(), portfolio_agent=StubPortfolioAgent())
+
+        result = pipeline.run(b'resume', additional_docs=[b'doc one', b'doc two'], portfolio_links=[' a ', ''])
+
+        self.assertEqual(result['resume_text'], 'resume')
+        self.assertEqual(result['additional_content'], ['doc one', 'doc two'])
+        self.assertEqual(result['portfolio_info'], "Portfolio: a")
+        self.assertEqual(result['errors'], {})
+        self.assertEqual(set(result['timings']), {'resume', 'document_0', 'document_1', 'portfolio'})
+
+    def test_slow_and_failing_stages_degrade(self):
+        pipeline = IngestionPipeline(doc_processor=StubDocProcessor(), portfolio_agent=StubPortfolioAgent(delay=1))
+
+        start = time.monotonic()
+        result = pipeline.run(b'resume', additional_docs=[b'slow', b'fail', b'ok'], portfolio_links=['a'])
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.9)  # Bounded by the 0.3s stage deadlines, not the 1s stages
+        self.assertEqual(result['additional_content'], ['ok'])
+        self.assertEqual(result['errors']['document_0'], "Timed out after 0.3s")
+        self.assertIn("not a PDF", result['errors']['document_1'])
+        self.assertEqual(result['errors']['portfolio'], "Timed out after 0.3s")
+        self.assertEqual((result['portfolio_info'], result['portfolio_details']), ("", None))
+
+    def test_resume_failure_is_raised(self):
+        pipeline = IngestionPipeline(doc_processor=StubDocProcessor())
+
+        with self.assertRaisesRegex(Exception, "Error extracting resume: not a PDF"):
+            pipeline.run(b'fail', additional_docs=[b'ok'])
+
+    def test_running_stage_stops_at_its_deadline(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        research_agent = StubResearchAgent(f"http://127.0.0.1:{server.server_address[1]}/")
+        pipeline = IngestionPipeline(doc_processor=StubDocProcessor(), research_agent=research_agent)
+
+        result = pipeline.run(b'resume', company_name="Acme")
+
+        self.assertIn('research', result['errors'])
+        self.assertLessEqual(research_agent.deadline_seen, 0.3)
+        # The HTTP call gives up at the stage deadline instead of holding its io thread for 2s
+        self.assertTrue(research_agent.finished.wait(1))
+        self.assertLess(research_agent.elapsed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import time
+import unittest
+from unittest import mock
+from config import PORTFOLIO_SETTINGS
+from utils.portfolio_agent import PortfolioAgent
+from utils.telemetry import get_registry
+
+
+def fake_analysis(url):
+    """Stands in for the GitHub/Behance handlers; the last path segment picks the behaviour."""
+    name = url.rstrip('/').rsplit('/', 1)[-1]
+    if name.startswith('slow'):
+        time.sleep(float(name[len('slow'):] or 1))
+    if name == 'broken':
+        time.sleep(0.05)
+        raise Exception("HTTP 500")
+    if name == 'empty':
+        return "", []
+    return f"Projects of {name}", [{'name': name}]
+
+
+class TestPortfolioAgent(unittest.TestCase):
+    def setUp(self):
+        self.agent = PortfolioAgent()
+        self.agent._analyze_github = fake_analysis
+        self.agent._analyze_behance = fake_analysis
+        patcher = mock.patch.dict(PORTFOLIO_SETTINGS, {'url_timeout': 0.5})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_links_are_analyzed_concurrently_and_merged_in_input_order(self):
+        urls = ['https://github.com/slow0.3', 'https://www.behance.net/slow0.1', 'https://github.com/fast',
+                'https://example.com/me']
+
+        start = time.perf_counter()
+        info, details = self.agent.analyze_portfolio(urls)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.45)  # Not the 0.4s the two slow links would take in turn
+        self.assertEqual(info, "Projects of slow0.3\n\nProjects of slow0.1\n\nProjects of fast")
+        self.assertEqual(details['github_repos'], [{'name': 'slow0.3'}, {'name': 'fast'}])
+        self.assertEqual(details['behance_projects'], [{'name': 'slow0.1'}])
+        self.assertEqual(details['other_links'], ['https://example.com/me'])
+        self.assertEqual(list(details['timings']), urls[:3])
+
+    def test_timeouts_errors_and_empty_results(self):
+        histogram = get_registry().histogram(
+            'portfolio_url_duration_seconds', "Latency of each portfolio link analysis", ('kind', 'status')
+        )
+        errors_before = histogram.snapshot(kind='github_repos', status='error')['count']
+
+        info, details = self.agent.analyze_portfolio(
+            ['https://github.com/slow2', 'https://github.com/broken', 'https://www.behance.net/empty',
+             'https://github.com/fast']
+        )
+
+        timings = details['timings']
+        self.assertEqual(timings['https://github.com/slow2'], {'status': 'timeout', 'latency': 0.5})
+        self.assertEqual(timings['https://github.com/broken']['status'], 'error')
+        self.assertEqual(timings['https://github.com/broken']['error'], "HTTP 500")
+        self.assertGreaterEqual(timings['https://github.com/broken']['latency'], 0.05)
+        self.assertEqual(histogram.snapshot(kind='github_repos', status='error')['count'], errors_before + 1)
+        self.assertEqual(timings['https://www.behance.net/empty']['status'], 'empty')
+        self.assertEqual(info, "Projects of fast")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from utils.prompt_templates import build_cover_letter_prompt, build_variant_prompts
+
+RESUME = (
+    "Education B.S. Computer Science, State University "
+    "Experience Software Engineer at Example Corp building data pipelines in Python and Go. "
+    "Projects Languages: Python, Go Frameworks: Django Developer Tools: Docker"
+)
+JOB = {'full_text': "Backend Engineer. Requirements: Python, Go, SQL.", 'requirements': [], 'skills': []}
+VARIANTS = [("Professional", "Technical"), ("Confident", "Executive"), ("Enthusiastic", "Creative")]
+
+
+class TestVariantPrompts(unittest.TestCase):
+    def test_variants_share_everything_but_tone_and_style(self):
+        result = build_variant_prompts(VARIANTS, RESUME, JOB, company_name="Acme")
+        prompts = [variant['prompt'] for variant in result['variants']]
+
+        self.assertEqual([(v['tone'], v['style']) for v in result['variants']], VARIANTS)
+        self.assertIn("Software Engineer at Example Corp", result['shared_prefix'])
+        self.assertTrue(result['shared_prefix'].endswith("\n"))
+        for prompt, (tone, style) in zip(prompts, VARIANTS):
+            self.assertTrue(prompt.startswith(result['shared_prefix']))
+            self.assertIn(f"Use a {tone.lower()} tone", prompt[len(result['shared_prefix']):])
+
+    def test_single_variant_matches_single_prompt(self):
+        single = build_cover_letter_prompt(RESUME, JOB, tone="Confident", style="Executive", company_name="Acme")
+        variant = build_variant_prompts([("Confident", "Executive")], RESUME, JOB, company_name="Acme")
+        self.assertEqual(variant['variants'][0]['prompt'], single['prompt'])
+
+    def test_rejects_unknown_tone(self):
+        with self.assertRaises(ValueError):
+            build_variant_prompts([("Sarcastic", "Standard")], RESUME, JOB)
+
+
+if __name__ == '__main__':
+    unittest.main()
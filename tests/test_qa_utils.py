@@ -0,0 +1,97 @@
+import random
+import re
+import unittest
+from unittest import mock
+from config import QA_SETTINGS
+from utils.qa_utils import (
+    AI_PATTERNS, CLICHES, PhraseMatcher, QualityChecker, count_syllables, flesch_reading_ease
+)
+
+
+class TestPhraseMatcher(unittest.TestCase):
+    def test_overlapping_and_nested_phrases(self):
+        matcher = PhraseMatcher([('a', 'he'), ('a', 'she'), ('a', 'his'), ('a', 'hers'), ('b', 'she sells')])
+
+        matches = matcher.find("She sells; hers is his. he")
+
+        self.assertEqual([(phrase, start) for _, phrase, start in matches],
+                         [('she', 0), ('she sells', 0), ('hers', 11), ('his', 19), ('he', 24)])
+        self.assertEqual(matches[1][0], 'b')
+
+    def test_word_boundaries_and_normalization(self):
+        matcher = PhraseMatcher([('cliche', 'team player'), ('ai_pattern', "in today's fast-paced")])
+
+        self.assertEqual(matcher.find("a steam players' league"), [])
+        self.assertEqual(len(matcher.find("A TEAM\n   player.")), 1)
+        self.assertEqual(len(matcher.find("In today’s fast‑paced world")), 1)
+
+    def test_matches_a_naive_scan(self):
+        phrases = list(AI_PATTERNS + CLICHES)
+        matcher = PhraseMatcher([('p', phrase) for phrase in phrases])
+        rng = random.Random(0)
+        vocabulary = " ".join(phrases).split() + ["the", "role", "a", "Team-", "box."]
+        text = " ".join(rng.choice(vocabulary) for _ in range(3000))
+
+        expected = set()
+        lowered = text.lower()
+        for phrase in phrases:
+            for match in re.finditer(r'(?<![a-z0-9])' + re.escape(phrase) + r'(?![a-z0-9])', lowered):
+                expected.add((phrase, match.start()))
+        self.assertEqual({(phrase, start) for _, phrase, start in matcher.find(text)}, expected)
+        self.assertTrue(expected)
+
+
+class TestReadability(unittest.TestCase):
+    def test_syllables(self):
+        for word, syllables in [('cat', 1), ('make', 1), ('table', 2), ('engineer', 3), ('rhythm', 1)]:
+            self.assertEqual(count_syllables(word), syllables, word)
+
+    def test_flesch_reading_ease(self):
+        simple = "The cat sat on the mat. The dog ran to the park."
+        dense = ("Comprehensive organizational transformation initiatives necessitate interdisciplinary "
+                 "collaboration and sophisticated infrastructural modernization.")
+
+        self.assertGreater(flesch_reading_ease(simple), 90)
+        self.assertLess(flesch_reading_ease(dense), 0)
+        self.assertEqual(flesch_reading_ease(""), 0.0)
+
+
+class TestQualityChecker(unittest.TestCase):
+    def setUp(self):
+        self.checker = QualityChecker()
+
+    def test_findings_are_unique_and_ordered(self):
+        letter = ("Moreover, I am a team player. As a detail-oriented team player, "
+                  "I am excited to apply. Moreover, I hit the ground running.")
+
+        report = self.checker.analyze_cover_letter(letter)
+
+        self.assertEqual(report['ai_patterns_detected'], ['moreover', 'i am excited to apply'])
+        self.assertEqual(report['cliches_found'], ['team player', 'detail-oriented', 'hit the ground running'])
+        self.assertFalse(report['passed'])
+        self.assertTrue(any('words' in suggestion for suggestion in report['suggestions']))
+
+    def test_clean_letter_passes(self):
+        sentence = "I built the billing service that now handles two million payments a month for our shop. "
+        letter = sentence * 20
+        words = len(letter.split())
+        with mock.patch.dict(QA_SETTINGS, {'min_letter_length': words - 1, 'max_letter_length': words + 1,
+                                           'min_readability_score': 0, 'max_readability_score': 100}):
+            report = self.checker.analyze_cover_letter(letter)
+
+        self.assertEqual(report['word_count'], words)
+        self.assertEqual(report['suggestions'], [])
+        self.assertTrue(report['passed'])
+
+    def test_batch_matches_serial(self):
+        letters = [f"Letter {i}: I am a results-driven self-starter. In conclusion, thanks." for i in range(8)]
+        letters.append("Short and plain.")
+        serial = [self.checker.analyze_cover_letter(letter) for letter in letters]
+
+        with mock.patch.dict(QA_SETTINGS, {'parallel_batch_threshold': 4}):
+            self.assertEqual(self.checker.analyze_batch(letters, max_workers=2), serial)
+        self.assertEqual(self.checker.analyze_batch(letters, max_workers=1), serial)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from config import RESEARCH_SETTINGS
+from utils.deadlines import remaining
+from utils.research_agent import CompanyResearchAgent
+from utils.research_store import ResearchStore
+from utils.telemetry import get_registry
+
+
+class ResearchAgentTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        with mock.patch('utils.research_agent._ensure_punkt'):
+            self.agent = CompanyResearchAgent()
+        self.agent.store = ResearchStore(os.path.join(self.tmp_dir, 'research.sqlite3'))
+        self.agent.sources = {}
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def source(self, fields=None, error=None, delay=0.0, release=None):
+        """A stub research source that records each call; ``release`` holds it until the event is set."""
+        def fetch(company_name):
+            self.calls.append(company_name)
+            time.sleep(delay)
+            if release is not None:
+                release.wait(5)
+            if error is not None:
+                raise error
+            return dict(fields or {})
+        return fetch
+
+    def ttl(self, company_name):
+        entry = self.agent.store.get(company_name)
+        return round(entry['expires_at'] - entry['fetched_at'])
+
+
+class TestSourceOutcomes(ResearchAgentTestCase):
+    def test_failing_source_is_timed_and_recorded_as_error(self):
+        histogram = get_registry().histogram(
+            'research_source_duration_seconds', "Latency of each research source", ('source', 'status')
+        )
+        before = histogram.snapshot(source='broken', status='error')['count']
+        self.agent.register_source('company_info', self.source({'overview': "Acme makes anvils."}))
+        self.agent.register_source('broken', self.source(error=TimeoutError("read timed out"), delay=0.02))
+
+        research = self.agent.research_company("Acme")
+
+        stats = research['sources']['broken']
+        self.assertEqual(stats['status'], 'error')
+        self.assertIn("read timed out", stats['error'])
+        self.assertGreaterEqual(stats['latency'], 0.02)
+        self.assertEqual(histogram.snapshot(source='broken', status='error')['count'], before + 1)
+        self.assertEqual(research['overview'], "Acme makes anvils.")
+        self.assertEqual(self.ttl("Acme"), RESEARCH_SETTINGS['partial_cache_expiration'])
+
+    def test_sources_run_under_the_research_deadline(self):
+        seen = []
+        self.agent.register_source('company_info', lambda company_name: seen.append(remaining()) or {})
+
+        with mock.patch.dict(RESEARCH_SETTINGS, {'research_deadline': 0.5}):
+            self.agent.research_company("Acme")
+
+        self.assertEqual(len(seen), 1)
+        self.assertIsNotNone(seen[0])
+        self.assertLessEqual(seen[0], 0.5)
+
+    def test_configured_sources_decide_completeness(self):
+        with mock.patch.dict(RESEARCH_SETTINGS, {'news_api_key': ''}), \
+                mock.patch('utils.research_agent._ensure_punkt'):
+            self.assertNotIn('news', CompanyResearchAgent().sources)
+        self.agent.register_source('company_info', self.source({'overview': "Acme makes anvils."}))
+        self.agent.register_source('news', self.source({'recent_news': []}))
+
+        self.agent.research_company("Acme")
+
+        # An empty answer is still an answer, so the entry gets the full TTL
+        self.assertEqual(self.ttl("Acme"), RESEARCH_SETTINGS['cache_expiration'])
+
+    def test_empty_results_are_negative_cached(self):
+        self.agent.register_source('company_info', self.source({'overview': ''}))
+
+        first = self.agent.research_company("Nobody Ltd")
+        second = self.agent.research_company("Nobody Ltd")
+
+        self.assertEqual(self.calls, ["Nobody Ltd"])
+        self.assertEqual(first['sources']['company_info']['status'], 'empty')
+        self.assertTrue(first['overview'])  # Fallback data
+        self.assertEqual(second, first)
+        self.assertEqual(self.ttl("Nobody Ltd"), RESEARCH_SETTINGS['empty_cache_expiration'])
+
+    def test_failed_sources_are_not_negative_cached(self):
+        self.agent.register_source('company_info', self.source(error=ConnectionError("connection refused")))
+
+        research = self.agent.research_company("Acme")
+
+        self.assertEqual(research['sources']['company_info']['status'], 'error')
+        self.assertTrue(research['overview'])  # Fallback data
+        self.assertIsNone(self.agent.store.get("Acme"))
+
+
+class TestStaleWhileRevalidate(ResearchAgentTestCase):
+    def put_entry(self, company_name, age):
+        """Cache research fetched ``age`` seconds ago with the normal TTL."""
+        self.agent.store.put(company_name, {'company_name': company_name, 'overview': "Old overview."},
+                             RESEARCH_SETTINGS['cache_expiration'], fetched_at=time.time() - age)
+
+    def test_fresh_entry_is_served_without_fetching(self):
+        self.agent.register_source('company_info', self.source({'overview': "New overview."}))
+        self.put_entry("Acme", 60)
+
+        self.assertEqual(self.agent.research_company("Acme")['overview'], "Old overview.")
+        self.assertEqual(self.calls, [])
+
+    def test_concurrent_misses_share_one_fetch(self):
+        release = threading.Event()
+        self.agent.register_source('company_info', self.source({'overview': "New overview."}, release=release))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.agent.research_company("Acme Inc")))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)  # Let every caller reach the in-flight fetch
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual([research['overview'] for research in results], ["New overview."] * 5)
+
+    def test_stale_entry_is_returned_while_one_refresh_runs(self):
+        release = threading.Event()
+        self.agent.register_source('company_info', self.source({'overview': "New overview."}, release=release))
+        self.put_entry("Acme", RESEARCH_SETTINGS['cache_expiration'] + 60)
+
+        start = time.perf_counter()
+        first = self.agent.research_company("Acme")
+        second = self.agent.research_company("ACME")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual((first['overview'], second['overview']), ("Old overview.", "Old overview."))
+        self.assertLess(elapsed, 1)
+        refresh = self.agent._submit_fetch("Acme")  # Still in flight, so this joins the running refresh
+        release.set()
+        refresh.result(5)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.agent.store.get("Acme")['content']['overview'], "New overview.")
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        self.agent.register_source('company_info', self.source(error=ConnectionError("connection refused")))
+        self.put_entry("Acme", RESEARCH_SETTINGS['cache_expiration'] + 60)
+
+        first = self.agent.research_company("Acme")
+        self.agent._submit_fetch("Acme").result(5)
+        second = self.agent.research_company("Acme")
+
+        self.assertEqual((first['overview'], second['overview']), ("Old overview.", "Old overview."))
+        entry = self.agent.store.get("Acme")['content']
+        self.assertEqual((entry['overview'], entry.get('error')), ("Old overview.", None))
+
+    def test_entry_older_than_max_stale_age_is_fetched_synchronously(self):
+        self.agent.register_source('company_info', self.source({'overview': "New overview."}, delay=0.05))
+        self.put_entry("Acme", RESEARCH_SETTINGS['max_stale_age'] + 60)
+
+        research = self.agent.research_company("Acme")
+
+        self.assertEqual(research['overview'], "New overview.")
+        self.assertEqual(self.calls, ["Acme"])
+
+
+if __name__ == '__main__':
+    unittest.main()
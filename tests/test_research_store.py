@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+import unittest
+from utils.research_store import ResearchStore, normalize_company_key
+
+
+class TestResearchStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ResearchStore(os.path.join(self.tmp_dir.name, 'research.sqlite3'), max_entries=100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_company_keys_are_normalized(self):
+        self.assertEqual(normalize_company_key("Acme, Inc."), "acme")
+        self.assertEqual(normalize_company_key("  ACME   Corp "), "acme")
+        self.assertEqual(normalize_company_key("Procter & Gamble Co."), "procter and gamble")
+        self.assertEqual(normalize_company_key("Company"), "company")
+
+    def test_put_and_get_round_trip(self):
+        self.store.put("Acme Inc", {'overview': 'Rockets'}, ttl=60)
+        entry = self.store.get("acme")
+
+        self.assertEqual(entry['content'], {'overview': 'Rockets'})
+        self.assertAlmostEqual(entry['expires_at'] - entry['fetched_at'], 60)
+
+    def test_older_fetch_does_not_overwrite_newer(self):
+        self.store.put("Acme", {'overview': 'new'}, ttl=60, fetched_at=2000)
+        self.store.put("Acme", {'overview': 'old'}, ttl=60, fetched_at=1000)
+
+        self.assertEqual(self.store.get("Acme")['content'], {'overview': 'new'})
+
+    def test_size_cap_evicts_oldest_fetches(self):
+        store = ResearchStore(self.store.db_path, max_entries=3, size_check_interval=1)
+        for i in range(5):
+            store.put(f"Company {i}", {'i': i}, ttl=60, fetched_at=1000 + i)
+
+        self.assertEqual(store.count(), 3)
+        self.assertIsNone(store.get("Company 0"))
+        self.assertIsNotNone(store.get("Company 4"))
+
+    def test_size_cap_is_checked_every_few_writes(self):
+        store = ResearchStore(self.store.db_path, max_entries=3, size_check_interval=4)
+        for i in range(7):
+            store.put(f"Company {i}", {'i': i}, ttl=60, fetched_at=1000 + i)
+
+        self.assertEqual(store.count(), 6)  # Trimmed to 3 at the 4th write, then 3 more since
+        store.put("Company 7", {'i': 7}, ttl=60, fetched_at=1007)
+        self.assertEqual(store.count(), 3)
+        self.assertIsNotNone(store.get("Company 7"))
+
+    def test_purge_expired(self):
+        self.store.put("Fresh", {}, ttl=3600)
+        self.store.put("Stale", {}, ttl=1, fetched_at=0)
+
+        self.assertEqual(self.store.purge_expired(), 1)
+        self.assertIsNone(self.store.get("Stale"))
+
+    def test_export_import_round_trip(self):
+        self.store.put("Acme", {'overview': 'Rockets'}, ttl=60)
+        export_path = os.path.join(self.tmp_dir.name, 'export.jsonl')
+        self.assertEqual(self.store.export_jsonl(export_path), 1)
+
+        other = ResearchStore(os.path.join(self.tmp_dir.name, 'other.sqlite3'))
+        self.assertEqual(other.import_jsonl(export_path), 1)
+        self.assertEqual(other.get("ACME, Inc.")['content'], {'overview': 'Rockets'})
+
+    def test_concurrent_writers(self):
+        errors = []
+
+        def write(worker):
+            try:
+                for i in range(20):
+                    self.store.put(f"Company {i}", {'worker': worker}, ttl=60)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.store.count(), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
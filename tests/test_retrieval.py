@@ -0,0 +1,32 @@
+import unittest
+from utils.retrieval import BM25Index, select_relevant_chunks, tokenize
+
+
+class TestRetrieval(unittest.TestCase):
+    def test_tokenize_drops_stopwords_and_keeps_language_names(self):
+        self.assertEqual(tokenize("Experience with C++ and the C# runtime"), ['experience', 'c++', 'c#', 'runtime'])
+
+    def test_bm25_ranks_matching_chunks_first(self):
+        index = BM25Index([
+            "Painting and hiking on weekends",
+            "Deployed Kubernetes clusters on AWS with Terraform",
+            "Kubernetes certification",
+        ])
+        ranked = index.top_k("kubernetes terraform aws", 3)
+
+        self.assertEqual(ranked[0][0], 1)
+        self.assertNotIn(0, [i for i, _ in ranked])
+
+    def test_select_relevant_chunks_keeps_document_order(self):
+        job_description = {'requirements': ["Python and SQL"], 'skills': ["Airflow"], 'full_text': ""}
+        chunks = select_relevant_chunks(
+            ["Built Airflow pipelines.", "Enjoys chess.", "Wrote Python and SQL reports."],
+            job_description,
+            k=2
+        )
+
+        self.assertEqual(chunks, ["Built Airflow pipelines.", "Wrote Python and SQL reports."])
+
+
+if __name__ == '__main__':
+    unittest.main()
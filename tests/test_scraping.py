@@ -0,0 +1,38 @@
+import unittest
+from utils.scraping import extract_texts, response_encoding
+
+
+class TestExtractTexts(unittest.TestCase):
+    def test_matches_class_token_and_unescapes_text(self):
+        html = b'<div class="a Project-title b">Caf&eacute; <b>Brand</b></div><div class="Project-titles">x</div>'
+        self.assertEqual(extract_texts(html, 'div', 'Project-title'), ['Café Brand'])
+
+    def test_nested_matches_are_returned_in_document_order(self):
+        html = b'<div class="t">outer <div class="t">inner</div><div>plain</div> tail</div><div class="t">last</div>'
+        self.assertEqual(extract_texts(html, 'div', 't'), ['outer innerplain tail', 'inner', 'last'])
+
+    def test_stops_after_limit_of_accepted_items(self):
+        chunks_read = []
+
+        def stream():
+            for chunk in [b'<div class="t">short</div>', b'<div class="t">long enough</div>', b'<div class="t">more</div>']:
+                chunks_read.append(chunk)
+                yield chunk
+
+        texts = extract_texts(stream(), 'div', 't', limit=1, accept=lambda text: len(text) > 5)
+        self.assertEqual(texts, ['long enough'])
+        self.assertEqual(len(chunks_read), 2)
+
+    def test_multibyte_characters_split_across_chunks(self):
+        encoded = '<div class="t">Résumé</div>'.encode('utf-8')
+        split = encoded.index(b'\xc3') + 1
+        self.assertEqual(extract_texts([encoded[:split], encoded[split:]], 'div', 't'), ['Résumé'])
+
+    def test_response_encoding_from_content_type(self):
+        self.assertEqual(response_encoding('text/html; charset=ISO-8859-1'), 'iso8859-1')
+        self.assertEqual(response_encoding('text/html'), 'utf-8')
+        self.assertEqual(response_encoding('text/html; charset=bogus'), 'utf-8')
+
+
+if __name__ == '__main__':
+    unittest.main()
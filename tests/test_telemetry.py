@@ -0,0 +1,119 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config import APP_SETTINGS, LLM_CACHE_SETTINGS
+from utils.llm_utils import OllamaLLM
+from utils.ollama_stub import OllamaStub
+from utils.telemetry import (
+    CONTENT_TYPE, MetricsRegistry, copy_context, get_registry, request_trace, span, start_metrics_server
+)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.counter('jobs_total', "Jobs handled", ('status',)).inc(2, status='ok')
+        histogram = registry.histogram('job_seconds', "Job latency", ('stage',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage='extract')
+        histogram.observe(0.5, stage='extract')
+        registry.gauge('queue_depth', 'Queued "jobs"').set(3)
+
+        text = registry.render()
+
+        self.assertIn('# TYPE jobs_total counter\njobs_total{status="ok"} 2.0\n', text)
+        self.assertIn('job_seconds_bucket{stage="extract",le="0.1"} 1\n', text)
+        self.assertIn('job_seconds_bucket{stage="extract",le="1.0"} 2\n', text)
+        self.assertIn('job_seconds_bucket{stage="extract",le="+Inf"} 2\n', text)
+        self.assertIn('job_seconds_count{stage="extract"} 2\n', text)
+        self.assertIn('# HELP queue_depth Queued \\"jobs\\"\n', text)
+        with self.assertRaises(ValueError):
+            registry.counter('jobs_total', "Jobs handled").inc(1)  # Missing label
+        with self.assertRaises(ValueError):
+            registry.gauge('jobs_total', "Jobs handled")  # Registered as a counter
+
+    def test_metrics_server(self):
+        get_registry().counter('telemetry_test_scrapes_total', "Test counter").inc()
+        server = start_metrics_server(port=0)
+        host, port = server.server_address[:2]
+
+        response = requests.get(f"http://{host}:{port}/metrics", timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+        self.assertIn('telemetry_test_scrapes_total 1.0', response.text)
+        self.assertEqual(requests.get(f"http://{host}:{port}/other", timeout=5).status_code, 404)
+
+
+class TestSpans(unittest.TestCase):
+    def test_spans_join_trace_and_histogram(self):
+        histogram = get_registry().histogram(
+            'cover_letter_stage_duration_seconds', "Time spent in each generation stage", ('stage', 'status')
+        )
+        errors_before = histogram.snapshot(stage='telemetry_test', status='error')['count']
+
+        with request_trace('telemetry_request') as trace:
+            with span('telemetry_test', size=1) as attributes:
+                attributes['cache_hit'] = True
+            with self.assertRaises(RuntimeError):
+                with span('telemetry_test'):
+                    raise RuntimeError("boom")
+            # Pool threads join the trace when they run in a copy of the context
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                for future in [pool.submit(copy_context().run, self._work) for _ in range(2)]:
+                    future.result()
+
+        self.assertEqual([s['name'] for s in trace.spans],
+                         ['telemetry_test', 'telemetry_test', 'telemetry_worker', 'telemetry_worker'])
+        self.assertEqual(trace.spans[0]['attributes'], {'size': 1, 'cache_hit': True})
+        self.assertEqual(trace.spans[1]['status'], 'error')
+        self.assertEqual(set(trace.stage_durations()), {'telemetry_test', 'telemetry_worker'})
+        self.assertEqual(histogram.snapshot(stage='telemetry_test', status='error')['count'], errors_before + 1)
+        self.assertGreater(histogram.snapshot(stage='telemetry_request', status='ok')['count'], 0)
+
+    @staticmethod
+    def _work():
+        with span('telemetry_worker'):
+            pass
+
+
+class TestGenerationMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = OllamaStub(tokens_per_second=2000, load_latency=0.01, seed=0).start()
+        cls.saved = dict(APP_SETTINGS), dict(LLM_CACHE_SETTINGS)
+        APP_SETTINGS['ollama_host'] = cls.stub.url
+        LLM_CACHE_SETTINGS['enabled'] = False
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+        APP_SETTINGS.update(cls.saved[0])
+        LLM_CACHE_SETTINGS.update(cls.saved[1])
+
+    def test_ollama_fields_are_recorded(self):
+        llm = OllamaLLM()
+        llm.max_tokens = 10
+        registry = get_registry()
+        model = llm.model_name
+        eval_tokens = registry.counter('ollama_eval_tokens_total', "Tokens generated", ('model',))
+        before = eval_tokens.value(model=model)
+
+        with request_trace() as trace:
+            llm.generate_cover_letter("Write a cover letter for Acme.")
+
+        stats = llm.last_stats
+        self.assertEqual(eval_tokens.value(model=model), before + 10)
+        self.assertGreaterEqual(stats['load_duration'], 0.01)
+        self.assertGreater(stats['eval_duration'], 0)
+        generate = [s for s in trace.spans if s['name'] == 'generate']
+        self.assertEqual(len(generate), 1)
+        self.assertEqual(generate[0]['attributes']['eval_count'], 10)
+        self.assertEqual(generate[0]['attributes']['prompt_eval_count'], stats['prompt_eval_count'])
+        text = registry.render()
+        for name in ('ollama_prompt_eval_tokens_total', 'ollama_load_duration_seconds_count',
+                     'ollama_eval_duration_seconds_count', 'ollama_time_to_first_token_seconds_count'):
+            self.assertIn(f'{name}{{model="{model}"}}', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
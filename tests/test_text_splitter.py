@@ -0,0 +1,32 @@
+import unittest
+from utils.text_splitter import RecursiveTextSplitter
+
+
+class TestRecursiveTextSplitter(unittest.TestCase):
+    def test_prefers_paragraph_breaks(self):
+        text = "First paragraph about Python.\n\nSecond paragraph about Go and Rust.\n\nThird one."
+        self.assertEqual(
+            RecursiveTextSplitter(chunk_size=40, chunk_overlap=10).split_text(text),
+            ['First paragraph about Python.', 'Second paragraph about Go and Rust.', 'Third one.']
+        )
+
+    def test_word_chunks_carry_overlap(self):
+        text = "one two three four five six seven eight nine ten"
+        self.assertEqual(
+            RecursiveTextSplitter(chunk_size=15, chunk_overlap=6).split_text(text),
+            ['one two three', 'three four', 'four five six', 'six seven', 'seven eight', 'eight nine ten']
+        )
+
+    def test_chunks_respect_size_and_empty_input(self):
+        splitter = RecursiveTextSplitter(chunk_size=50, chunk_overlap=10)
+        chunks = splitter.split_text("lorem ipsum dolor " * 40 + "x" * 120)
+        self.assertTrue(all(len(chunk) <= 50 for chunk in chunks))
+        self.assertEqual(splitter.split_text("   \n\n "), [])
+
+    def test_rejects_overlap_larger_than_chunk(self):
+        with self.assertRaises(ValueError):
+            RecursiveTextSplitter(chunk_size=10, chunk_overlap=20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from utils.token_budget import TokenBudget, estimate_tokens
+
+
+class TestTokenBudget(unittest.TestCase):
+    def test_sections_that_fit_are_untouched(self):
+        budget = TokenBudget(num_ctx=4096, reserve_tokens=1024)
+        fitted, report = budget.fit([
+            {'name': 'experience', 'text': "Led a team of five.\n\nShipped CI/CD.", 'priority': 1},
+            {'name': 'portfolio', 'text': "- repo: tool", 'priority': 2},
+        ])
+
+        self.assertEqual(fitted['experience'], "Led a team of five.\n\nShipped CI/CD.")
+        self.assertFalse(any(r['trimmed'] for r in report['sections'].values()))
+
+    def test_overflow_is_trimmed_to_the_available_budget(self):
+        budget = TokenBudget(num_ctx=600, reserve_tokens=100)
+        sections = [
+            {'name': 'experience', 'text': "Built data pipelines in Python. " * 200, 'priority': 1, 'min_tokens': 32},
+            {'name': 'job_details', 'text': "Python and SQL required. " * 200, 'priority': 2, 'min_tokens': 32},
+            {'name': 'portfolio', 'text': "\n".join(f"- repo{i}: description" for i in range(200)), 'priority': 3,
+             'min_tokens': 32},
+        ]
+        fixed_text = "Instructions. " * 20
+        fitted, report = budget.fit(sections, fixed_text=fixed_text)
+
+        self.assertLessEqual(report['prompt_tokens'], 500)
+        self.assertTrue(all(r['trimmed'] for r in report['sections'].values()))
+        self.assertTrue(all(fitted[name] for name in fitted))
+        # Line-oriented sections are cut on whole lines
+        self.assertTrue(fitted['portfolio'].endswith("description"))
+
+    def test_higher_priority_sections_keep_more(self):
+        budget = TokenBudget(num_ctx=400, reserve_tokens=0)
+        fitted, report = budget.fit([
+            {'name': 'low', 'text': "word " * 1000, 'priority': 2},
+            {'name': 'high', 'text': "word " * 1000, 'priority': 1},
+        ])
+
+        self.assertGreaterEqual(
+            report['sections']['high']['final_tokens'],
+            report['sections']['low']['final_tokens']
+        )
+        self.assertLessEqual(estimate_tokens(fitted['high']) + estimate_tokens(fitted['low']), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
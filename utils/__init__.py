@@ -2,4 +2,4 @@ from .document_processor import DocumentProcessor
 from .llm_utils import OllamaLLM
 from .portfolio_agent import PortfolioAgent
 from .research_agent import CompanyResearchAgent
-from .prompt_templates import get_cover_letter_prompt
\ No newline at end of file
+from .prompt_templates import get_cover_letter_prompt, build_cover_letter_prompt, build_variant_prompts
\ No newline at end of file
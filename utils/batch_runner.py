@@ -0,0 +1,223 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+from config import BATCH_SETTINGS
+from .cache import make_key
+from .document_processor import DocumentProcessor
+from .llm_utils import OllamaLLM
+from .pdf_renderer import render_pdf_zip
+from .prompt_templates import get_cover_letter_prompt
+from .qa_utils import get_quality_checker
+from .telemetry import request_trace, span
+
+logger = logging.getLogger(__name__)
+
+_SAFE_ID_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9_.-]{0,63}')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def letter_filename(row_id: str) -> str:
+    """File name stem for a row's outputs; ids that aren't safe file names are replaced by their hash."""
+    row_id = str(row_id)
+    return row_id if _SAFE_ID_PATTERN.fullmatch(row_id) else make_key(row_id)[:16]
+
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """Read manifest rows, giving every row a stable id for checkpointing."""
+    rows = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if not row.get('job_description') or not row.get('company_name'):
+                raise Exception(f"Manifest line {line_number} needs job_description and company_name")
+            row.setdefault('tone', 'Professional')
+            row.setdefault('style', 'Standard')
+            row.setdefault('id', make_key(json.dumps(row, sort_keys=True))[:16])
+            rows.append(row)
+    return rows
+
+
+class BatchRunner:
+    """Generates one cover letter per manifest row from a single parsed resume."""
+
+    def __init__(self, doc_processor: DocumentProcessor = None, llm: OllamaLLM = None,
+                 research_agent=None, portfolio_agent=None, max_workers: int = None):
+        self.doc_processor = doc_processor or DocumentProcessor()
+        self.llm = llm or OllamaLLM()
+        self.research_agent = research_agent
+        self.portfolio_agent = portfolio_agent
+        self.max_workers = max_workers or BATCH_SETTINGS['max_workers']
+        self.quality_checker = get_quality_checker()
+        self._write_lock = threading.Lock()
+
+    def run(self, manifest_path: str, resume_path: str, output_dir: str,
+            portfolio_links: Optional[Iterable[str]] = None) -> Dict:
+        """Generate letters for every unfinished row and return throughput/latency stats."""
+        os.makedirs(output_dir, exist_ok=True)
+        results_path = os.path.join(output_dir, BATCH_SETTINGS['results_file'])
+
+        rows = load_manifest(manifest_path)
+        finished = self._load_finished_ids(results_path)
+        pending = [row for row in rows if row['id'] not in finished]
+        logger.info("%d rows, %d already done, %d to generate", len(rows), len(finished), len(pending))
+
+        resume_text = self.doc_processor.extract_text_from_pdf(resume_path)
+        portfolio_info = ""
+        if portfolio_links and self.portfolio_agent is not None:
+            portfolio_info, _ = self.portfolio_agent.analyze_portfolio(list(portfolio_links))
+
+        latencies = []
+        failures = {}
+        flagged = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='batch') as pool:
+            futures = {
+                pool.submit(self._generate_row, row, resume_text, portfolio_info): row
+                for row in pending
+            }
+            for future in as_completed(futures):
+                row = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # Failed rows are not checkpointed, so the next run retries them
+                    failures[row['id']] = str(e)
+                    logger.warning("Row %s failed: %s", row['id'], e)
+                    continue
+                self._checkpoint(results_path, output_dir, record)
+                latencies.append(record['latency'])
+                if not record['quality']['passed']:
+                    flagged += 1
+                logger.info("Finished %s (%.1fs)", row['id'], record['latency'])
+        elapsed = time.perf_counter() - start
+
+        summary = {
+            'total_rows': len(rows),
+            'skipped': len(finished),
+            'generated': len(latencies),
+            'failed': len(failures),
+            'failures': failures,
+            'qa_flagged': flagged,
+            'elapsed_seconds': elapsed,
+            'letters_per_minute': len(latencies) / elapsed * 60 if elapsed > 0 else 0.0,
+            'p50_latency': percentile(latencies, 50),
+            'p95_latency': percentile(latencies, 95),
+        }
+        return summary
+
+    def _load_letters(self, output_dir: str) -> Dict[str, str]:
+        """Checkpointed letters by row id; empty before the first row has finished."""
+        letters = {}
+        results_path = os.path.join(output_dir, BATCH_SETTINGS['results_file'])
+        if not os.path.exists(results_path):
+            return letters
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    letters[record['id']] = record['cover_letter']
+                except (ValueError, KeyError):
+                    continue
+        return letters
+
+    def score_letters(self, output_dir: str) -> str:
+        """Re-run the quality checks over every checkpointed letter and write them to one JSON report."""
+        letters = self._load_letters(output_dir)
+        reports = self.quality_checker.analyze_batch(list(letters.values()))
+        report_path = os.path.join(output_dir, BATCH_SETTINGS['qa_report'])
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(zip(letters, reports)), f, indent=2)
+        logger.info("Scored %d letters (%d flagged) into %s", len(letters),
+                    sum(1 for report in reports if not report['passed']), report_path)
+        return report_path
+
+    def export_pdfs(self, output_dir: str) -> str:
+        """Render every checkpointed letter to PDF in parallel and write them to one ZIP archive."""
+        letters = self._load_letters(output_dir)
+        zip_path = os.path.join(output_dir, BATCH_SETTINGS['pdf_archive'])
+        with open(zip_path, 'wb') as f:
+            f.write(render_pdf_zip((letter_filename(row_id), letter) for row_id, letter in letters.items()))
+        logger.info("Wrote %d PDFs to %s", len(letters), zip_path)
+        return zip_path
+
+    def _generate_row(self, row: Dict, resume_text: str, portfolio_info: str) -> Dict:
+        start = time.perf_counter()
+        with request_trace('batch_row'):
+            company_research = ""
+            if row.get('include_research') and self.research_agent is not None:
+                company_research = self.research_agent.get_structured_research(row['company_name'])
+
+            prompt = get_cover_letter_prompt(
+                resume_text=resume_text,
+                job_description=self.doc_processor.process_job_description(row['job_description']),
+                portfolio_info=portfolio_info,
+                company_research=company_research,
+                tone=row['tone'],
+                style=row['style'],
+                company_name=row['company_name']
+            )
+            cover_letter = self.llm.generate_cover_letter(prompt)
+            with span('qa'):
+                quality = self.quality_checker.analyze_cover_letter(cover_letter)
+
+        return {
+            'id': row['id'],
+            'company_name': row['company_name'],
+            'tone': row['tone'],
+            'style': row['style'],
+            'cover_letter': cover_letter,
+            'quality': quality,
+            'latency': time.perf_counter() - start
+        }
+
+    def _load_finished_ids(self, results_path: str) -> set:
+        finished = set()
+        if not os.path.exists(results_path):
+            return finished
+        self._truncate_partial_line(results_path)
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    finished.add(json.loads(line)['id'])
+                except (ValueError, KeyError):
+                    continue  # Skip lines that aren't valid records
+        return finished
+
+    @staticmethod
+    def _truncate_partial_line(results_path: str):
+        """Drop a last line cut off by an interrupted run, so the next append starts on a fresh line."""
+        with open(results_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+
+    def _checkpoint(self, results_path: str, output_dir: str, record: Dict):
+        with open(os.path.join(output_dir, f"{letter_filename(record['id'])}.txt"), 'w', encoding='utf-8') as f:
+            f.write(record['cover_letter'])
+        with self._write_lock:
+            with open(results_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
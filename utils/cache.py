@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+def make_key(*parts) -> str:
+    """Hash str/bytes parts into a stable hex cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class TieredCache:
+    """String cache with an in-memory LRU tier and an optional on-disk tier.
+
+    Both tiers are bounded by size; the least recently used entries are evicted first.
+    When ``ttl`` is set, entries older than ``ttl`` seconds are treated as misses.
+    """
+
+    def __init__(self, max_memory_bytes: int, disk_dir: Optional[str] = None, max_disk_bytes: int = 0,
+                 ttl: Optional[float] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                value, created_at = self._memory[key]
+                if not self._expired(created_at):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+                self._memory_bytes -= len(value)
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        value, created_at = entry
+        self._set_memory(key, value, created_at)
+        return value
+
+    def set(self, key: str, value: str, disk: bool = True):
+        created_at = time.time()
+        self._set_memory(key, value, created_at)
+        if disk and self.disk_dir:
+            self._write_disk(key, value, created_at)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def _set_memory(self, key: str, value: str, created_at: float):
+        size = len(value)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key)[0])
+            self._memory[key] = (value, created_at)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (evicted, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if self._expired(entry['created_at']):
+                os.remove(path)
+                return None
+            os.utime(path)  # Mark as recently used for eviction
+            return entry['value'], entry['created_at']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, value: str, created_at: float):
+        try:
+            # Write to a temp file and rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': created_at, 'value': value}, f)
+            os.replace(tmp_path, self._disk_path(key))
+            self._evict_disk()
+        except OSError:
+            pass
+
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
@@ -0,0 +1,35 @@
+"""Deadlines carried in a context variable.
+
+Work that has to finish by a deadline runs inside ``deadline(seconds)``. Blocking
+calls made on its behalf read ``remaining()``. These calls are HTTP requests
+through the shared session and waits on the PDF process pool. A stage that runs
+out of time then fails fast and gives its worker thread back, instead of running
+on after its caller has given up. Deadlines nest (the earliest wins) and follow
+the context into pools that submit through ``copy_context().run``.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+_deadline = contextvars.ContextVar('deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound the enclosed work to ``seconds`` from now (or an enclosing deadline, if earlier)."""
+    due = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(due if current is None else min(current, due))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (0.0 once it has passed), or None without one."""
+    due = _deadline.get()
+    if due is None:
+        return None
+    return max(0.0, due - time.monotonic())
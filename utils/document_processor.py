@@ -1,38 +1,223 @@
-from pdfminer.high_level import extract_text as pdfminer_extract_text
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+import math
 import re
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import threading
+from config import DOC_SETTINGS, EXTRACTION_CACHE_SETTINGS
+from .cache import TieredCache, make_key
+from .deadlines import remaining
+from .telemetry import span
+from .text_splitter import RecursiveTextSplitter
+
+# Bump when extraction or cleaning output changes so stale cache entries are ignored
+EXTRACTOR_REVISION = 1
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[TieredCache]:
+    """Return the process-wide extraction cache, or None when caching is disabled."""
+    global _extraction_cache
+    if not EXTRACTION_CACHE_SETTINGS['enabled']:
+        return None
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = TieredCache(
+                max_memory_bytes=EXTRACTION_CACHE_SETTINGS['max_memory_bytes'],
+                disk_dir=EXTRACTION_CACHE_SETTINGS['disk_dir'] if EXTRACTION_CACHE_SETTINGS['disk_enabled'] else None,
+                max_disk_bytes=EXTRACTION_CACHE_SETTINGS['max_disk_bytes']
+            )
+        return _extraction_cache
+
+
+@lru_cache(maxsize=1)
+def extractor_version() -> str:
+    """Extractor revision plus the pdfminer version; pdfminer is imported on first use."""
+    import pdfminer
+    return f"{EXTRACTOR_REVISION}-pdfminer-{pdfminer.__version__}"
+
+
+def extraction_key(data: bytes) -> str:
+    """Cache key for a PDF: hash of its bytes plus the extractor version."""
+    return make_key(data, extractor_version())
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Shared process pool for CPU-bound PDF parsing."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=DOC_SETTINGS['pdf_workers'])
+        return _process_pool
+
+
+def _extract_pages(data: bytes, page_numbers: Optional[List[int]] = None) -> str:
+    """Process-pool worker: extract raw text from the given pages (all pages if None)."""
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+    return pdfminer_extract_text(BytesIO(data), page_numbers=page_numbers)
+
+
+def _read_source(source: Union[str, bytes, BinaryIO]) -> bytes:
+    """Load PDF bytes from a path, raw bytes or a file-like object (e.g. a Streamlit upload)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    return source.read()
+
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,;:-]')
+
+_HEADER_WORDS = (
+    r"technical\s+requirements?|requirements?|qualifications?|what\s+you(?:'|\u2019)?ll\s+need"
+    r"|responsibilit(?:y|ies)|duties|what\s+you(?:'|\u2019)?ll\s+do"
+    r"|skills?|proficienc(?:y|ies)"
+)
+_HEADER_QUALIFIERS = r"(?:(?:key|core|required|preferred|minimum|basic|desired|additional)\s+)?"
+# A header is either a line of its own ("Requirements", "## Key Responsibilities:") or an
+# inline label followed by a colon ("Skills: Python, SQL"). Other labels ("Benefits:") at
+# the start of a line or a sentence are found too, so they end the previous section.
+_LINE_HEADER_PATTERN = re.compile(
+    rf"[ \t]*[#*\u2022\-]*[ \t]*{_HEADER_QUALIFIERS}(?P<header>{_HEADER_WORDS})[ \t]*:?[ \t]*\**[ \t]*",
+    re.IGNORECASE
+)
+_INLINE_HEADER_PATTERN = re.compile(rf"(?<!\w){_HEADER_QUALIFIERS}(?P<header>{_HEADER_WORDS})[ \t]*\Z", re.IGNORECASE)
+_LINE_LABEL_PATTERN = re.compile(r"[ \t]*[#*]*[ \t]*[A-Za-z][^:]{0,40}")
+_SENTENCE_LABEL_PATTERN = re.compile(r"[.!?;][ \t](?P<label>[A-Z][A-Za-z ]{0,30})\Z")
+_MAX_HEADER_LINE = 80
+_INLINE_WINDOW = 48
+_PARAGRAPH_END_PATTERN = re.compile(r'\n[ \t]*\n(?![ \t]*(?:[-*\u2022\u00b7]|\d+[.)]))')
+_BULLET_PATTERN = re.compile(r'^\s*(?:[-*\u2022\u00b7]|\d+[.)])\s*')
+_INLINE_BULLET_PATTERN = re.compile(r'\s+[-\u2022\u00b7]\s+|^\s*[-\u2022\u00b7]\s+')
+_SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.;])\s+')
+
+
+def _find_headers(text: str) -> List[Tuple[int, int, Optional[str]]]:
+    """Locate section headers as (start, end, category); category is None for other labels.
+
+    Instead of scanning every character with one large alternation, only each line
+    and the few characters before each colon are tested against the patterns above.
+    """
+    headers = []
+    line_start = 0
+    for line in text.split('\n'):
+        line_end = line_start + len(line)
+        if len(line) <= _MAX_HEADER_LINE:
+            match = _LINE_HEADER_PATTERN.fullmatch(line)
+            if match:
+                headers.append((line_start, line_end, _header_category(match.group('header'))))
+                line_start = line_end + 1
+                continue
+
+        colon = line.find(':')
+        while colon != -1:
+            window_start = max(0, colon - _INLINE_WINDOW)
+            window = line[window_start:colon]
+            match = _INLINE_HEADER_PATTERN.search(window)
+            if match:
+                headers.append((line_start + window_start + match.start(), line_start + colon + 1,
+                                _header_category(match.group('header'))))
+            elif colon <= _INLINE_WINDOW and _LINE_LABEL_PATTERN.fullmatch(window):
+                headers.append((line_start, line_start + colon + 1, None))
+            else:
+                match = _SENTENCE_LABEL_PATTERN.search(window)
+                if match:
+                    headers.append((line_start + window_start + match.start('label'), line_start + colon + 1, None))
+            colon = line.find(':', colon + 1)
+
+        line_start = line_end + 1
+    return headers
+
+
+def _header_category(header: str) -> Optional[str]:
+    """Map a matched header to requirements/responsibilities/skills."""
+    header = _WHITESPACE_PATTERN.sub(' ', header.lower())
+    if header.startswith(('technical requirement', 'skill', 'proficienc')):
+        return 'skills'
+    if header.startswith(('requirement', 'qualification')) or header.endswith('need'):
+        return 'requirements'
+    if header.startswith(('responsibilit', 'dut')) or header.endswith(' do'):
+        return 'responsibilities'
+    return None
+
 
 class DocumentProcessor:
-    def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
+    def __init__(self, use_process_pool: bool = None):
+        self.text_splitter = RecursiveTextSplitter(
+            chunk_size=DOC_SETTINGS['chunk_size'],
+            chunk_overlap=DOC_SETTINGS['chunk_overlap']
         )
+        self.cache = get_extraction_cache()
+        self.use_process_pool = DOC_SETTINGS['use_process_pool'] if use_process_pool is None else use_process_pool
+
+    def extract_text_from_pdf(self, source: Union[str, bytes, BinaryIO]) -> str:
+        """Extract text content from a PDF path, bytes or file-like object.
 
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text content from PDF file."""
+        Identical bytes are served from the extraction cache. Long documents are
+        split into page ranges that are parsed in parallel and reassembled in order.
+        """
         try:
-            text = pdfminer_extract_text(pdf_path)  # Use the aliased import
-            return self._clean_text(text)
+            with span('extract', cache_hit=False) as attributes:
+                data = _read_source(source)
+                attributes['bytes'] = len(data)
+                key = None
+                if self.cache is not None:
+                    key = extraction_key(data)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        attributes['cache_hit'] = True
+                        return cached
+
+                text = self._clean_text(self._extract_raw_text(data))
+                if key is not None:
+                    self.cache.set(key, text)
+                return text
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
 
+    def _extract_raw_text(self, data: bytes) -> str:
+        """Run pdfminer in-memory, fanning page ranges out to the process pool when worthwhile."""
+        if not self.use_process_pool:
+            return _extract_pages(data)
 
+        pool = _get_process_pool()
+        from pdfminer.pdfpage import PDFPage
+        page_count = sum(1 for _ in PDFPage.get_pages(BytesIO(data)))
+        if page_count < DOC_SETTINGS['parallel_page_threshold']:
+            return pool.submit(_extract_pages, data).result(timeout=remaining())
+
+        task_count = min(DOC_SETTINGS['pdf_workers'], math.ceil(page_count / DOC_SETTINGS['min_pages_per_task']))
+        pages_per_task = math.ceil(page_count / task_count)
+        futures = [
+            pool.submit(_extract_pages, data, list(range(first, min(first + pages_per_task, page_count))))
+            for first in range(0, page_count, pages_per_task)
+        ]
+        # Waits stop at the caller's deadline; the parse itself can't be interrupted
+        return "".join(future.result(timeout=remaining()) for future in futures)
 
     def process_job_description(self, job_description: str) -> Dict:
         """Process and structure job description text."""
-        cleaned_text = self._clean_text(job_description)
-        
-        # Split into sections
-        sections = self._split_into_sections(cleaned_text)
-        
-        # Extract key information
+        with span('jd_parse', chars=len(job_description)):
+            cleaned_text = self._clean_text(job_description)
+
+            # Split into sections
+            sections = self._split_into_sections(cleaned_text)
+
+            # Extract key information in one pass over the original line structure
+            parsed = self._parse_job_sections(job_description)
         processed = {
-            'requirements': self._extract_requirements(cleaned_text),
-            'responsibilities': self._extract_responsibilities(cleaned_text),
-            'skills': self._extract_skills(cleaned_text),
+            'requirements': parsed['requirements'],
+            'responsibilities': parsed['responsibilities'],
+            'skills': parsed['skills'],
             'full_text': cleaned_text,
             'sections': sections
         }
@@ -42,9 +227,9 @@ class DocumentProcessor:
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content."""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_PATTERN.sub(' ', text)
         # Remove special characters
-        text = re.sub(r'[^\w\s.,;:-]', '', text)
+        text = _SPECIAL_CHARS_PATTERN.sub('', text)
         return text.strip()
 
     def _split_into_sections(self, text: str) -> List[str]:
@@ -52,48 +237,42 @@ class DocumentProcessor:
         chunks = self.text_splitter.split_text(text)
         return chunks
 
-    def _extract_requirements(self, text: str) -> List[str]:
-        """Extract job requirements from text."""
-        requirements = []
-        # Look for requirement patterns
-        patterns = [
-            r'requirements?:?\s*(.*?)(?=\n\n|\Z)',
-            r'qualifications?:?\s*(.*?)(?=\n\n|\Z)',
-            r'what you\'ll need:?\s*(.*?)(?=\n\n|\Z)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-            requirements.extend(matches)
-        
-        return list(set(requirements))
-
-    def _extract_responsibilities(self, text: str) -> List[str]:
-        """Extract job responsibilities from text."""
-        responsibilities = []
-        patterns = [
-            r'responsibilities?:?\s*(.*?)(?=\n\n|\Z)',
-            r'duties:?\s*(.*?)(?=\n\n|\Z)',
-            r'what you\'ll do:?\s*(.*?)(?=\n\n|\Z)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-            responsibilities.extend(matches)
-        
-        return list(set(responsibilities))
-
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract required skills from text."""
-        skills = []
-        patterns = [
-            r'skills?:?\s*(.*?)(?=\n\n|\Z)',
-            r'technical requirements?:?\s*(.*?)(?=\n\n|\Z)',
-            r'proficienc(?:y|ies):?\s*(.*?)(?=\n\n|\Z)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-            skills.extend(matches)
-        
-        return list(set(skills))
\ No newline at end of file
+    def _parse_job_sections(self, text: str) -> Dict[str, List[str]]:
+        """Find every section header once and split each section body into items.
+
+        Runs on the raw posting (before whitespace is collapsed) so line breaks,
+        blank lines and bullets can delimit sections and items.
+        """
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        parsed = {'requirements': [], 'responsibilities': [], 'skills': []}
+
+        headers = _find_headers(text)
+        for i, (_, header_end, category) in enumerate(headers):
+            if category is None:
+                continue
+            end = headers[i + 1][0] if i + 1 < len(headers) else len(text)
+            body = text[header_end:end].lstrip()
+            paragraph_break = _PARAGRAPH_END_PATTERN.search(body)
+            if paragraph_break:
+                body = body[:paragraph_break.start()]
+            parsed[category].extend(self._split_items(body))
+
+        return {category: list(dict.fromkeys(items)) for category, items in parsed.items()}
+
+    def _split_items(self, body: str) -> List[str]:
+        """Split a section body into bullet items, falling back to inline separators or sentences."""
+        lines = [line for line in body.split('\n') if line.strip()]
+        if len(lines) > 1:
+            parts = lines
+        elif lines and _INLINE_BULLET_PATTERN.search(lines[0]):
+            parts = _INLINE_BULLET_PATTERN.split(lines[0])
+        else:
+            parts = _SENTENCE_SPLIT_PATTERN.split(body)
+
+        items = []
+        for part in parts:
+            # Drop the separator a sentence or inline list left on the end of the item
+            item = self._clean_text(_BULLET_PATTERN.sub('', part, count=1)).rstrip(';,. ')
+            if item:
+                items.append(item)
+        return items
@@ -0,0 +1,129 @@
+import json
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from config import GITHUB_SETTINGS
+from .cache import TieredCache, make_key
+from .deadlines import remaining
+from .http_client import get_session
+
+_client = None
+_client_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubClient:
+    """Minimal GitHub REST client with pagination, ETag revalidation and rate-limit tracking.
+
+    Every page is cached on disk with its ETag. Repeat requests send If-None-Match,
+    so an unchanged page comes back as a cheap 304 that doesn't use the rate limit.
+    """
+
+    def __init__(self, api_url: str = None, token: str = None, cache: TieredCache = None, session=None):
+        self.api_url = (api_url or GITHUB_SETTINGS['api_url']).rstrip('/')
+        self.token = GITHUB_SETTINGS['token'] if token is None else token
+        self.cache = cache or TieredCache(
+            max_memory_bytes=GITHUB_SETTINGS['max_memory_bytes'],
+            disk_dir=GITHUB_SETTINGS['cache_dir'],
+            max_disk_bytes=GITHUB_SETTINGS['max_disk_bytes']
+        )
+        self.session = session or get_session()
+        self.rate_limit = {'limit': None, 'remaining': None, 'reset': None}
+        self._lock = threading.Lock()
+
+    def list_user_repos(self, username: str) -> List[Dict]:
+        """Return every public repository of a user, following pagination."""
+        url = f"{self.api_url}/users/{username}/repos?per_page={GITHUB_SETTINGS['per_page']}"
+        repos = []
+        for _ in range(GITHUB_SETTINGS['max_pages']):
+            page, next_url = self._get_page(url)
+            repos.extend(page)
+            if not next_url:
+                break
+            url = next_url
+        return repos
+
+    def _headers(self, etag: Optional[str]) -> Dict:
+        headers = {'Accept': 'application/vnd.github+json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        if etag:
+            headers['If-None-Match'] = etag
+        return headers
+
+    def _get_page(self, url: str) -> Tuple[List[Dict], Optional[str]]:
+        """Fetch one page (data, next page URL), revalidating a cached copy when there is one."""
+        key = make_key(url, self.token or "")
+        cached_raw = self.cache.get(key)
+        cached = json.loads(cached_raw) if cached_raw else None
+
+        if not self._has_budget():
+            if cached:
+                logger.info("GitHub rate limit nearly exhausted, serving cached %s", url)
+                return cached['data'], cached['next']
+            self._wait_for_reset()
+
+        response = self.session.get(url, headers=self._headers(cached['etag'] if cached else None))
+        self._record_rate_limit(response)
+
+        if response.status_code == 304 and cached:
+            return cached['data'], cached['next']
+
+        if response.status_code in (403, 429) and self.rate_limit['remaining'] == 0:
+            if cached:
+                return cached['data'], cached['next']
+            raise Exception(f"GitHub rate limit exceeded until {self._reset_time()}")
+
+        if response.status_code != 200:
+            raise Exception(f"Error fetching GitHub data: Status code {response.status_code}")
+
+        data = response.json()
+        next_url = response.links.get('next', {}).get('url')
+        etag = response.headers.get('ETag')
+        if etag:
+            self.cache.set(key, json.dumps({'etag': etag, 'data': data, 'next': next_url}))
+        return data, next_url
+
+    def _record_rate_limit(self, response):
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        with self._lock:
+            self.rate_limit = {
+                'limit': int(headers.get('X-RateLimit-Limit', 0)),
+                'remaining': int(headers['X-RateLimit-Remaining']),
+                'reset': float(headers.get('X-RateLimit-Reset', 0)),
+            }
+
+    def _has_budget(self) -> bool:
+        with self._lock:
+            remaining, reset = self.rate_limit['remaining'], self.rate_limit['reset']
+        if remaining is None or remaining > GITHUB_SETTINGS['rate_limit_reserve']:
+            return True
+        return reset is not None and reset <= time.time()
+
+    def _wait_for_reset(self):
+        """Back off until the window resets, or fail fast if that's too far away or past the caller's deadline."""
+        wait = (self.rate_limit['reset'] or 0) - time.time()
+        max_wait = GITHUB_SETTINGS['max_rate_limit_wait']
+        left = remaining()
+        if left is not None:
+            max_wait = min(max_wait, left)
+        if wait > max_wait:
+            raise Exception(f"GitHub rate limit nearly exhausted until {self._reset_time()}")
+        if wait > 0:
+            time.sleep(wait)
+
+    def _reset_time(self) -> str:
+        return time.strftime('%H:%M:%S', time.localtime(self.rate_limit['reset'] or time.time()))
+
+
+def get_github_client() -> GitHubClient:
+    """Process-wide client, so the rate-limit state is shared by every PortfolioAgent."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
@@ -0,0 +1,110 @@
+import threading
+from typing import Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+from config import HTTP_SETTINGS
+from .deadlines import remaining
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default (connect, read) timeout to every call.
+
+    Inside a ``deadlines.deadline()`` both timeouts are also capped at the time
+    left, and a request made after the deadline fails immediately.
+    """
+
+    def __init__(self, timeout: Tuple[float, float]):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.get('timeout', self.timeout)
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise requests.exceptions.Timeout(f"Deadline passed before {method} {url}")
+            timeout = _cap_timeout(timeout, left)
+        kwargs['timeout'] = timeout
+        return super().request(method, url, **kwargs)
+
+
+def _cap_timeout(timeout: Union[None, float, Tuple[Optional[float], Optional[float]]], limit: float):
+    if isinstance(timeout, tuple):
+        return tuple(limit if part is None else min(part, limit) for part in timeout)
+    return limit if timeout is None else min(timeout, limit)
+
+
+class DeadlineRetry(Retry):
+    """Retry policy that gives up once the caller's deadline has passed and never sleeps past it.
+
+    A Retry-After that ends after the deadline is not waited out; the last response is returned.
+    """
+
+    def is_exhausted(self) -> bool:
+        left = remaining()
+        return super().is_exhausted() or (left is not None and left <= 0)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        left = remaining()
+        return backoff if left is None else min(backoff, left)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        # Waiting out a Retry-After that ends past the deadline would only hold the worker,
+        # so give up now; with raise_on_status=False the caller gets the last response.
+        left = remaining()
+        if left is not None and response is not None and retry.respect_retry_after_header:
+            retry_after = retry.get_retry_after(response)
+            if retry_after is not None and retry_after >= left:
+                raise MaxRetryError(_pool, url, ResponseError(f"Retry-After {retry_after}s is past the deadline"))
+        return retry
+
+
+def default_timeout(read_timeout: float = None) -> Tuple[float, float]:
+    """Return a (connect, read) timeout tuple, optionally overriding the read timeout."""
+    return (
+        HTTP_SETTINGS['connect_timeout'],
+        read_timeout if read_timeout is not None else HTTP_SETTINGS['read_timeout']
+    )
+
+
+def create_session() -> TimeoutSession:
+    """Build a pooled keep-alive session with bounded retries and backoff."""
+    retry = DeadlineRetry(
+        total=HTTP_SETTINGS['max_retries'],
+        connect=HTTP_SETTINGS['max_retries'],
+        read=HTTP_SETTINGS['max_retries'],
+        status=HTTP_SETTINGS['max_retries'],
+        backoff_factor=HTTP_SETTINGS['backoff_factor'],
+        status_forcelist=HTTP_SETTINGS['retry_statuses'],
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_SETTINGS['pool_connections'],
+        pool_maxsize=HTTP_SETTINGS['pool_maxsize'],
+        pool_block=True,  # Enforce the per-host connection limit
+        max_retries=retry
+    )
+
+    session = TimeoutSession(default_timeout())
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session() -> TimeoutSession:
+    """Return the process-wide shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
@@ -1,14 +1,40 @@
-import requests
-from typing import Dict, List
-import json
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from io import BytesIO
 import datetime
+import json
+import logging
 import re
-from config import APP_SETTINGS
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional
+import requests
+from config import APP_SETTINGS, HTTP_SETTINGS, LLM_CACHE_SETTINGS, PROMPT_SETTINGS, VARIANT_SETTINGS
+from .cache import TieredCache, make_key
+from .http_client import get_session, default_timeout
+from .pdf_renderer import render_pdf_cached
+from .telemetry import copy_context, record_generation, span
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def get_response_cache() -> Optional[TieredCache]:
+    """Return the process-wide LLM response cache, or None when caching is disabled."""
+    global _response_cache
+    if not LLM_CACHE_SETTINGS['enabled']:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = TieredCache(
+                max_memory_bytes=LLM_CACHE_SETTINGS['max_memory_bytes'],
+                disk_dir=LLM_CACHE_SETTINGS['disk_dir'] if LLM_CACHE_SETTINGS['disk_enabled'] else None,
+                max_disk_bytes=LLM_CACHE_SETTINGS['max_disk_bytes'],
+                ttl=LLM_CACHE_SETTINGS['ttl']
+            )
+        return _response_cache
+
 
 class OllamaLLM:
     def __init__(self):
@@ -16,11 +42,46 @@ class OllamaLLM:
         self.host = APP_SETTINGS['ollama_host']
         self.temperature = APP_SETTINGS['temperature']
         self.max_tokens = APP_SETTINGS['max_tokens']
-        self._verify_model_availability()
+        self.seed = APP_SETTINGS['seed']
+        self.keep_alive = APP_SETTINGS['keep_alive']
+        self.num_ctx = APP_SETTINGS['num_ctx']
+        self._local = threading.local()
+        self.response_cache = get_response_cache()
+        self.session = get_session()
+        self._checked_at = None
+        self._health_lock = threading.Lock()
+        self.ensure_available(force=True)
+
+    @property
+    def last_stats(self) -> Dict:
+        """Stats of the last generation made by the calling thread.
+
+        Kept per thread so one shared instance can serve concurrent sessions and variants.
+        """
+        return getattr(self._local, 'stats', {})
+
+    @last_stats.setter
+    def last_stats(self, stats: Dict):
+        self._local.stats = stats
+
+    def ensure_available(self, force: bool = False):
+        """Verify the Ollama server and model, at most once per ``health_check_interval``.
+
+        Long-lived instances call this before each request instead of paying an
+        /api/tags round-trip on every construction. Failures raise and are
+        retried on the next call.
+        """
+        with self._health_lock:
+            now = time.monotonic()
+            if (not force and self._checked_at is not None
+                    and now - self._checked_at < APP_SETTINGS['health_check_interval']):
+                return
+            self._verify_model_availability()
+            self._checked_at = now
 
     def _verify_model_availability(self):
         try:
-            response = requests.get(f"{self.host}/api/tags")
+            response = self.session.get(f"{self.host}/api/tags")
             if response.status_code == 200:
                 available_models = response.json()
                 if not any(model['name'] == self.model_name for model in available_models['models']):
@@ -29,36 +90,203 @@ class OllamaLLM:
             raise Exception("Cannot connect to Ollama server. Please ensure it's running.")
 
     def generate_cover_letter(self, prompt: str) -> str:
+        generated_text = "".join(self.stream_cover_letter(prompt)).strip()
+
+        # Format the cover letter with proper structure
+        return self._format_cover_letter(generated_text)
+
+    def generate_variants(self, variant_prompts: List[Dict], shared_prefix: str = "",
+                          max_parallel: Optional[int] = None) -> Iterator[Dict]:
+        """Generate several prompt variants concurrently, yielding each result as it finishes.
+
+        ``variant_prompts`` are the entries of ``build_variant_prompts(...)['variants']``.
+        Up to ``max_parallel`` (default: the server's parallel slots) requests run at once.
+        When the variants share a prefix it is evaluated once first, so each slot can reuse
+        it from the server's cache instead of prefilling it in parallel. Yields dicts with
+        tone, style, cover_letter, stats and error (None on success), in completion order.
+        """
+        if not variant_prompts:
+            return
+        if VARIANT_SETTINGS['warm_shared_prefix'] and len(variant_prompts) > 1 and shared_prefix:
+            self._warm_prefix(shared_prefix, [variant['prompt'] for variant in variant_prompts])
+
+        def generate(variant: Dict) -> Dict:
+            cover_letter = self.generate_cover_letter(variant['prompt'])
+            return {'cover_letter': cover_letter, 'stats': self.last_stats}
+
+        workers = min(max_parallel or VARIANT_SETTINGS['num_parallel'], len(variant_prompts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='variant') as pool:
+            # Each task runs in its own copy of the caller's context so its spans join the request trace
+            futures = {pool.submit(copy_context().run, generate, variant): variant for variant in variant_prompts}
+            for future in as_completed(futures):
+                variant = futures[future]
+                result = {'tone': variant['tone'], 'style': variant['style'],
+                          'cover_letter': None, 'stats': {}, 'error': None}
+                try:
+                    result.update(future.result())
+                except Exception as e:
+                    result['error'] = str(e)
+                yield result
+
+    def _warm_prefix(self, shared_prefix: str, prompts: List[str]):
+        """Prefill the shared prompt text with a one-token request; best effort."""
+        options = self._generation_options()
+        keys = [self._cache_key('generate', prompt, options) for prompt in prompts]
+        if all(key is not None and self.response_cache.get(key) is not None for key in keys):
+            return  # Every variant will be served from the response cache
+        options['num_predict'] = 1
         try:
-            response = requests.post(
+            self.session.post(
                 f"{self.host}/api/generate",
                 json={
                     "model": self.model_name,
-                    "prompt": prompt,
+                    "prompt": shared_prefix,
                     "stream": False,
-                    "options": {
-                        "temperature": self.temperature,
-                        "top_p": 0.9,
-                        "top_k": 40,
-                        "num_ctx": 4096,
-                        "stop": ["[END]"]
-                    }
-                }
+                    "keep_alive": self.keep_alive,
+                    "options": options
+                },
+                timeout=default_timeout(HTTP_SETTINGS['llm_read_timeout'])
+            ).close()
+        except Exception as e:
+            logger.warning("Could not warm shared prefix: %s", e)
+
+    def stream_cover_letter(self, prompt: str) -> Iterator[str]:
+        """Yield generated text chunks as they arrive from Ollama's NDJSON stream.
+
+        Timing for the request is available in ``last_stats`` once the stream is exhausted,
+        and is recorded in the "generate" span and the Ollama metrics.
+        """
+        with span('generate', model=self.model_name) as attributes:
+            yield from self._stream(prompt)
+            stats = self.last_stats
+            attributes.update({
+                field: stats.get(field) for field in (
+                    'cache_hit', 'prompt_eval_count', 'eval_count', 'load_duration', 'eval_duration'
+                )
+            })
+            record_generation(self.model_name, stats)
+
+    def _stream(self, prompt: str) -> Iterator[str]:
+        self.last_stats = {}
+        start = time.perf_counter()
+        first_token_at = None
+        chunk_count = 0
+
+        options = self._generation_options()
+        cache_key = self._cache_key('generate', prompt, options)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.last_stats = self._build_stats({}, start, start, 0)
+                self.last_stats['cache_hit'] = True
+                yield cached
+                return
+
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": options
+        }
+
+        parts = []
+        try:
+            response = self.session.post(
+                f"{self.host}/api/generate",
+                json=payload,
+                stream=True,
+                timeout=default_timeout(HTTP_SETTINGS['llm_read_timeout'])
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                generated_text = result['response'].strip()
-                
-                # Format the cover letter with proper structure
-                formatted_letter = self._format_cover_letter(generated_text)
-                return formatted_letter
-            else:
-                raise Exception(f"Error generating cover letter: {response.text}")
-                
         except Exception as e:
             raise Exception(f"Error communicating with Ollama: {str(e)}")
 
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"Error generating cover letter: {response.text}")
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise Exception(f"Error generating cover letter: {chunk['error']}")
+
+                text = chunk.get('response', '')
+                if text:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunk_count += 1
+                    parts.append(text)
+                    yield text
+
+                if chunk.get('done'):
+                    self.last_stats = self._build_stats(chunk, start, first_token_at, chunk_count)
+                    if cache_key is not None:
+                        self.response_cache.set(cache_key, "".join(parts))
+                    return
+
+        # Stream closed without a final "done" record
+        self.last_stats = self._build_stats({}, start, first_token_at, chunk_count)
+
+    def _build_stats(self, final_chunk: Dict, start: float, first_token_at: float, chunk_count: int) -> Dict:
+        """Summarize perceived latency and throughput for one generation."""
+        end = time.perf_counter()
+        eval_count = final_chunk.get('eval_count', chunk_count)
+        eval_duration = final_chunk.get('eval_duration')
+
+        if eval_duration:
+            tokens_per_second = eval_count / (eval_duration / 1e9)
+        elif first_token_at is not None and end > first_token_at:
+            tokens_per_second = eval_count / (end - first_token_at)
+        else:
+            tokens_per_second = 0.0
+
+        return {
+            'time_to_first_token': (first_token_at - start) if first_token_at is not None else None,
+            'tokens_per_second': tokens_per_second,
+            'eval_count': eval_count,
+            'total_duration': end - start,
+            'prompt_eval_count': final_chunk.get('prompt_eval_count'),
+            'prompt_eval_duration': final_chunk['prompt_eval_duration'] / 1e9 if final_chunk.get('prompt_eval_duration') else None,
+            'eval_duration': eval_duration / 1e9 if eval_duration else None,
+            'load_duration': final_chunk['load_duration'] / 1e9 if final_chunk.get('load_duration') else None,
+            'cache_hit': False
+        }
+
+    def _generation_options(self) -> Dict:
+        options = {
+            "temperature": self.temperature,
+            "top_p": 0.9,
+            "top_k": 40,
+            "num_ctx": self.num_ctx,
+            # Prompts are fitted to leave exactly this much of num_ctx free, so asking for more
+            # would make the server shift the context and drop the start of the prompt
+            "num_predict": min(self.max_tokens, PROMPT_SETTINGS['reserve_output_tokens']),
+            "stop": ["[END]"]
+        }
+        if self.seed is not None:
+            options["seed"] = self.seed
+        return options
+
+    def _cache_key(self, endpoint: str, prompt: str, options: Dict) -> Optional[str]:
+        """Key a response on model, prompt hash and sampling options, or None if it shouldn't be cached.
+
+        Deterministic requests (pinned seed or zero temperature) are cached by default;
+        sampled ones only when LLM_CACHE_SETTINGS['cache_sampled'] opts in.
+        """
+        if self.response_cache is None:
+            return None
+        deterministic = options.get('seed') is not None or options.get('temperature') == 0
+        if not deterministic and not LLM_CACHE_SETTINGS['cache_sampled']:
+            return None
+        return make_key(
+            self.model_name,
+            endpoint,
+            make_key(prompt),
+            json.dumps(options, sort_keys=True)
+        )
+
     def _format_cover_letter(self, text: str) -> str:
         """Format the cover letter with proper business letter structure."""
         # Clean up the text
@@ -103,55 +331,12 @@ class OllamaLLM:
         return "\n".join(formatted_parts)
 
     def export_to_pdf(self, cover_letter_text: str, filename: str = "cover_letter.pdf") -> BytesIO:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        header_style = ParagraphStyle(
-            'Header',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=30
-        )
-        
-        body_style = ParagraphStyle(
-            'Body',
-            parent=styles['Normal'],
-            fontSize=12,
-            leading=14,
-            spaceBefore=12,
-            spaceAfter=12
-        )
-        
-        signature_style = ParagraphStyle(
-            'Signature',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceBefore=30
-        )
-        
-        # Split the letter into sections
-        sections = cover_letter_text.split('\n\n')
-        story = []
-        
-        # Add each section with appropriate styling
-        for i, section in enumerate(sections):
-            if i == 0:  # Date
-                story.append(Paragraph(section, header_style))
-            elif i == len(sections) - 1:  # Signature
-                story.append(Paragraph(section, signature_style))
-            else:
-                story.append(Paragraph(section, body_style))
-        
-        # Build the PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
+        """Render the letter to PDF; repeat exports of the same text reuse the cached render."""
+        return BytesIO(render_pdf_cached(cover_letter_text))
 
     def get_model_info(self) -> Dict:
         try:
-            response = requests.get(f"{self.host}/api/show", params={"name": self.model_name})
+            response = self.session.post(f"{self.host}/api/show", json={"model": self.model_name})
             if response.status_code == 200:
                 return response.json()
             else:
@@ -162,24 +347,40 @@ class OllamaLLM:
     def generate_with_history(self, prompt: str, history: List[Dict] = None) -> str:
         if history is None:
             history = []
-            
+
+        messages = history + [{"role": "user", "content": prompt}]
+        options = {
+            "temperature": self.temperature,
+            "top_p": 0.9
+        }
+        if self.seed is not None:
+            options["seed"] = self.seed
+
+        cache_key = self._cache_key('chat', json.dumps(messages, sort_keys=True), options)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.host}/api/chat",
                 json={
                     "model": self.model_name,
-                    "messages": history + [{"role": "user", "content": prompt}],
+                    "messages": messages,
                     "stream": False,
-                    "options": {
-                        "temperature": self.temperature,
-                        "top_p": 0.9
-                    }
-                }
+                    "keep_alive": self.keep_alive,
+                    "options": options
+                },
+                timeout=default_timeout(HTTP_SETTINGS['llm_read_timeout'])
             )
             
             if response.status_code == 200:
                 result = response.json()
-                return result['message']['content'].strip()
+                content = result['message']['content'].strip()
+                if cache_key is not None:
+                    self.response_cache.set(cache_key, content)
+                return content
             else:
                 raise Exception(f"Error generating response: {response.text}")
                 
@@ -0,0 +1,268 @@
+"""A local stand-in for the Ollama HTTP API, for tests and load generation without a model.
+
+Implements /api/tags, /api/show, /api/generate and /api/chat (streaming and
+non-streaming) with configurable latency, generation speed, parallel slots and
+failure injection. Prompt evaluation is simulated with a per-slot prefix cache, so
+repeated prompts that share a prefix report a smaller prompt_eval_count, as the
+real server does.
+
+Usage:
+    python -m utils.ollama_stub --port 11434 --tokens-per-second 40 --failure-rate 0.05
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from config import APP_SETTINGS
+
+_LETTER_WORDS = (
+    "I am excited to apply for this role. In my current position I built data pipelines in Python, "
+    "led a small team through a migration to Kubernetes and cut deployment times in half. "
+    "Your focus on reliable infrastructure matches the work I enjoy most, and I would welcome the "
+    "chance to bring that experience to your team.\n\n"
+).split(" ")
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections (or aborted streams) are expected under load
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class OllamaStub:
+    """Serves the Ollama API from a background thread; use as a context manager or start()/stop()."""
+
+    def __init__(self, model_name: str = None, host: str = '127.0.0.1', port: int = 0,
+                 tokens_per_second: float = 200.0, prompt_tokens_per_second: float = 5000.0,
+                 load_latency: float = 0.0, num_parallel: int = 4, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.model_name = model_name or APP_SETTINGS['model_name']
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.load_latency = load_latency
+        self.failure_rate = failure_rate
+        self.requests = []  # (endpoint, payload) in arrival order
+        self._fail_next = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(num_parallel)
+        self._slot_cache = [[] for _ in range(num_parallel)]  # Evaluated prompt tokens per slot
+        self._server = _QuietServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'OllamaStub':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'OllamaStub':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, count: int = 1):
+        """Make the next ``count`` generate/chat requests fail with HTTP 500."""
+        with self._lock:
+            self._fail_next += count
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            if self._fail_next:
+                self._fail_next -= 1
+                return True
+            return self._random.random() < self.failure_rate
+
+    def _evaluate_prompt(self, prompt_tokens: List[str]) -> int:
+        """Pick the slot sharing the longest prefix with the prompt; return the tokens left to evaluate."""
+        with self._lock:
+            best_slot, best_shared = 0, -1
+            for slot, cached in enumerate(self._slot_cache):
+                shared = 0
+                for cached_token, token in zip(cached, prompt_tokens):
+                    if cached_token != token:
+                        break
+                    shared += 1
+                if shared > best_shared:
+                    best_slot, best_shared = slot, shared
+            self._slot_cache[best_slot] = prompt_tokens
+        return max(len(prompt_tokens) - best_shared, 1)
+
+    def _completion(self, prompt: str, options: Dict):
+        """Yield (text, final stats or None) pieces of a simulated generation, sleeping to pace it."""
+        start = time.perf_counter()
+        if self.load_latency:
+            time.sleep(self.load_latency)
+        load_duration = time.perf_counter() - start
+
+        prompt_tokens = prompt.split()
+        prompt_eval_count = self._evaluate_prompt(prompt_tokens)
+        prompt_eval_duration = prompt_eval_count / self.prompt_tokens_per_second
+        time.sleep(prompt_eval_duration)
+
+        num_predict = options.get('num_predict', 128)
+        if num_predict is None or num_predict < 0:
+            num_predict = 128
+        eval_start = time.perf_counter()
+        offset = zlib.crc32(prompt.encode('utf-8'))
+        for i in range(num_predict):
+            time.sleep(1 / self.tokens_per_second)
+            word = _LETTER_WORDS[(offset + i) % len(_LETTER_WORDS)]
+            yield (word if i == 0 or word.startswith('\n') else " " + word), None
+        eval_duration = time.perf_counter() - eval_start
+
+        yield "", {
+            'done_reason': 'length',
+            'context': [zlib.crc32(token.encode('utf-8')) % 32000 for token in prompt_tokens[-64:]],
+            'total_duration': int((time.perf_counter() - start) * 1e9),
+            'load_duration': int(load_duration * 1e9),
+            'prompt_eval_count': prompt_eval_count,
+            'prompt_eval_duration': int(prompt_eval_duration * 1e9),
+            'eval_count': num_predict,
+            'eval_duration': int(eval_duration * 1e9),
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_json(self) -> Dict:
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length) or b'{}')
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    stub.requests.append(('tags', {}))
+                    self._send_json(200, {'models': [{'name': stub.model_name, 'model': stub.model_name}]})
+                elif self.path == '/':
+                    self._send_json(200, {'status': 'Ollama is running'})
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_POST(self):
+                payload = self._read_json()
+                endpoint = self.path.rsplit('/', 1)[-1]
+                stub.requests.append((endpoint, payload))
+
+                if endpoint == 'show':
+                    if (payload.get('model') or payload.get('name')) != stub.model_name:
+                        self._send_json(404, {'error': 'model not found'})
+                        return
+                    self._send_json(200, {
+                        'modelfile': f"FROM {stub.model_name}",
+                        'details': {'family': 'stub', 'parameter_size': '0B'},
+                        'model_info': {'general.architecture': 'stub'}
+                    })
+                    return
+                if endpoint not in ('generate', 'chat'):
+                    self._send_json(404, {'error': 'not found'})
+                    return
+                if payload.get('model') != stub.model_name:
+                    self._send_json(404, {'error': f"model '{payload.get('model')}' not found"})
+                    return
+                if stub._should_fail():
+                    self._send_json(500, {'error': 'injected failure'})
+                    return
+
+                if endpoint == 'chat':
+                    prompt = "\n".join(message.get('content', '') for message in payload.get('messages', []))
+                else:
+                    prompt = payload.get('prompt', '')
+                with stub._slots:
+                    self._respond(endpoint, prompt, payload)
+
+            def _respond(self, endpoint: str, prompt: str, payload: Dict):
+                def record(text: str, done: bool) -> Dict:
+                    body = {'model': stub.model_name, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'done': done}
+                    if endpoint == 'chat':
+                        body['message'] = {'role': 'assistant', 'content': text}
+                    else:
+                        body['response'] = text
+                    return body
+
+                completion = stub._completion(prompt, payload.get('options') or {})
+                if not payload.get('stream', True):
+                    parts = []
+                    for text, stats in completion:
+                        parts.append(text)
+                    body = record("".join(parts), True)
+                    body.update(stats)
+                    if endpoint == 'chat':
+                        body.pop('context')
+                    self._send_json(200, body)
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for text, stats in completion:
+                    body = record(text, stats is not None)
+                    if stats is not None:
+                        body.update(stats)
+                        if endpoint == 'chat':
+                            body.pop('context')
+                    line = (json.dumps(body) + "\n").encode('utf-8')
+                    self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Ollama API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--model', default=None, help="Model name to advertise (default: MODEL_NAME)")
+    parser.add_argument('--tokens-per-second', type=float, default=40.0)
+    parser.add_argument('--prompt-tokens-per-second', type=float, default=400.0)
+    parser.add_argument('--load-latency', type=float, default=0.0, help="Seconds added before each request")
+    parser.add_argument('--num-parallel', type=int, default=4)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = OllamaStub(
+        model_name=args.model, host=args.host, port=args.port,
+        tokens_per_second=args.tokens_per_second, prompt_tokens_per_second=args.prompt_tokens_per_second,
+        load_latency=args.load_latency, num_parallel=args.num_parallel, failure_rate=args.failure_rate
+    )
+    print(f"Ollama stand-in serving {stub.model_name} at {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import io
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+from xml.sax.saxutils import escape
+from config import PDF_SETTINGS
+from .cache import TieredCache, make_key
+from .telemetry import span
+
+_pdf_cache = None
+_pdf_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _styles() -> Dict:
+    """Build the paragraph styles once per process; reportlab is imported on first render."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    normal = getSampleStyleSheet()['Normal']
+    return {
+        'header': ParagraphStyle('Header', parent=normal, fontSize=12, spaceAfter=30),
+        'body': ParagraphStyle('Body', parent=normal, fontSize=12, leading=14, spaceBefore=12, spaceAfter=12),
+        'signature': ParagraphStyle('Signature', parent=normal, fontSize=12, spaceBefore=30),
+    }
+
+
+def get_pdf_cache() -> TieredCache:
+    """Process-wide memory cache of rendered PDFs keyed by a hash of the letter text."""
+    global _pdf_cache
+    with _pdf_cache_lock:
+        if _pdf_cache is None:
+            _pdf_cache = TieredCache(max_memory_bytes=PDF_SETTINGS['max_memory_bytes'])
+        return _pdf_cache
+
+
+def render_pdf(cover_letter_text: str) -> bytes:
+    """Render a cover letter to PDF: first section as the date header, last as the signature."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph
+
+    styles = _styles()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+
+    # Split the letter into sections; Paragraph parses markup, so escape the text
+    sections = cover_letter_text.split('\n\n')
+    story = []
+    for i, section in enumerate(sections):
+        if i == 0:  # Date
+            style = styles['header']
+        elif i == len(sections) - 1:  # Signature
+            style = styles['signature']
+        else:
+            style = styles['body']
+        story.append(Paragraph(escape(section), style))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def render_pdf_cached(cover_letter_text: str) -> bytes:
+    """Render a letter, reusing the PDF from an earlier call with identical text."""
+    with span('pdf', cache_hit=True) as attributes:
+        cache = get_pdf_cache()
+        key = make_key(cover_letter_text)
+        pdf = cache.get(key)
+        if pdf is None:
+            attributes['cache_hit'] = False
+            pdf = render_pdf(cover_letter_text)
+            cache.set(key, pdf, disk=False)
+        return pdf
+
+
+def render_pdf_zip(letters: Iterable[Tuple[str, str]], max_workers: Optional[int] = None) -> bytes:
+    """Render (file name, letter text) pairs across a process pool and return a ZIP archive.
+
+    Entries are written in input order; a '.pdf' suffix is added to names without one.
+    """
+    letters = list(letters)
+    with ProcessPoolExecutor(max_workers=max_workers or PDF_SETTINGS['render_workers']) as pool:
+        pdfs = pool.map(render_pdf, [text for _, text in letters], chunksize=4)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for (name, _), pdf in zip(letters, pdfs):
+                archive.writestr(name if name.endswith('.pdf') else f"{name}.pdf", pdf)
+    return buffer.getvalue()
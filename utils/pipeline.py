@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+from config import PIPELINE_SETTINGS
+from .deadlines import deadline
+from .document_processor import DocumentProcessor
+from .telemetry import copy_context
+
+_io_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    """Shared thread pool for ingestion tasks.
+
+    PDF tasks only wait here; DocumentProcessor parses them in its process pool.
+    """
+    global _io_pool
+    with _pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(
+                max_workers=PIPELINE_SETTINGS['io_workers'],
+                thread_name_prefix='ingest'
+            )
+        return _io_pool
+
+
+def _timed_call(due: float, fn, *args):
+    """Run fn under a deadline at monotonic time ``due``; return (result, seconds spent inside the worker)."""
+    start = time.perf_counter()
+    with deadline(due - time.monotonic()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class IngestionPipeline:
+    """Runs resume, document, portfolio and research ingestion concurrently."""
+
+    def __init__(self, doc_processor: DocumentProcessor = None, portfolio_agent=None, research_agent=None):
+        self.doc_processor = doc_processor or DocumentProcessor()
+        self.portfolio_agent = portfolio_agent
+        self.research_agent = research_agent
+
+    def run(
+        self,
+        resume_bytes: bytes,
+        additional_docs: Optional[List[bytes]] = None,
+        portfolio_links: Optional[List[str]] = None,
+        company_name: str = ""
+    ) -> Dict:
+        """Start every independent task, then join each one against its own deadline.
+
+        The resume is required, so a resume failure is raised. Every other task
+        degrades to an empty result and is reported under ``errors``.
+        """
+        start = time.monotonic()
+        io_pool = _get_io_pool()
+
+        def submit(fn, arg, stage_deadline):
+            # Tasks run in copies of the caller's context so their spans join its request trace.
+            # The stage deadline travels with them: future.cancel() only drops queued work, so
+            # running work has to stop by itself (HTTP and PDF waits are capped by remaining()).
+            future = io_pool.submit(copy_context().run, _timed_call, start + stage_deadline, fn, arg)
+            return future, stage_deadline
+
+        tasks = {'resume': submit(self.doc_processor.extract_text_from_pdf, resume_bytes,
+                                  PIPELINE_SETTINGS['resume_deadline'])}
+        for i, data in enumerate(additional_docs or []):
+            tasks[f'document_{i}'] = submit(self.doc_processor.extract_text_from_pdf, data,
+                                            PIPELINE_SETTINGS['document_deadline'])
+
+        links = [link.strip() for link in (portfolio_links or []) if link.strip()]
+        if links and self.portfolio_agent is not None:
+            tasks['portfolio'] = submit(self.portfolio_agent.analyze_portfolio, links,
+                                        PIPELINE_SETTINGS['portfolio_deadline'])
+        if company_name and self.research_agent is not None:
+            tasks['research'] = submit(self.research_agent.get_structured_research, company_name,
+                                       PIPELINE_SETTINGS['research_deadline'])
+
+        results = {}
+        timings = {}
+        errors = {}
+        for name, (future, stage_deadline) in tasks.items():
+            time_left = max(0.0, stage_deadline - (time.monotonic() - start))
+            try:
+                results[name], timings[name] = future.result(timeout=time_left)
+            except FutureTimeoutError:
+                future.cancel()  # Drops the task if it never started; a running one stops at its deadline
+                errors[name] = f"Timed out after {stage_deadline}s"
+            except Exception as e:
+                errors[name] = str(e)
+
+        if 'resume' not in results:
+            raise Exception(f"Error extracting resume: {errors.get('resume')}")
+
+        portfolio_info, portfolio_details = results.get('portfolio', ("", None))
+        return {
+            'resume_text': results['resume'],
+            'additional_content': [
+                results[name] for name in tasks
+                if name.startswith('document_') and name in results
+            ],
+            'portfolio_info': portfolio_info,
+            'portfolio_details': portfolio_details,
+            'company_research': results.get('research', ""),
+            'timings': timings,
+            'errors': errors,
+            'wall_time': time.monotonic() - start
+        }
@@ -1,26 +1,75 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Tuple
+from typing import Callable, Dict, List, Tuple
 from urllib.parse import urlparse
+import logging
 import re
-import streamlit as st
-from config import RESEARCH_SETTINGS
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import PORTFOLIO_SETTINGS, RESEARCH_SETTINGS
+from .deadlines import deadline
+from .github_client import get_github_client
+from .http_client import get_session, default_timeout
+from .scraping import scrape_texts
+from .telemetry import copy_context, get_registry, span
+
+# Shared by every agent so concurrent sessions stay within one bounded pool
+_url_pool = None
+_url_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _get_url_pool() -> ThreadPoolExecutor:
+    global _url_pool
+    with _url_pool_lock:
+        if _url_pool is None:
+            _url_pool = ThreadPoolExecutor(
+                max_workers=PORTFOLIO_SETTINGS['url_workers'],
+                thread_name_prefix='portfolio'
+            )
+        return _url_pool
+
+
+def _timed_analysis(analyze: Callable[[str], Tuple[str, List[Dict]]], url: str):
+    """Run one analysis; returns (result, latency, error) so failures are timed like successes."""
+    start = time.perf_counter()
+    try:
+        # Requests stop at the URL timeout (or the caller's deadline) instead of outliving the wait
+        with deadline(PORTFOLIO_SETTINGS['url_timeout']):
+            result = analyze(url)
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+    return result, time.perf_counter() - start, None
+
 
 class PortfolioAgent:
     def __init__(self):
         self.headers = {'User-Agent': RESEARCH_SETTINGS['user_agent']}
+        self.session = get_session()
+        self.github = get_github_client()
 
+    def analyze_portfolio(self, urls: List[str]) -> Tuple[str, Dict]:
+        """Analyze portfolio links concurrently and extract relevant information.
 
+        Results are merged in the order the links were given; per-URL status and
+        latency are reported under analysis_details['timings'].
+        """
+        with span('portfolio', urls=len(urls)):
+            return self._analyze_urls(urls)
 
-    def analyze_portfolio(self, urls: List[str]) -> Tuple[str, Dict]:
-        """Analyze portfolio links and extract relevant information."""
+    def _analyze_urls(self, urls: List[str]) -> Tuple[str, Dict]:
         portfolio_info = []
         analysis_details = {
             'github_repos': [],
             'behance_projects': [],
-            'other_links': []
+            'other_links': [],
+            'timings': {}
         }
-        
+
+        # (url, detail key, future) in input order so the merge is deterministic
+        timeout = PORTFOLIO_SETTINGS['url_timeout']
+        pool = _get_url_pool()
+        tasks = []
         for url in urls:
             url = url.strip()
             if not url:
@@ -29,98 +78,100 @@ class PortfolioAgent:
             domain = urlparse(url).netloc
             
             if 'github.com' in domain:
-                print(f"\nAnalyzing GitHub profile: {url}")
-                info, repos = self._analyze_github(url)
-                if info:
-                    portfolio_info.append(info)
-                    analysis_details['github_repos'].extend(repos)
-                    print(f"Added {len(repos)} repositories to analysis")
+                logger.info("Analyzing GitHub profile: %s", url)
+                tasks.append((url, 'github_repos', pool.submit(copy_context().run, _timed_analysis, self._analyze_github, url)))
             elif 'behance.net' in domain:
-                info, projects = self._analyze_behance(url)
-                if info:
-                    portfolio_info.append(info)
-                    analysis_details['behance_projects'].extend(projects)
+                tasks.append((url, 'behance_projects', pool.submit(copy_context().run, _timed_analysis, self._analyze_behance, url)))
             else:
                 analysis_details['other_links'].append(url)
+
+        wait([future for _, _, future in tasks], timeout=timeout)
+
+        timings = analysis_details['timings']
+        url_duration = get_registry().histogram(
+            'portfolio_url_duration_seconds', "Latency of each portfolio link analysis", ('kind', 'status')
+        )
+        for url, key, future in tasks:
+            if not future.done():
+                future.cancel()
+                timings[url] = {'status': 'timeout', 'latency': timeout}
+                url_duration.observe(timeout, kind=key, status='timeout')
+                logger.warning("Portfolio URL timed out after %ss: %s", timeout, url)
+                continue
+            result, latency, error = future.result()
+            if error is not None:
+                timings[url] = {'status': 'error', 'latency': latency, 'error': str(error)}
+                url_duration.observe(latency, kind=key, status='error')
+                logger.warning("Portfolio URL failed after %.2fs: %s: %s", latency, url, error)
+                continue
+            info, items = result
+            timings[url] = {'status': 'ok' if info else 'empty', 'latency': latency}
+            url_duration.observe(latency, kind=key, status=timings[url]['status'])
+            if info:
+                portfolio_info.append(info)
+                analysis_details[key].extend(items)
+                logger.info("Added %d items from %s in %.2fs", len(items), url, latency)
                     
         return "\n\n".join(filter(None, portfolio_info)), analysis_details
 
     def _analyze_github(self, url: str) -> Tuple[str, List[Dict]]:
         """Analyze GitHub profile and repositories."""
-        try:
-            # Extract username from URL
-            username = url.split('github.com/')[-1].split('/')[0]
-            
-            # Get public repositories
-            api_url = f"https://api.github.com/users/{username}/repos"
-            print(f"Attempting to fetch GitHub repos for user: {username}")
-            response = requests.get(api_url)
-            
-            if response.status_code != 200:
-                print(f"Error fetching GitHub repos: Status code {response.status_code}")
-                return "", []
-                
-            repos = response.json()
-            print(f"Successfully fetched GitHub data. Found {len(repos)} repositories")
-            
-            # Filter and analyze repositories
-            relevant_repos = []
-            for repo in repos:
-                if not repo['fork']:  # Only include original repos
-                    relevant_repos.append({
-                        'name': repo['name'],
-                        'description': repo['description'] or "No description provided",
-                        'stars': repo['stargazers_count'],
-                        'language': repo['language'] or "Not specified",
-                        'url': repo['html_url']
-                    })
-            
-            if not relevant_repos:
-                print("No relevant repositories found")
-                return "", []
-                
-            # Format the information
-            repo_info = []
-            for repo in relevant_repos:
-                if repo['description']:
-                    repo_info.append(f"- {repo['name']}: {repo['description']} ({repo['language']})")
-            
-            if repo_info:
-                return "GitHub Projects:\n" + "\n".join(repo_info), relevant_repos
-            
-        except Exception as e:
-            print(f"Error analyzing GitHub profile: {str(e)}")
-            
+        # Extract username from URL
+        username = url.split('github.com/')[-1].split('/')[0]
+
+        # Get public repositories (all pages, revalidated against the local cache)
+        repos = self.github.list_user_repos(username)
+        logger.debug("Fetched %d GitHub repositories for %s", len(repos), username)
+
+        # Filter and analyze repositories
+        relevant_repos = []
+        for repo in repos:
+            if not repo['fork']:  # Only include original repos
+                relevant_repos.append({
+                    'name': repo['name'],
+                    'description': repo['description'] or "No description provided",
+                    'stars': repo['stargazers_count'],
+                    'language': repo['language'] or "Not specified",
+                    'url': repo['html_url']
+                })
+
+        if not relevant_repos:
+            logger.info("No relevant repositories found for %s", username)
+            return "", []
+
+        # Format the information
+        repo_info = []
+        for repo in relevant_repos:
+            if repo['description']:
+                repo_info.append(f"- {repo['name']}: {repo['description']} ({repo['language']})")
+
+        if repo_info:
+            return "GitHub Projects:\n" + "\n".join(repo_info), relevant_repos
         return "", []
 
     def _analyze_behance(self, url: str) -> Tuple[str, List[Dict]]:
         """Analyze Behance portfolio."""
-        try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code != 200:
-                return "", []
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            projects = []
-            project_elements = soup.find_all('div', class_='Project-title')
-            
-            project_info = []
-            for element in project_elements[:3]:
-                title = element.get_text().strip()
-                if title:
-                    project_info.append({
-                        'title': title,
-                        'url': url
-                    })
-                    projects.append(f"- {title}")
-            
-            if projects:
-                return "Design Projects:\n" + "\n".join(projects), project_info
-                
-        except Exception as e:
-            st.error(f"Error analyzing Behance profile: {str(e)}")
-            
+        # Stream the page and stop after the first three project titles
+        titles = scrape_texts(
+            self.session, url, 'div', 'Project-title', limit=3,
+            headers=self.headers, timeout=default_timeout(PORTFOLIO_SETTINGS['url_timeout'])
+        )
+        if titles is None:
+            raise Exception(f"Behance page {url} returned an error response")
+
+        projects = []
+        project_info = []
+        for title in titles:
+            title = title.strip()
+            if title:
+                project_info.append({
+                    'title': title,
+                    'url': url
+                })
+                projects.append(f"- {title}")
+
+        if projects:
+            return "Design Projects:\n" + "\n".join(projects), project_info
         return "", []
 
     def _clean_text(self, text: str) -> str:
@@ -1,3 +1,58 @@
+import logging
+import os
+from typing import Dict, List, Tuple
+from config import APP_SETTINGS, PROMPT_SETTINGS
+from .telemetry import span
+from .token_budget import TokenBudget
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_RULES = """REQUIRED FORMAT:
+Note: Do not include any address or greeting - these will be added automatically.
+1. First paragraph (2-3 sentences): Briefly introduce your educational background and ONE specific reason for interest based on the company research
+2. Body paragraphs (2-3 paragraphs, each 3-4 sentences): Focus on your most relevant experiences that match the job requirements
+3. Final paragraph (2-3 sentences): Summarize your key qualifications that match the role requirements
+
+STRICT RULES:
+1. Keep the letter concise - maximum 5 paragraphs total
+2. Focus only on experiences and skills that directly match the job requirements
+3. Do not use any generic enthusiasm or filler phrases
+4. End with concrete qualifications, not expressions of interest
+5. Do not repeat information between paragraphs
+6. Only include company information that was provided in the research section
+7. Do not make assumptions about the company beyond the provided research
+8. Do not include any contact information or signature - this will be added automatically
+
+FORBIDDEN PHRASES AND CONTENT:
+- Any expression of excitement or eagerness
+- Future speculations about the company
+- Unverified company information
+- Generic industry trends
+- Market predictions or analysis
+- References to news not included in the research
+- Generic phrases about company reputation
+- Vague statements about company culture
+- Personal opinions about the company's status or future"""
+
+_CLOSING_INSTRUCTION = "[Write a focused, specific cover letter that demonstrates concrete qualifications while maintaining the specified tone and style.]"
+
+# Identical for every request, so Ollama can reuse its KV cache for this prefix
+_SHARED_PREFIX = f"""Write a professional cover letter using the verified information and guidelines provided below.
+
+{_FORMAT_RULES}
+
+COMPANY INFORMATION RULES:
+- When referencing company information, use ONLY facts from the company research below
+- Do not fabricate or assume additional company information
+- Reference at most one recent company development or news item
+- Focus on matching your experience to the company's verified focus areas
+
+"""
+
+# Options offered by the guideline helpers below
+TONES = ("Professional", "Enthusiastic", "Confident", "Conservative")
+STYLES = ("Standard", "Creative", "Technical", "Executive")
+
 def _get_tone_guidelines(tone: str) -> str:
     """Provides specific guidelines based on the selected tone."""
     guidelines = {
@@ -56,21 +111,86 @@ def _get_style_guidelines(style: str) -> str:
     }
     return guidelines.get(style, guidelines["Standard"])
 
-def get_cover_letter_prompt(
+def _verified_information(sections: Dict[str, str]) -> str:
+    information = f"""VERIFIED INFORMATION:
+1. Education Background:
+{sections['education']}
+
+2. Professional Experience:
+{sections['experience']}
+
+3. Technical Skills:
+{sections['skills']}
+
+4. Portfolio Projects:
+{sections['portfolio']}
+
+5. Company Research:
+{sections['company_research']}
+
+6. Job Details:
+{sections['job_details']}"""
+    if sections.get('supporting_details'):
+        # Only added when there is something to show, so prompts without it are unchanged
+        information += f"""
+
+7. Supporting Details (excerpts from the resume and additional documents most relevant to this job):
+{sections['supporting_details']}"""
+    return information
+
+def _tone_and_style_guidelines(tone: str, style: str) -> str:
+    return f"""For {tone.lower()} tone, this means:
+{_get_tone_guidelines(tone)}
+
+For {style.lower()} style, this means:
+{_get_style_guidelines(style)}"""
+
+def _assemble(layout: str, sections: Dict[str, str], tone: str, style: str) -> Tuple[str, str]:
+    """Lay out the prompt as (static prefix, per-request suffix)."""
+    verified_information = _verified_information(sections)
+
+    if layout == "prefix":
+        suffix = f"""{verified_information}
+
+TONE AND STYLE GUIDELINES:
+- Use a {tone.lower()} tone throughout the letter
+- Follow a {style.lower()} writing style
+
+{_tone_and_style_guidelines(tone, style)}
+
+{_CLOSING_INSTRUCTION}"""
+        return _SHARED_PREFIX, suffix
+
+    if layout == "classic":
+        suffix = f"""Write a professional cover letter using the following verified information and guidelines:
+
+{verified_information}
+
+TONE AND STYLE GUIDELINES:
+- Use a {tone.lower()} tone throughout the letter
+- Follow a {style.lower()} writing style
+- When referencing company information, use ONLY facts from the company research above
+- Do not fabricate or assume additional company information
+- Reference at most one recent company development or news item
+- Focus on matching your experience to the company's verified focus areas
+
+{_tone_and_style_guidelines(tone, style)}
+
+{_FORMAT_RULES}
+
+{_CLOSING_INSTRUCTION}"""
+        return "", suffix
+
+    raise ValueError(f"Unknown prompt layout: {layout}")
+
+def _collect_sections(
     resume_text: str,
     job_description: dict,
-    additional_content: list = None,
-    portfolio_info: str = "",
-    company_research: str = "",
-    tone: str = "Professional",
-    style: str = "Standard",
-    company_name: str = ""
-) -> str:
-    """
-    Generates a prompt for cover letter creation based on provided information and preferences.
-    """
-    print(f"\n[Debug] Processing cover letter for {company_name}")
-    
+    additional_content: list,
+    portfolio_info: str,
+    company_research: str
+) -> Dict[str, str]:
+    """Extract the resume sections and rank supporting chunks; these don't depend on tone or style."""
     # Extract sections from resume
     education_section = resume_text.split('Education')[1].split('Experience')[0] if 'Education' in resume_text else ""
     experience_section = resume_text.split('Experience')[1].split('Projects')[0] if 'Experience' in resume_text else ""
@@ -86,83 +206,180 @@ def get_cover_letter_prompt(
                 skills_parts.append(f"{section} {resume_text.split(section)[1].split(next_section)[0].strip()}")
         skills_section = "\n".join(skills_parts)
     except (IndexError, KeyError):
-        print("[Debug] Could not extract skills section")
-        pass
-
-    # Print debug information
-    print("\n[Debug] Prompt Components:")
-    print(f"Education Section Length: {len(education_section)} chars")
-    print(f"Experience Section Length: {len(experience_section)} chars")
-    print(f"Skills Section Length: {len(skills_section)} chars")
-    print(f"Company Research Length: {len(company_research)} chars")
-    
-    prompt = f"""Write a professional cover letter using the following verified information and guidelines:
+        logger.debug("Could not extract skills section")
 
-VERIFIED INFORMATION:
-1. Education Background:
-{education_section}
+    logger.debug(
+        "Prompt components: education %d chars, experience %d chars, skills %d chars, company research %d chars",
+        len(education_section), len(experience_section), len(skills_section), len(company_research)
+    )
 
-2. Professional Experience:
-{experience_section}
+    # Rank the rest of the resume and the additional documents against the job
+    # (imported here so numpy loads on the first generation, not at app start)
+    from .retrieval import select_relevant_chunks
+    resume_remainder = resume_text
+    for included in (education_section, experience_section):
+        if included.strip():
+            resume_remainder = resume_remainder.replace(included, " ")
+    supporting_chunks = select_relevant_chunks(
+        [resume_remainder] + list(additional_content or []),
+        job_description
+    )
+    logger.debug("Supporting chunks selected: %d", len(supporting_chunks))
 
-3. Technical Skills:
-{skills_section}
+    sections = {
+        'education': education_section,
+        'experience': experience_section,
+        'skills': skills_section,
+        'portfolio': portfolio_info,
+        'company_research': company_research,
+        'job_details': job_description['full_text'],
+        'supporting_details': "\n\n".join(supporting_chunks)
+    }
+    return sections
 
-4. Portfolio Projects:
-{portfolio_info}
+def _fit_sections(sections: Dict[str, str], layout: str, variants: List[Tuple[str, str]], num_ctx: int = None):
+    """Fit the variable sections into the context window left after the fixed instructions.
 
-5. Company Research:
-{company_research}
+    The instructions are measured for every (tone, style) variant and the longest one
+    is reserved, so all variants can share the same fitted sections.
+    """
+    empty_sections = {name: "" for name in sections}
+    empty_sections['supporting_details'] = " " if sections['supporting_details'] else ""
+    fixed_text = max(
+        ("".join(_assemble(layout, empty_sections, tone, style)) for tone, style in variants),
+        key=len
+    )
+    budget = TokenBudget(
+        num_ctx=num_ctx or APP_SETTINGS['num_ctx'],
+        reserve_tokens=PROMPT_SETTINGS['reserve_output_tokens']
+    )
+    fitted, budget_report = budget.fit(
+        [
+            {
+                'name': name,
+                'text': text,
+                'priority': PROMPT_SETTINGS['section_priorities'][name],
+                'min_tokens': PROMPT_SETTINGS['section_min_tokens']
+            }
+            for name, text in sections.items()
+        ],
+        fixed_text=fixed_text
+    )
+    trimmed = [name for name, r in budget_report['sections'].items() if r['trimmed']]
+    if trimmed:
+        logger.debug("Trimmed to fit num_ctx=%d: %s", budget_report['num_ctx'], ", ".join(trimmed))
+    return fitted, budget_report
 
-6. Job Details:
-{job_description['full_text']}
+def build_cover_letter_prompt(
+    resume_text: str,
+    job_description: dict,
+    additional_content: list = None,
+    portfolio_info: str = "",
+    company_research: str = "",
+    tone: str = "Professional",
+    style: str = "Standard",
+    company_name: str = "",
+    layout: str = None,
+    num_ctx: int = None
+) -> Dict:
+    """
+    Builds the cover letter prompt and returns it with its static prefix and per-request suffix.
 
-TONE AND STYLE GUIDELINES:
-- Use a {tone.lower()} tone throughout the letter
-- Follow a {style.lower()} writing style
-- When referencing company information, use ONLY facts from the company research above
-- Do not fabricate or assume additional company information
-- Reference at most one recent company development or news item
-- Focus on matching your experience to the company's verified focus areas
+    The "prefix" layout puts every static instruction first so repeated generations share
+    a long identical prefix that Ollama can keep in its KV cache. The "classic" layout keeps
+    the original order (candidate information first, instructions last).
+    The variable sections are fitted into ``num_ctx`` by priority; ``budget`` reports how.
+    """
+    layout = layout or PROMPT_SETTINGS['layout']
+    with span('prompt_build', layout=layout, variants=1) as attributes:
+        sections = _collect_sections(resume_text, job_description, additional_content, portfolio_info, company_research)
+        sections, budget_report = _fit_sections(sections, layout, [(tone, style)], num_ctx)
 
-For {tone.lower()} tone, this means:
-{_get_tone_guidelines(tone)}
+        prefix, suffix = _assemble(layout, sections, tone, style)
+        prompt = prefix + suffix
+        attributes['prompt_tokens'] = budget_report['prompt_tokens']
 
-For {style.lower()} style, this means:
-{_get_style_guidelines(style)}
+    logger.debug("Prompt for %s: tone=%s, style=%s, layout=%s, %d chars",
+                 company_name, tone, style, layout, len(prompt))
+    
+    return {
+        'prompt': prompt,
+        'prefix': prefix,
+        'suffix': suffix,
+        'layout': layout,
+        'budget': budget_report
+    }
 
-REQUIRED FORMAT:
-Note: Do not include any address or greeting - these will be added automatically.
-1. First paragraph (2-3 sentences): Briefly introduce your educational background and ONE specific reason for interest based on the company research
-2. Body paragraphs (2-3 paragraphs, each 3-4 sentences): Focus on your most relevant experiences that match the job requirements
-3. Final paragraph (2-3 sentences): Summarize your key qualifications that match the role requirements
+def build_variant_prompts(
+    variants: List[Tuple[str, str]],
+    resume_text: str,
+    job_description: dict,
+    additional_content: list = None,
+    portfolio_info: str = "",
+    company_research: str = "",
+    company_name: str = "",
+    layout: str = None,
+    num_ctx: int = None
+) -> Dict:
+    """
+    Builds one prompt per (tone, style) pair from a single set of fitted sections.
 
-STRICT RULES:
-1. Keep the letter concise - maximum 5 paragraphs total
-2. Focus only on experiences and skills that directly match the job requirements
-3. Do not use any generic enthusiasm or filler phrases
-4. End with concrete qualifications, not expressions of interest
-5. Do not repeat information between paragraphs
-6. Only include company information that was provided in the research section
-7. Do not make assumptions about the company beyond the provided research
-8. Do not include any contact information or signature - this will be added automatically
+    Every variant shares the same instructions and candidate information, so the prompts
+    differ only in their tone and style guidelines near the end. ``shared_prefix`` is the
+    text they all start with, which the server can evaluate once and reuse.
+    """
+    layout = layout or PROMPT_SETTINGS['layout']
+    for tone, style in variants:
+        if tone not in TONES or style not in STYLES:
+            raise ValueError(f"Unknown variant: tone={tone!r}, style={style!r}")
+    logger.debug("Building %d cover letter variants for %s", len(variants), company_name)
 
-FORBIDDEN PHRASES AND CONTENT:
-- Any expression of excitement or eagerness
-- Future speculations about the company
-- Unverified company information
-- Generic industry trends
-- Market predictions or analysis
-- References to news not included in the research
-- Generic phrases about company reputation
-- Vague statements about company culture
-- Personal opinions about the company's status or future
+    with span('prompt_build', layout=layout, variants=len(variants)) as attributes:
+        sections = _collect_sections(resume_text, job_description, additional_content, portfolio_info, company_research)
+        sections, budget_report = _fit_sections(sections, layout, variants, num_ctx)
 
-[Write a focused, specific cover letter that demonstrates concrete qualifications while maintaining the specified tone and style.]"""
+        prompts = []
+        for tone, style in variants:
+            prefix, suffix = _assemble(layout, sections, tone, style)
+            prompts.append({'tone': tone, 'style': style, 'prompt': prefix + suffix, 'prefix': prefix, 'suffix': suffix})
 
-    print("\n[Debug] Prompt Generated:")
-    print(f"Tone: {tone}")
-    print(f"Style: {style}")
-    print(f"Prompt Length: {len(prompt)} chars")
-    
-    return prompt
\ No newline at end of file
+        # Cut at a line break so the shared text ends on a token boundary
+        shared_prefix = os.path.commonprefix([p['prompt'] for p in prompts])
+        if len(prompts) > 1:
+            shared_prefix = shared_prefix[:shared_prefix.rfind('\n') + 1]
+        attributes['prompt_tokens'] = budget_report['prompt_tokens']
+
+    return {
+        'variants': prompts,
+        'shared_prefix': shared_prefix,
+        'layout': layout,
+        'budget': budget_report
+    }
+
+def get_cover_letter_prompt(
+    resume_text: str,
+    job_description: dict,
+    additional_content: list = None,
+    portfolio_info: str = "",
+    company_research: str = "",
+    tone: str = "Professional",
+    style: str = "Standard",
+    company_name: str = "",
+    layout: str = None,
+    num_ctx: int = None
+) -> str:
+    """
+    Generates a prompt for cover letter creation based on provided information and preferences.
+    """
+    return build_cover_letter_prompt(
+        resume_text=resume_text,
+        job_description=job_description,
+        additional_content=additional_content,
+        portfolio_info=portfolio_info,
+        company_research=company_research,
+        tone=tone,
+        style=style,
+        company_name=company_name,
+        layout=layout,
+        num_ctx=num_ctx
+    )['prompt']
@@ -0,0 +1,344 @@
+import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from config import QA_SETTINGS
+
+# Stock phrases language models reach for; matched case-insensitively on word boundaries
+AI_PATTERNS = (
+    "i am writing to express my interest",
+    "i am writing to apply",
+    "i am writing to express my enthusiasm",
+    "i am excited to apply",
+    "i am thrilled to apply",
+    "i am eager to apply",
+    "i was thrilled to see",
+    "i was excited to see",
+    "i am confident that my",
+    "i am confident that i",
+    "i believe i would be a great fit",
+    "i would be a great fit",
+    "would make me a valuable asset",
+    "a valuable asset to your team",
+    "align perfectly with",
+    "aligns perfectly with",
+    "aligns seamlessly with",
+    "perfectly positions me",
+    "uniquely positions me",
+    "uniquely qualified",
+    "unique blend of",
+    "a testament to",
+    "delve into",
+    "delving into",
+    "in today's fast-paced",
+    "in today's rapidly evolving",
+    "in the ever-evolving",
+    "ever-evolving landscape",
+    "rapidly evolving landscape",
+    "navigate the complexities",
+    "rich tapestry",
+    "tapestry of",
+    "leverage my skills",
+    "leverage my expertise",
+    "leverage my experience",
+    "harness the power of",
+    "eager to contribute",
+    "contribute to your esteemed",
+    "your esteemed organization",
+    "esteemed company",
+    "make a meaningful impact",
+    "make a significant impact",
+    "drive meaningful change",
+    "i am particularly drawn to",
+    "resonates deeply with me",
+    "deeply resonates with me",
+    "resonates with my",
+    "what truly excites me",
+    "i am passionate about leveraging",
+    "fostering a culture of",
+    "commitment to excellence",
+    "thank you for considering my application",
+    "thank you for your time and consideration",
+    "i look forward to the opportunity to discuss",
+    "i look forward to the possibility of",
+    "please do not hesitate to contact me",
+    "do not hesitate to reach out",
+    "further my career",
+    "embark on this journey",
+    "in conclusion",
+    "furthermore",
+    "moreover",
+    "additionally",
+)
+
+# Overused résumé language that says little about the candidate
+CLICHES = (
+    "detail-oriented",
+    "detail oriented",
+    "team player",
+    "hard worker",
+    "hard-working",
+    "hardworking",
+    "self-starter",
+    "self starter",
+    "go-getter",
+    "results-driven",
+    "results-oriented",
+    "goal-oriented",
+    "think outside the box",
+    "thinking outside the box",
+    "outside-the-box",
+    "proven track record",
+    "track record of success",
+    "strong work ethic",
+    "excellent communication skills",
+    "strong communication skills",
+    "excellent interpersonal skills",
+    "people person",
+    "fast learner",
+    "quick learner",
+    "fast-paced environment",
+    "fast paced environment",
+    "works well under pressure",
+    "thrive under pressure",
+    "thrive in a fast-paced",
+    "go above and beyond",
+    "going above and beyond",
+    "hit the ground running",
+    "wear many hats",
+    "wore many hats",
+    "synergy",
+    "synergies",
+    "value-add",
+    "best of breed",
+    "best-in-class",
+    "cutting-edge",
+    "cutting edge",
+    "game changer",
+    "game-changer",
+    "win-win",
+    "move the needle",
+    "low-hanging fruit",
+    "at the end of the day",
+    "perfectionist",
+    "dynamic individual",
+    "highly motivated",
+    "self-motivated",
+    "passionate about",
+    "dedicated professional",
+    "seasoned professional",
+    "motivated professional",
+    "ideal candidate",
+    "perfect candidate",
+    "perfect fit",
+    "great fit",
+    "dream job",
+    "to whom it may concern",
+    "my name is",
+)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+_SENTENCE_END_PATTERN = re.compile(r'[.!?]+(?=\s|$)')
+_VOWEL_GROUP_PATTERN = re.compile(r'[aeiouy]+')
+_QUOTE_TABLE = str.maketrans({'’': "'", '‘': "'", '‐': '-', '‑': '-', '–': '-'})
+
+_default_checker = None
+_default_checker_lock = threading.Lock()
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, unify quotes and hyphens and collapse whitespace so phrases match across line breaks."""
+    return _WHITESPACE_PATTERN.sub(' ', text.translate(_QUOTE_TABLE).lower())
+
+
+class PhraseMatcher:
+    """Aho–Corasick automaton that finds every occurrence of many phrases in one pass over the text.
+
+    The failure links are folded into a full transition table when the automaton
+    is built, so scanning is one dict lookup per character whatever the number of
+    phrases. Characters that appear in no phrase send the scan back to the root.
+    Matches must start and end on word boundaries ("dynamic" does not match
+    "dynamically").
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]]):
+        """``phrases`` are (label, phrase) pairs; the label is reported with each match."""
+        self._transitions = [{}]
+        self._outputs = [[]]
+        self._patterns = []
+        for label, phrase in phrases:
+            phrase = _normalize(phrase).strip()
+            if phrase:
+                self._add(len(self._patterns), phrase)
+                self._patterns.append((label, phrase))
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _add(self, pattern_id: int, phrase: str):
+        state = 0
+        for char in phrase:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(pattern_id)
+
+    def _build(self):
+        """Breadth-first pass that sets failure links and completes the transition table."""
+        # Depth-one states fail to the root; every shallower state is complete by the time it is used
+        fail = [0] * len(self._transitions)
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            own = self._transitions[state]
+            fallback = self._transitions[fail[state]]
+            for char, next_state in own.items():
+                if state:
+                    fail[next_state] = fallback.get(char, 0)
+                    self._outputs[next_state] = self._outputs[next_state] + self._outputs[fail[next_state]]
+                queue.append(next_state)
+            if state:
+                # Inherit the failure state's moves, then let this state's own edges override them
+                self._transitions[state] = dict(fallback, **own)
+
+    def find(self, text: str) -> List[Tuple[str, str, int]]:
+        """Return (label, phrase, start) for each whole-word match, in order of their end position."""
+        text = _normalize(text)
+        transitions, outputs, patterns = self._transitions, self._outputs, self._patterns
+        matches = []
+        state = 0
+        for end, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for pattern_id in outputs[state]:
+                    label, phrase = patterns[pattern_id]
+                    start = end - len(phrase) + 1
+                    if start > 0 and text[start - 1].isalnum():
+                        continue
+                    if end + 1 < len(text) and text[end + 1].isalnum():
+                        continue
+                    matches.append((label, phrase, start))
+        return matches
+
+
+@lru_cache(maxsize=8192)
+def count_syllables(word: str) -> int:
+    """Estimate syllables from vowel groups, with the usual silent-e and -le adjustments."""
+    word = word.lower()
+    count = len(_VOWEL_GROUP_PATTERN.findall(word))
+    if word.endswith('e') and not word.endswith(('le', 'ee', 'ye')) and count > 1:
+        count -= 1
+    return max(count, 1)
+
+
+def flesch_reading_ease(text: str) -> float:
+    """Flesch Reading Ease in one pass over the words; higher is easier (60-70 is plain English)."""
+    words = 0
+    syllables = 0
+    for match in _WORD_PATTERN.finditer(text):
+        words += 1
+        syllables += count_syllables(match.group())
+    if not words:
+        return 0.0
+    sentences = max(len(_SENTENCE_END_PATTERN.findall(text)), 1)
+    return round(206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words), 2)
+
+
+class QualityChecker:
+    """Flags AI-sounding phrasing and clichés and checks readability and length against QA_SETTINGS."""
+
+    def __init__(self, ai_patterns: Sequence[str] = AI_PATTERNS, cliches: Sequence[str] = CLICHES):
+        self.ai_patterns = tuple(ai_patterns)
+        self.cliches = tuple(cliches)
+        self.matcher = PhraseMatcher(
+            [('ai_pattern', phrase) for phrase in self.ai_patterns] +
+            [('cliche', phrase) for phrase in self.cliches]
+        )
+
+    def __reduce__(self):
+        # Worker processes rebuild the automaton from the phrase lists instead of unpickling it
+        return (QualityChecker, (self.ai_patterns, self.cliches))
+
+    def analyze_cover_letter(self, text: str) -> Dict:
+        """Score one letter.
+
+        Returns the distinct AI patterns and clichés found (in order of appearance),
+        the Flesch readability score, the word count, suggestions for every check
+        that failed and ``passed`` when there are none.
+        """
+        found = {'ai_pattern': [], 'cliche': []}
+        for label, phrase, _ in self.matcher.find(text):
+            if phrase not in found[label]:
+                found[label].append(phrase)
+
+        readability = flesch_reading_ease(text)
+        word_count = sum(1 for _ in _WORD_PATTERN.finditer(text))
+        suggestions = []
+        if found['ai_pattern']:
+            suggestions.append(
+                "Rewrite generic, AI-sounding phrasing in your own words: " + ", ".join(found['ai_pattern'])
+            )
+        if found['cliche']:
+            suggestions.append(
+                "Replace clichés with a concrete example or result: " + ", ".join(found['cliche'])
+            )
+        if readability < QA_SETTINGS['min_readability_score']:
+            suggestions.append(
+                f"Readability is {readability:.0f} (target {QA_SETTINGS['min_readability_score']}-"
+                f"{QA_SETTINGS['max_readability_score']}); use shorter sentences and simpler words"
+            )
+        elif readability > QA_SETTINGS['max_readability_score']:
+            suggestions.append(
+                f"Readability is {readability:.0f} (target {QA_SETTINGS['min_readability_score']}-"
+                f"{QA_SETTINGS['max_readability_score']}); the letter may read as too simple for the role"
+            )
+        if word_count < QA_SETTINGS['min_letter_length']:
+            suggestions.append(
+                f"The letter is {word_count} words; aim for at least {QA_SETTINGS['min_letter_length']}"
+            )
+        elif word_count > QA_SETTINGS['max_letter_length']:
+            suggestions.append(
+                f"The letter is {word_count} words; trim it to at most {QA_SETTINGS['max_letter_length']}"
+            )
+
+        return {
+            'ai_patterns_detected': found['ai_pattern'],
+            'cliches_found': found['cliche'],
+            'readability_score': readability,
+            'word_count': word_count,
+            'suggestions': suggestions,
+            'passed': not suggestions
+        }
+
+    def analyze_batch(self, letters: Sequence[str], max_workers: Optional[int] = None) -> List[Dict]:
+        """Score many letters, in input order.
+
+        Large batches are spread across a process pool (the matcher is pure Python,
+        so threads would serialize on the GIL); small ones run inline, where the
+        pool's start-up would cost more than it saves.
+        """
+        letters = list(letters)
+        workers = max_workers or QA_SETTINGS['batch_workers']
+        if workers <= 1 or len(letters) < QA_SETTINGS['parallel_batch_threshold']:
+            return [self.analyze_cover_letter(letter) for letter in letters]
+
+        chunksize = max(1, len(letters) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.analyze_cover_letter, letters, chunksize=chunksize))
+
+
+def get_quality_checker() -> QualityChecker:
+    """Process-wide checker with the default phrase lists; the automaton is built once."""
+    global _default_checker
+    with _default_checker_lock:
+        if _default_checker is None:
+            _default_checker = QualityChecker()
+        return _default_checker
@@ -1,130 +1,280 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List
-import json
-from datetime import datetime
-import re
-import nltk
-from config import RESEARCH_SETTINGS
-import os
+import logging
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+from config import RESEARCH_SETTINGS
+from .deadlines import deadline, remaining
+from .http_client import get_session, default_timeout
+from .scraping import scrape_texts
+from .research_store import ResearchStore, normalize_company_key
+from .telemetry import get_registry, span
 
-class CompanyResearchAgent:
-    def __init__(self):
+# Shared by every agent in the process so concurrent sessions asking for the
+# same company trigger a single fetch
+_refresh_pool = None
+_refresh_pool_lock = threading.Lock()
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_source_pool = None
+_source_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _get_refresh_pool() -> ThreadPoolExecutor:
+    global _refresh_pool
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(
+                max_workers=RESEARCH_SETTINGS['refresh_workers'],
+                thread_name_prefix='research'
+            )
+        return _refresh_pool
+
+
+def _get_source_pool() -> ThreadPoolExecutor:
+    """Pool for individual research sources; separate from the refresh pool so nested submits can't deadlock."""
+    global _source_pool
+    with _source_pool_lock:
+        if _source_pool is None:
+            _source_pool = ThreadPoolExecutor(
+                max_workers=RESEARCH_SETTINGS['source_workers'],
+                thread_name_prefix='research-source'
+            )
+        return _source_pool
+
+
+def _timed_source(fetch: Callable[[str], Dict], company_name: str):
+    """Run one source; returns (result, latency, error) so failures are timed like successes.
+
+    The source runs under the research deadline, so its HTTP calls and retries stop
+    when the fetch stops waiting for it instead of holding a source worker.
+    """
+    start = time.perf_counter()
+    try:
+        with deadline(RESEARCH_SETTINGS['research_deadline']):
+            result = fetch(company_name)
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+    return result, time.perf_counter() - start, None
+
+
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+
+def _ensure_punkt():
+    """Locate (or download) the punkt tokenizer once per process rather than per agent."""
+    global _nltk_ready
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        import nltk
         try:
-            nltk.data.find('punkt')
+            nltk.data.find('tokenizers/punkt')
         except LookupError:
-            nltk.download('punkt')
+            nltk.download('punkt', quiet=True)
+        _nltk_ready = True
+
+
+class CompanyResearchAgent:
+    def __init__(self):
+        _ensure_punkt()
         
         self.headers = {'User-Agent': RESEARCH_SETTINGS['user_agent']}
-        self.cache_dir = RESEARCH_SETTINGS['cache_dir']
-        os.makedirs(self.cache_dir, exist_ok=True)
+        self.session = get_session()
+        self.store = ResearchStore()
+        # Each source returns a dict of research fields and raises on failure; all run
+        # concurrently under one deadline. Sources without credentials are not registered.
+        self.sources = {}
+        self.register_source('company_info', self._get_company_info)
+        if RESEARCH_SETTINGS['news_api_key']:
+            self.register_source('news', lambda company_name: {'recent_news': self._get_company_news(company_name)})
+
+    def register_source(self, name: str, fetch: Callable[[str], Dict]):
+        """Add a research source. Results are merged in registration order."""
+        self.sources[name] = fetch
 
     def research_company(self, company_name: str) -> Dict:
-        """Research company using web scraping and news API."""
-        print(f"\n[Research] Starting research for company: {company_name}")
-        cache_file = os.path.join(self.cache_dir, f"{company_name.lower().replace(' ', '_')}.json")
-        
+        """Research company using web scraping and news API.
+
+        Fresh cache entries are returned directly. Stale entries younger than
+        ``max_stale_age`` are returned immediately while one background refresh
+        runs; anything older (or missing) is fetched synchronously.
+        """
+        logger.info("Starting research for company: %s", company_name)
+        lookups = get_registry().counter('research_cache_lookups_total', "Research cache lookups by result", ('result',))
+
         # Check cache
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                if time.time() - data['timestamp'] < RESEARCH_SETTINGS['cache_expiration']:
-                    print("[Research] Using cached data")
-                    return data['content']
+        cached = self.store.get(company_name)
+        now = time.time()
+        if cached:
+            if cached['expires_at'] > now:
+                logger.info("Using cached research for %s", company_name)
+                lookups.inc(result='fresh')
+                return cached['content']
+            if now - cached['fetched_at'] < RESEARCH_SETTINGS['max_stale_age']:
+                logger.info("Using stale research for %s, refreshing in background", company_name)
+                lookups.inc(result='stale')
+                self._submit_fetch(company_name)
+                return cached['content']
 
-        try:
-            # Get company info from website first
-            company_info = self._get_company_info(company_name)
-            print("[Research] Company info retrieved")
+        lookups.inc(result='miss')
+        # A caller's deadline ends the wait, not the shared fetch, which still fills the cache
+        return self._submit_fetch(company_name).result(timeout=remaining())
+
+    def _submit_fetch(self, company_name: str) -> Future:
+        """Start a fetch for the company unless one is already in flight (across all sessions)."""
+        key = normalize_company_key(company_name)
+        with _in_flight_lock:
+            future = _in_flight.get(key)
+            if future is not None:
+                return future
+            future = _get_refresh_pool().submit(self._fetch_and_store, company_name)
+            _in_flight[key] = future
+
+        def _forget(done: Future):
+            with _in_flight_lock:
+                if _in_flight.get(key) is done:
+                    del _in_flight[key]
 
-            # Get company news
-            news = self._get_company_news(company_name)
-            print(f"[Research] News articles retrieved: {len(news)}")
+        future.add_done_callback(_forget)
+        return future
 
+    def _fetch_and_store(self, company_name: str) -> Dict:
+        """Fetch fresh research and cache it.
+
+        Companies no source knows anything about get the fallback data, cached for
+        ``empty_cache_expiration`` unless research is already stored for them. When
+        sources fail or time out, or on unexpected failures, it is returned uncached.
+        """
+        try:
             research = {
                 'company_name': company_name,
-                'overview': company_info.get('overview', ''),
-                'recent_news': news,
-                'values': company_info.get('values', []),
-                'focus_areas': company_info.get('focus_areas', []),
+                'overview': '',
+                'recent_news': [],
+                'values': [],
+                'focus_areas': [],
                 'error': None
             }
+            results, source_stats = self._fetch_sources(company_name)
+            research['sources'] = source_stats
+
+            if not results:
+                logger.info("No research found for %s: %s", company_name, source_stats)
+                research = self._get_fallback_data(company_name, f"No research source returned data: {source_stats}")
+                research['sources'] = source_stats
+                # Negative-cache companies nothing is known about, so they aren't re-fetched on every call.
+                # A failed source proves nothing, and stale research beats the generic fallback.
+                if all(stats['status'] == 'empty' for stats in source_stats.values()):
+                    existing = self.store.get(company_name)
+                    if existing is None or existing['content'].get('error'):
+                        self.store.put(company_name, research, RESEARCH_SETTINGS['empty_cache_expiration'])
+                return research
+            for name in self.sources:
+                if name in results:
+                    research.update({field: value for field, value in results[name].items() if value})
+            logger.info("Research sources used for %s: %s", company_name, ", ".join(results))
 
-            # Cache the results
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'timestamp': time.time(),
-                    'content': research
-                }, f)
+            # Results missing a failed or late source are cached briefly so it gets another chance soon
+            complete = all(stats['status'] in ('ok', 'empty') for stats in source_stats.values())
+            ttl = RESEARCH_SETTINGS['cache_expiration'] if complete else RESEARCH_SETTINGS['partial_cache_expiration']
+            self.store.put(company_name, research, ttl)
 
             return research
 
         except Exception as e:
-            print(f"[Research] Error occurred: {str(e)}")
+            logger.warning("Research for %s failed: %s", company_name, e)
             return self._get_fallback_data(company_name, str(e))
 
+    def _fetch_sources(self, company_name: str):
+        """Run every source concurrently and keep whatever finishes before the deadline.
+
+        Returns (results by source name, per-source status and latency).
+        """
+        time_limit = RESEARCH_SETTINGS['research_deadline']
+        pool = _get_source_pool()
+        futures = {
+            name: pool.submit(_timed_source, fetch, company_name)
+            for name, fetch in self.sources.items()
+        }
+        wait(futures.values(), timeout=time_limit)
+
+        results = {}
+        stats = {}
+        source_duration = get_registry().histogram(
+            'research_source_duration_seconds', "Latency of each research source", ('source', 'status')
+        )
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                stats[name] = {'status': 'timeout', 'latency': time_limit}
+                source_duration.observe(time_limit, source=name, status='timeout')
+                continue
+            result, latency, error = future.result()
+            if error is not None:
+                stats[name] = {'status': 'error', 'latency': latency, 'error': str(error)}
+                logger.warning("Research source %s failed for %s: %s", name, company_name, error)
+            elif result and any(result.values()):
+                results[name] = result
+                stats[name] = {'status': 'ok', 'latency': latency}
+            else:
+                stats[name] = {'status': 'empty', 'latency': latency}
+            source_duration.observe(latency, source=name, status=stats[name]['status'])
+            logger.debug("Research source %s: %s in %.2fs", name, stats[name]['status'], latency)
+        return results, stats
+
     def _get_company_news(self, company_name: str) -> List[Dict]:
         """Get company news from NewsAPI."""
-        try:
-            url = 'https://newsapi.org/v2/everything'
-            params = {
-                'q': company_name,
-                'sortBy': 'publishedAt',
-                'apiKey': RESEARCH_SETTINGS['news_api_key'],
-                'language': 'en',
-                'pageSize': RESEARCH_SETTINGS['max_news_results']
-            }
-            print("[Research] Requesting news articles")
-            response = requests.get(url, params=params)
-            
-            if response.status_code == 200:
-                news_data = response.json()
-                if news_data.get('articles'):
-                    articles = []
-                    for article in news_data['articles'][:3]:
-                        if article.get('title') and article.get('description'):
-                            articles.append({
-                                'title': article['title'],
-                                'summary': article['description'],
-                                'date': article['publishedAt']
-                            })
-                    print(f"[Research] Found {len(articles)} relevant news articles")
-                    return articles
-        except Exception as e:
-            print(f"[Research] Error fetching news: {str(e)}")
-        return []
+        url = 'https://newsapi.org/v2/everything'
+        params = {
+            'q': company_name,
+            'sortBy': 'publishedAt',
+            'apiKey': RESEARCH_SETTINGS['news_api_key'],
+            'language': 'en',
+            'pageSize': RESEARCH_SETTINGS['max_news_results']
+        }
+        response = self.session.get(
+            url, params=params, timeout=default_timeout(RESEARCH_SETTINGS['research_deadline'])
+        )
+        response.raise_for_status()
+
+        articles = []
+        for article in response.json().get('articles', [])[:3]:
+            if article.get('title') and article.get('description'):
+                articles.append({
+                    'title': article['title'],
+                    'summary': article['description'],
+                    'date': article['publishedAt']
+                })
+        logger.debug("Found %d relevant news articles", len(articles))
+        return articles
 
     def _get_company_info(self, company_name: str) -> Dict:
         """Get company information through web search and scraping."""
-        try:
-            search_url = f"https://www.google.com/search?q={company_name}+company+about"
-            response = requests.get(search_url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            company_info = {
-                'overview': '',
-                'values': [],
-                'focus_areas': []
-            }
+        search_url = f"https://www.google.com/search?q={company_name}+company+about"
+        # Only the first long search-result snippet is needed, so stop parsing there
+        descriptions = scrape_texts(
+            self.session, search_url, 'div', 'BNeawe', limit=1,
+            accept=lambda text: len(text) > 100,  # Likely a meaningful description
+            headers=self.headers, timeout=default_timeout(RESEARCH_SETTINGS['research_deadline'])
+        )
+        if descriptions is None:
+            raise Exception(f"Company search for {company_name} returned an error response")
 
-            # Extract from search results directly
-            for result in soup.find_all('div', class_='BNeawe'):
-                text = result.get_text()
-                if len(text) > 100:  # Likely a meaningful description
-                    company_info['overview'] = text
-                    break
-
-            print(f"[Research] Company overview length: {len(company_info['overview'])}")
-            return company_info
+        company_info = {
+            'overview': descriptions[0] if descriptions else '',
+            'values': [],
+            'focus_areas': []
+        }
 
-        except Exception as e:
-            print(f"[Research] Error scraping company info: {str(e)}")
-            return {}
+        logger.debug("Company overview length: %d", len(company_info['overview']))
+        return company_info
 
     def _get_fallback_data(self, company_name: str, error: str = None) -> Dict:
         """Provide fallback data when research fails."""
-        print("[Research] Using fallback data")
+        logger.info("Using fallback research data for %s", company_name)
         return {
             'company_name': company_name,
             'overview': f"{company_name} is a company focused on innovation and technology solutions.",
@@ -136,30 +286,25 @@ class CompanyResearchAgent:
 
     def get_structured_research(self, company_name: str) -> str:
         """Format research results for the cover letter."""
-        print(f"\n[Research] Formatting research for {company_name}")
-        research = self.research_company(company_name)
+        with span('research', company=company_name):
+            research = self.research_company(company_name)
         
         sections = []
         
         if research.get('overview'):
             sections.append(f"Company Overview: {research['overview']}")
-            print(f"[Research] Overview added ({len(research['overview'])} chars)")
         
         if research.get('values'):
             sections.append(f"Company Values: {', '.join(research['values'])}")
-            print(f"[Research] Values added: {research['values']}")
         
         if research.get('focus_areas'):
             sections.append(f"Focus Areas: {', '.join(research['focus_areas'])}")
-            print(f"[Research] Focus areas added: {research['focus_areas']}")
         
         if research.get('recent_news'):
             latest_news = research['recent_news'][0]
             sections.append(f"Recent Development: {latest_news['title']}")
-            print(f"[Research] Latest news added: {latest_news['title']}")
         
         formatted_research = "\n\n".join(sections)
-        print("\n[Research] Final formatted research:")
-        print(formatted_research)
+        logger.debug("Formatted research for %s:\n%s", company_name, formatted_research)
         
         return formatted_research
\ No newline at end of file
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+from config import RESEARCH_SETTINGS
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_LEGAL_SUFFIXES = frozenset([
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'lp', 'llp'
+])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research (
+    key TEXT PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    content TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_research_expires_at ON research (expires_at);
+CREATE INDEX IF NOT EXISTS idx_research_fetched_at ON research (fetched_at);
+"""
+
+# Never let an older fetch overwrite a newer one written by another session
+_UPSERT = """
+INSERT INTO research (key, company_name, content, fetched_at, expires_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    company_name = excluded.company_name,
+    content = excluded.content,
+    fetched_at = excluded.fetched_at,
+    expires_at = excluded.expires_at
+WHERE excluded.fetched_at >= research.fetched_at
+"""
+
+
+def normalize_company_key(company_name: str) -> str:
+    """Canonical cache key: 'Acme, Inc.' / 'ACME Inc' / 'acme' all map to 'acme'."""
+    text = unicodedata.normalize('NFKC', company_name).casefold().replace('&', ' and ')
+    words = _NON_ALNUM.sub(' ', text).split()
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+class ResearchStore:
+    """Company research cache in a single SQLite database (WAL mode).
+
+    Safe to share across threads and Streamlit sessions: each thread gets its own
+    connection, writes are atomic upserts, and readers never block the writer.
+    """
+
+    def __init__(self, db_path: str = None, max_entries: int = None, size_check_interval: int = None):
+        self.db_path = db_path or RESEARCH_SETTINGS['store_path']
+        self.max_entries = max_entries or RESEARCH_SETTINGS['max_cached_companies']
+        self.size_check_interval = size_check_interval or RESEARCH_SETTINGS['size_check_interval']
+        self._writes_since_check = 0
+        self._writes_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, company_name: str) -> Optional[Dict]:
+        """Return {'content', 'fetched_at', 'expires_at'} for a company, expired or not."""
+        row = self._connection().execute(
+            'SELECT content, fetched_at, expires_at FROM research WHERE key = ?',
+            (normalize_company_key(company_name),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'content': json.loads(row[0]), 'fetched_at': row[1], 'expires_at': row[2]}
+
+    def put(self, company_name: str, content: Dict, ttl: float, fetched_at: float = None):
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        connection = self._connection()
+        connection.execute(_UPSERT, (
+            normalize_company_key(company_name),
+            company_name,
+            json.dumps(content),
+            fetched_at,
+            fetched_at + ttl
+        ))
+        # Counting rows is a full scan, so the cap is checked every few writes rather than on each
+        with self._writes_lock:
+            self._writes_since_check += 1
+            check = self._writes_since_check >= self.size_check_interval
+            if check:
+                self._writes_since_check = 0
+        if check:
+            self._enforce_size_cap(connection)
+
+    def purge_expired(self, grace: float = 0) -> int:
+        """Delete entries that expired more than ``grace`` seconds ago."""
+        cursor = self._connection().execute(
+            'DELETE FROM research WHERE expires_at < ?', (time.time() - grace,)
+        )
+        return cursor.rowcount
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM research').fetchone()[0]
+
+    def _enforce_size_cap(self, connection: sqlite3.Connection):
+        overflow = self.count() - self.max_entries
+        if overflow > 0:
+            # Oldest fetches go first
+            connection.execute(
+                'DELETE FROM research WHERE key IN (SELECT key FROM research ORDER BY fetched_at LIMIT ?)',
+                (overflow,)
+            )
+
+    def export_jsonl(self, path: str) -> int:
+        """Write every entry to a JSONL file; returns the number of rows written."""
+        rows = self._connection().execute(
+            'SELECT company_name, content, fetched_at, expires_at FROM research ORDER BY key'
+        )
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for company_name, content, fetched_at, expires_at in rows:
+                f.write(json.dumps({
+                    'company_name': company_name,
+                    'content': json.loads(content),
+                    'fetched_at': fetched_at,
+                    'expires_at': expires_at
+                }) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, path: str) -> int:
+        """Upsert entries from an export file in one transaction; newer fetches win."""
+        connection = self._connection()
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    connection.execute(_UPSERT, (
+                        normalize_company_key(entry['company_name']),
+                        entry['company_name'],
+                        json.dumps(entry['content']),
+                        entry['fetched_at'],
+                        entry['expires_at']
+                    ))
+                    count += 1
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        self._enforce_size_cap(connection)
+        return count
+
+    def import_legacy_cache(self, cache_dir: str, ttl: float = None) -> int:
+        """Migrate the old per-company cache/<name>.json files into the store."""
+        ttl = ttl if ttl is not None else RESEARCH_SETTINGS['cache_expiration']
+        count = 0
+        for name in os.listdir(cache_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(cache_dir, name), 'r') as f:
+                    data = json.load(f)
+                content = data['content']
+                company_name = content.get('company_name') or name[:-len('.json')].replace('_', ' ')
+                self.put(company_name, content, ttl, fetched_at=data['timestamp'])
+                count += 1
+            except (OSError, ValueError, KeyError, AttributeError):
+                continue
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk export/import for the company research store.")
+    parser.add_argument('command', choices=['export', 'import', 'import-legacy', 'purge'])
+    parser.add_argument('path', nargs='?', help="JSONL file (export/import) or legacy cache directory")
+    args = parser.parse_args()
+
+    store = ResearchStore()
+    if args.command == 'export':
+        print(f"Exported {store.export_jsonl(args.path)} companies")
+    elif args.command == 'import':
+        print(f"Imported {store.import_jsonl(args.path)} companies")
+    elif args.command == 'import-legacy':
+        print(f"Migrated {store.import_legacy_cache(args.path or RESEARCH_SETTINGS['cache_dir'])} companies")
+    else:
+        print(f"Purged {store.purge_expired()} expired companies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import re
+import threading
+from typing import Dict, List, Tuple
+import numpy as np
+from config import DOC_SETTINGS, RETRIEVAL_SETTINGS
+from .text_splitter import RecursiveTextSplitter
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each for from had has have having he her here hers him his how i if in into is it its
+itself just me more most my no nor not of off on once only or other our ours out over own same she
+should so some such than that the their theirs them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+_splitter = None
+_splitter_lock = threading.Lock()
+
+
+def _get_splitter() -> RecursiveTextSplitter:
+    global _splitter
+    with _splitter_lock:
+        if _splitter is None:
+            _splitter = RecursiveTextSplitter(
+                chunk_size=DOC_SETTINGS['chunk_size'],
+                chunk_overlap=DOC_SETTINGS['chunk_overlap']
+            )
+        return _splitter
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords (keeps terms like c++ and c#)."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a small set of chunks, scored with dense NumPy arrays."""
+
+    def __init__(self, chunks: List[str], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.vocabulary = {}
+        rows, cols = [], []
+        for row, chunk in enumerate(chunks):
+            for token in tokenize(chunk):
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+
+        term_frequencies = np.zeros((len(chunks), len(self.vocabulary)), dtype=np.float32)
+        np.add.at(term_frequencies, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+
+        lengths = term_frequencies.sum(axis=1)
+        average_length = lengths.mean() if len(chunks) else 0.0
+        document_frequency = (term_frequencies > 0).sum(axis=0)
+        self.idf = np.log1p((len(chunks) - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+        # Precompute the BM25 term weights so a query is a single column gather and sum
+        norm = k1 * (1 - b + b * lengths / average_length) if average_length else np.full(len(chunks), k1)
+        self.weights = term_frequencies * (k1 + 1) / (term_frequencies + norm[:, None])
+
+    def score(self, query: str) -> np.ndarray:
+        columns = [self.vocabulary[token] for token in set(tokenize(query)) if token in self.vocabulary]
+        if not columns:
+            return np.zeros(len(self.chunks), dtype=np.float32)
+        columns = np.array(columns, dtype=np.intp)
+        return self.weights[:, columns] @ self.idf[columns]
+
+    def top_k(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Indices and scores of the k best matching chunks (positive scores only), best first."""
+        if not self.chunks or k <= 0:
+            return []
+        scores = self.score(query)
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(i), float(scores[i])) for i in ranked if scores[i] > 0]
+
+
+def build_query(job_description: Dict) -> str:
+    """Query text from the extracted requirements and skills, falling back to the full posting."""
+    parts = []
+    for field in ('requirements', 'skills', 'responsibilities'):
+        parts.extend(job_description.get(field) or [])
+    return " ".join(parts) or job_description.get('full_text', '')
+
+
+def select_relevant_chunks(documents: List[str], job_description: Dict, k: int = None) -> List[str]:
+    """Chunk the documents and return the top-k chunks for the job, in document order."""
+    k = k or RETRIEVAL_SETTINGS['top_k']
+    splitter = _get_splitter()
+    chunks = []
+    for document in documents:
+        if document and document.strip():
+            chunks.extend(splitter.split_text(document))
+    if not chunks:
+        return []
+
+    index = BM25Index(chunks)
+    selected = sorted(i for i, _ in index.top_k(build_query(job_description), k))
+    return [chunks[i] for i in selected]
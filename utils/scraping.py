@@ -0,0 +1,121 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Callable, Iterable, List, Optional, Union
+
+CHUNK_SIZE = 64 * 1024
+_CHARSET_PATTERN = re.compile(r'charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _TextCollector(HTMLParser):
+    """Collects the text of <tag class="... class_name ...">, without building a tree.
+
+    Items are kept in document order (like ``soup.find_all``), nested matches
+    included, and parsing stops as soon as the first ``limit`` accepted items
+    are known.
+    """
+
+    def __init__(self, tag: str, class_name: str, limit: Optional[int], accept: Optional[Callable[[str], bool]]):
+        super().__init__(convert_charrefs=True)
+        self.tag = tag
+        self.class_name = class_name
+        self.limit = limit
+        self.accept = accept
+        self.depth = 0
+        self.open = []  # (depth, slot) of matched elements still open
+        self.slots = []  # text parts per matched element, in start order
+        self.done = []
+        self.results = []
+        self.cursor = 0  # first slot not yet moved to results
+
+    def handle_starttag(self, tag, attrs):
+        if tag != self.tag:
+            return
+        self.depth += 1
+        classes = next((value for name, value in attrs if name == 'class'), None) or ''
+        if self.class_name in classes.split():
+            self.open.append((self.depth, len(self.slots)))
+            self.slots.append([])
+            self.done.append(False)
+
+    def handle_endtag(self, tag):
+        if tag != self.tag or not self.depth:
+            return
+        if self.open and self.open[-1][0] == self.depth:
+            _, slot = self.open.pop()
+            self.done[slot] = True
+            self._collect()
+        self.depth -= 1
+
+    def handle_data(self, data):
+        for _, slot in self.open:
+            self.slots[slot].append(data)
+
+    def _collect(self):
+        """Move finished items to results in start order; stop once the limit is reached."""
+        while self.cursor < len(self.slots) and self.done[self.cursor]:
+            text = ''.join(self.slots[self.cursor])
+            self.slots[self.cursor] = None
+            self.cursor += 1
+            if self.accept is None or self.accept(text):
+                self.results.append(text)
+                if self.limit is not None and len(self.results) >= self.limit:
+                    raise _StopParsing()
+
+
+def response_encoding(content_type: str) -> str:
+    """Charset declared in a Content-Type header, defaulting to UTF-8."""
+    match = _CHARSET_PATTERN.search(content_type or '')
+    if match:
+        try:
+            return codecs.lookup(match.group(1)).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def extract_texts(source: Union[bytes, Iterable[bytes]], tag: str, class_name: str,
+                  limit: Optional[int] = None, accept: Optional[Callable[[str], bool]] = None,
+                  encoding: str = 'utf-8') -> List[str]:
+    """Return the text of matching elements from raw HTML bytes.
+
+    ``source`` is either a bytes object or an iterable of byte chunks (such as
+    ``response.iter_content()``); chunks are decoded incrementally and the rest
+    of the stream is not read once ``limit`` accepted items have been found.
+    ``accept`` filters items before they count towards the limit.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = source
+        source = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+
+    parser = _TextCollector(tag, class_name, limit, accept)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    try:
+        for chunk in source:
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    except _StopParsing:
+        pass
+    return parser.results
+
+
+def scrape_texts(session, url: str, tag: str, class_name: str, limit: Optional[int] = None,
+                 accept: Optional[Callable[[str], bool]] = None, **request_kwargs) -> Optional[List[str]]:
+    """Stream ``url`` and extract matching element texts; returns None on a non-200 response.
+
+    The connection is closed as soon as enough items are found, so the remainder
+    of a large page is never downloaded or decoded.
+    """
+    with session.get(url, stream=True, **request_kwargs) as response:
+        if response.status_code != 200:
+            return None
+        return extract_texts(
+            response.iter_content(chunk_size=CHUNK_SIZE),
+            tag, class_name, limit=limit, accept=accept,
+            encoding=response_encoding(response.headers.get('Content-Type'))
+        )
@@ -0,0 +1,356 @@
+"""Per-request tracing and a Prometheus-compatible metrics registry.
+
+Each stage of a generation runs inside ``span(stage)``, which times it into the
+``cover_letter_stage_duration_seconds`` histogram and, when a ``request_trace()``
+is active, records it on that request's trace. ``start_metrics_server()`` serves
+every metric in the Prometheus text format at /metrics, so the app and batch
+runs can be scraped without extra dependencies.
+"""
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import APP_SETTINGS, TELEMETRY_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_registry = None
+_registry_lock = threading.Lock()
+_stage_metrics_cache = None
+_metrics_server = None
+_setup_lock = threading.Lock()
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(dict(zip(self.labelnames, key)), value))
+        return lines
+
+    def _render_sample(self, labels: Dict, value) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def snapshot(self, **labels) -> Dict:
+        """Count and sum observed for one label set (zeros if nothing was observed)."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return {'count': state['count'], 'sum': state['sum']} if state else {'count': 0, 'sum': 0.0}
+
+    def _render_sample(self, labels: Dict, state) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state['buckets']):
+            cumulative += count
+            bucket_labels = dict(labels, le=_format_value(bound))
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use and rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide metrics registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
+
+
+def _stage_metrics():
+    """The metrics every span updates, looked up once since spans sit on hot paths."""
+    global _stage_metrics_cache
+    if _stage_metrics_cache is None:
+        registry = get_registry()
+        _stage_metrics_cache = (
+            registry.histogram('cover_letter_stage_duration_seconds', "Time spent in each generation stage",
+                               ('stage', 'status')),
+            registry.gauge('cover_letter_stage_in_progress', "Stages currently running", ('stage',)),
+        )
+    return _stage_metrics_cache
+
+
+class Trace:
+    """The spans recorded while handling one request, in the order they finished."""
+
+    def __init__(self, name: str = 'request'):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Dict):
+        with self._lock:
+            self.spans.append(span)
+
+    def stage_durations(self) -> Dict[str, float]:
+        """Total seconds per stage; stages that ran more than once (e.g. per document) are summed."""
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                totals[span['name']] = totals.get(span['name'], 0.0) + span['duration']
+        return totals
+
+
+@contextmanager
+def request_trace(name: str = 'request') -> Iterator[Trace]:
+    """Collect the spans of one request; spans in worker threads join it when the context is copied."""
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        with span(name):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        logger.debug("Trace %s %s: %s", name, trace.trace_id,
+                     ", ".join(f"{s['name']}={s['duration']:.3f}s" for s in trace.spans))
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(stage: str, **attributes) -> Iterator[Dict]:
+    """Time a stage into the stage histogram and the current trace.
+
+    Yields the attribute dict so the stage can add details (cache hits, token
+    counts) once it knows them. Exceptions are recorded as status="error" and
+    re-raised.
+    """
+    duration_histogram, in_progress = _stage_metrics()
+    status = 'ok'
+    start = time.perf_counter()
+    in_progress.inc(stage=stage)
+    try:
+        yield attributes
+    except Exception:
+        status = 'error'
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        in_progress.dec(stage=stage)
+        duration_histogram.observe(duration, stage=stage, status=status)
+        trace = _current_trace.get()
+        if trace is not None and stage != trace.name:
+            trace.add({'name': stage, 'duration': duration, 'status': status, 'attributes': attributes})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Span %s %s in %.3fs %s", stage, status, duration, attributes or "")
+
+
+def copy_context() -> contextvars.Context:
+    """Context to run pool tasks in, so their spans join the submitting request's trace."""
+    return contextvars.copy_context()
+
+
+def record_generation(model: str, stats: Dict):
+    """Record Ollama's timing and token counts for one completed generation.
+
+    ``stats`` is OllamaLLM.last_stats: durations in seconds, counts in tokens.
+    """
+    registry = get_registry()
+    registry.counter('ollama_requests_total', "Generations by outcome", ('model', 'cache')).inc(
+        model=model, cache='hit' if stats.get('cache_hit') else 'miss')
+    if stats.get('cache_hit'):
+        return
+    if stats.get('prompt_eval_count') is not None:
+        registry.counter('ollama_prompt_eval_tokens_total', "Prompt tokens evaluated (not served from the KV cache)",
+                         ('model',)).inc(stats['prompt_eval_count'], model=model)
+    if stats.get('eval_count') is not None:
+        registry.counter('ollama_eval_tokens_total', "Tokens generated", ('model',)).inc(
+            stats['eval_count'], model=model)
+    for field, documentation in (
+        ('load_duration', "Time Ollama spent loading the model"),
+        ('prompt_eval_duration', "Time Ollama spent evaluating the prompt"),
+        ('eval_duration', "Time Ollama spent generating tokens"),
+        ('time_to_first_token', "Time from request to the first streamed token"),
+    ):
+        if stats.get(field) is not None:
+            registry.histogram(f'ollama_{field}_seconds', documentation, ('model',)).observe(stats[field], model=model)
+
+
+def configure_logging(level: Optional[str] = None):
+    """Route module loggers to stderr at LOG_LEVEL (DEBUG when DEBUG=True); later calls are no-ops."""
+    level = level or ('DEBUG' if APP_SETTINGS['debug'] else TELEMETRY_SETTINGS['log_level'])
+    logging.basicConfig(level=level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+def start_metrics_server(port: int = None, host: str = None) -> ThreadingHTTPServer:
+    """Serve the registry at http://host:port/metrics from a daemon thread; started once per process."""
+    global _metrics_server
+    with _setup_lock:
+        if _metrics_server is not None:
+            return _metrics_server
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = get_registry().render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(
+            (host or TELEMETRY_SETTINGS['metrics_host'],
+             TELEMETRY_SETTINGS['metrics_port'] if port is None else port),
+            Handler
+        )
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        logger.info("Serving metrics at http://%s:%s/metrics", *server.server_address[:2])
+        _metrics_server = server
+        return server
+
+
+def setup_telemetry(log_level: Optional[str] = None):
+    """Configure logging and start the metrics endpoint when METRICS_PORT is set."""
+    configure_logging(log_level)
+    if TELEMETRY_SETTINGS['metrics_port']:
+        try:
+            start_metrics_server()
+        except OSError as e:
+            logger.warning("Could not start the metrics server: %s", e)
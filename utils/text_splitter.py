@@ -0,0 +1,81 @@
+import re
+from collections import deque
+from typing import List, Optional
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+
+class RecursiveTextSplitter:
+    """Split text into overlapping chunks of at most ``chunk_size`` characters.
+
+    Tries paragraph breaks first, then lines, then words, then characters, and
+    merges the pieces back up to the chunk size with ``chunk_overlap`` characters
+    carried over between chunks. Separators stay attached to the start of the
+    following piece and chunks are stripped, matching the chunking of
+    langchain's RecursiveCharacterTextSplitter with its default settings.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, separators: Optional[List[str]] = None):
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"chunk_overlap ({chunk_overlap}) is larger than chunk_size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators or DEFAULT_SEPARATORS
+
+    def split_text(self, text: str) -> List[str]:
+        return self._split(text, self.separators)
+
+    def _split(self, text: str, separators: List[str]) -> List[str]:
+        # Use the first separator present in the text; finer ones handle oversized pieces
+        separator = separators[-1]
+        finer = []
+        for i, candidate in enumerate(separators):
+            if candidate == "" or candidate in text:
+                separator = candidate
+                finer = separators[i + 1:] if candidate else []
+                break
+
+        chunks = []
+        small = []
+        for piece in self._split_keeping_separator(text, separator):
+            if len(piece) < self.chunk_size:
+                small.append(piece)
+                continue
+            if small:
+                chunks.extend(self._merge(small))
+                small = []
+            if finer:
+                chunks.extend(self._split(piece, finer))
+            else:
+                chunks.append(piece)
+        if small:
+            chunks.extend(self._merge(small))
+        return chunks
+
+    @staticmethod
+    def _split_keeping_separator(text: str, separator: str) -> List[str]:
+        if not separator:
+            return list(text)
+        parts = re.split(f"({re.escape(separator)})", text)
+        pieces = [parts[0]] + [parts[i] + parts[i + 1] for i in range(1, len(parts) - 1, 2)]
+        return [piece for piece in pieces if piece]
+
+    def _merge(self, pieces: List[str]) -> List[str]:
+        """Greedily pack pieces into chunks, keeping up to chunk_overlap characters of the previous chunk."""
+        chunks = []
+        current = deque()
+        total = 0
+        for piece in pieces:
+            size = len(piece)
+            if total + size > self.chunk_size and current:
+                chunk = "".join(current).strip()
+                if chunk:
+                    chunks.append(chunk)
+                while total > self.chunk_overlap or (total + size > self.chunk_size and total > 0):
+                    total -= len(current.popleft())
+            current.append(piece)
+            total += size
+        chunk = "".join(current).strip()
+        if chunk:
+            chunks.append(chunk)
+        return chunks
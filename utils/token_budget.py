@@ -0,0 +1,125 @@
+import math
+import re
+from typing import Dict, List, Tuple
+from config import PROMPT_SETTINGS
+
+_SENTENCE_END = re.compile(r'[.!?;](?=\s)')
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+_SPACES = re.compile(r'[ \t]+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for llama-family tokenizers (errs on the high side)."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / PROMPT_SETTINGS['chars_per_token'])
+
+
+def _compress(text: str) -> str:
+    """Lossless-ish shrink: collapse runs of spaces/blank lines and drop repeated lines."""
+    text = _SPACES.sub(' ', _BLANK_LINES.sub('\n', text)).strip()
+    seen = set()
+    lines = []
+    for line in text.split('\n'):
+        key = line.strip().lower()
+        if key and key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def _trim(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, preferring whole lines, then whole sentences, then words."""
+    if max_tokens <= 0:
+        return ""
+    max_chars = int(max_tokens * PROMPT_SETTINGS['chars_per_token'])
+    if len(text) <= max_chars:
+        return text
+
+    lines = text.split('\n')
+    if len(lines) > 1:
+        kept = []
+        used = 0
+        for line in lines:
+            if used + len(line) + 1 > max_chars:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        if kept:
+            return '\n'.join(kept)
+
+    head = text[:max_chars]
+    sentence_ends = [m.end() for m in _SENTENCE_END.finditer(head)]
+    if sentence_ends and sentence_ends[-1] > max_chars // 2:
+        return head[:sentence_ends[-1]]
+    return head[:max_chars - 4].rsplit(' ', 1)[0] + ' ...'
+
+
+class TokenBudget:
+    """Fits prompt sections into the model context window by priority.
+
+    Sections are dicts with ``name``, ``text``, ``priority`` (lower is more important)
+    and an optional ``min_tokens`` floor. Floors are granted first, then every section
+    may grow to an equal share, and any remaining room goes to sections by priority.
+    """
+
+    def __init__(self, num_ctx: int, reserve_tokens: int):
+        self.num_ctx = num_ctx
+        self.reserve_tokens = reserve_tokens
+
+    def fit(self, sections: List[Dict], fixed_text: str = "") -> Tuple[Dict[str, str], Dict]:
+        """Return the (possibly shortened) text per section and a report of how the budget was used."""
+        fixed_tokens = estimate_tokens(fixed_text)
+        available = max(0, self.num_ctx - self.reserve_tokens - fixed_tokens)
+
+        texts = {section['name']: section['text'] or "" for section in sections}
+        original = {name: estimate_tokens(text) for name, text in texts.items()}
+
+        # Compress only when the raw sections don't fit
+        if sum(original.values()) > available:
+            texts = {name: _compress(text) for name, text in texts.items()}
+        needed = {name: estimate_tokens(text) for name, text in texts.items()}
+
+        ordered = sorted(sections, key=lambda section: section['priority'])
+        allocation = {}
+        remaining = available
+        for section in ordered:
+            floor = min(needed[section['name']], section.get('min_tokens', 0), remaining)
+            allocation[section['name']] = floor
+            remaining -= floor
+        # Up to an equal share each, then hand whatever is left out strictly by priority
+        fair_share = available // max(1, sum(1 for tokens in needed.values() if tokens))
+        for cap in (fair_share, available):
+            for section in ordered:
+                name = section['name']
+                extra = min(max(0, min(needed[name], cap) - allocation[name]), remaining)
+                allocation[name] += extra
+                remaining -= extra
+
+        fitted = {}
+        report_sections = {}
+        for section in sections:
+            name = section['name']
+            text = texts[name]
+            if needed[name] > allocation[name]:
+                text = _trim(text, allocation[name])
+            fitted[name] = text
+            report_sections[name] = {
+                'priority': section['priority'],
+                'original_tokens': original[name],
+                'allocated_tokens': allocation[name],
+                'final_tokens': estimate_tokens(text),
+                'trimmed': estimate_tokens(text) < original[name]
+            }
+
+        prompt_tokens = fixed_tokens + sum(r['final_tokens'] for r in report_sections.values())
+        report = {
+            'num_ctx': self.num_ctx,
+            'reserved_output_tokens': self.reserve_tokens,
+            'fixed_tokens': fixed_tokens,
+            'available_tokens': available,
+            'prompt_tokens': prompt_tokens,
+            'sections': report_sections
+        }
+        return fitted, report